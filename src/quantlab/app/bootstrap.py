@@ -3,35 +3,113 @@ from __future__ import annotations
 from quantlab.app.job_bindings import default_event_job_subscriptions
 from quantlab.app.runtime import AsyncTaskRuntime
 from quantlab.app.services.job_service import JobService
-from quantlab.config.models import QuantLabSettings, ResearchSettings
+from quantlab.config.models import QuantLabSettings, ResearchSettings, RuntimeSettings
+from quantlab.core.interfaces import EventBus, JobQueue, JobRepository
 from quantlab.domain.events import FeatureCalculated, MarketDataArrived
 from quantlab.domain.research.handlers.feature_handler import FeatureCalculationHandler
 from quantlab.domain.research.handlers.signal_handler import SignalGenerationHandler
 from quantlab.infra.bus import (
+    AsyncEventBus,
+    EventTelemetry,
+    EveryNthSampler,
     ExceptionMiddleware,
     InMemoryEventBus,
-    LoggingMiddleware,
     SubscriptionRegistry,
-    TimingMiddleware,
+    TelemetryMiddleware,
+    sample_all,
 )
 from quantlab.infra.jobs.in_memory import InMemoryJobRegistry, InMemoryJobRepository
+from quantlab.infra.jobs.sqlite import SqliteJobRepository
+from quantlab.infra.metrics import MetricsRegistry, render_prometheus
+from quantlab.infra.queue.fair_share import FairShareJobQueue
 from quantlab.infra.queue.in_memory import InMemoryJobQueue
+from quantlab.infra.storage import DatasetCatalog, DuckDBQueryEngine, IntradayCache, ParquetStore
 from quantlab.infra.workers.hybrid_pool import HybridWorkerPool
 
 
-def build_bus() -> InMemoryEventBus:
+def build_bus(
+    settings: RuntimeSettings | None = None,
+    metrics: MetricsRegistry | None = None,
+    telemetry: EventTelemetry | None = None,
+) -> EventBus:
+    """Bus selected by `settings.event_bus`; telemetry defaults to the process-wide `shared_telemetry()`."""
+    settings = settings or RuntimeSettings()
+    sample_every = settings.bus_telemetry_sample_every
+    middlewares = [
+        ExceptionMiddleware(),
+        TelemetryMiddleware(
+            telemetry,
+            sampler=EveryNthSampler(sample_every) if sample_every > 1 else sample_all,
+        ),
+    ]
+
+    if settings.event_bus == "async":
+        return AsyncEventBus(
+            middlewares=middlewares,
+            capacity=settings.bus_queue_capacity,
+            policy=settings.bus_backpressure,
+            metrics=metrics,
+        )
+    if settings.event_bus != "sync":
+        raise ValueError(f"Unknown event_bus={settings.event_bus!r}, expected 'sync' or 'async'")
+
     registry = SubscriptionRegistry()
     return InMemoryEventBus(
         registry=registry,
-        middlewares=[
-            ExceptionMiddleware(),
-            LoggingMiddleware(),
-            TimingMiddleware(),
-        ],
+        middlewares=middlewares,
+        metrics=metrics,
+        timing_sample_every=settings.bus_handler_timing_sample_every,
+    )
+
+
+def build_job_repository(settings: QuantLabSettings) -> JobRepository:
+    if settings.runtime.job_store == "sqlite":
+        return SqliteJobRepository(settings.storage.job_store_path)
+    if settings.runtime.job_store != "memory":
+        raise ValueError(f"Unknown job_store={settings.runtime.job_store!r}, expected 'memory' or 'sqlite'")
+    return InMemoryJobRepository()
+
+
+def build_job_queue(settings: RuntimeSettings) -> JobQueue:
+    if settings.job_queue == "fair":
+        return FairShareJobQueue(
+            share_by=settings.job_share_by,
+            weights=settings.job_share_weights,
+            concurrency_limits=settings.job_concurrency_limits,
+        )
+    if settings.job_queue != "fifo":
+        raise ValueError(f"Unknown job_queue={settings.job_queue!r}, expected 'fifo' or 'fair'")
+    return InMemoryJobQueue()
+
+
+def build_catalog(settings: QuantLabSettings) -> DatasetCatalog:
+    return DatasetCatalog(settings.storage.catalog_path)
+
+
+def build_curated_store(settings: QuantLabSettings, catalog: DatasetCatalog | None = None) -> ParquetStore:
+    """Store whose `dataset(kind)` partitions `build_query_engine` exposes as views."""
+    return ParquetStore(settings.storage.curated_data_dir, catalog=catalog)
+
+
+def build_query_engine(settings: QuantLabSettings) -> DuckDBQueryEngine:
+    return DuckDBQueryEngine(
+        settings.storage.curated_data_dir,
+        settings.storage.duckdb_path,
+        threads=settings.runtime.duckdb_threads or None,
+        memory_limit=settings.runtime.duckdb_memory_limit or None,
+    )
+
+
+def build_intraday_cache(settings: QuantLabSettings, metrics: MetricsRegistry | None = None) -> IntradayCache:
+    return IntradayCache(
+        settings.storage.intraday_cache_dir,
+        max_bytes=settings.runtime.intraday_cache_max_bytes,
+        ttl=settings.runtime.intraday_cache_ttl or None,
+        metrics=metrics,
     )
 
 
-def register_research_handlers(bus: InMemoryEventBus, settings: ResearchSettings) -> None:
+def register_research_handlers(bus: EventBus, settings: ResearchSettings) -> None:
     feature_handler = FeatureCalculationHandler(bus)
     signal_handler = SignalGenerationHandler(bus, threshold=settings.signal_threshold)
 
@@ -40,13 +118,21 @@ def register_research_handlers(bus: InMemoryEventBus, settings: ResearchSettings
 
 
 def build_async_task_runtime(settings: QuantLabSettings) -> AsyncTaskRuntime:
-    bus = build_bus()
+    metrics = MetricsRegistry()
+    bus = build_bus(settings.runtime, metrics)
     register_research_handlers(bus, settings.research)
 
-    repo = InMemoryJobRepository()
-    queue = InMemoryJobQueue()
+    repo = build_job_repository(settings)
+    queue = build_job_queue(settings.runtime)
     registry = InMemoryJobRegistry()
-    job_service = JobService(repo=repo, queue=queue, bus=bus)
+    job_service = JobService(
+        repo=repo,
+        queue=queue,
+        bus=bus,
+        metrics=metrics,
+        progress_min_interval=settings.runtime.job_progress_min_interval,
+        progress_min_delta=settings.runtime.job_progress_min_delta,
+    )
     worker_pool = HybridWorkerPool(
         queue=queue,
         repo=repo,
@@ -55,6 +141,11 @@ def build_async_task_runtime(settings: QuantLabSettings) -> AsyncTaskRuntime:
         thread_workers=settings.runtime.max_workers,
         process_workers=settings.runtime.process_workers,
         poll_timeout=settings.runtime.queue_poll_timeout,
+        metrics=metrics,
+        warm_process_workers=settings.runtime.process_warm_workers,
+        max_jobs_per_process_worker=settings.runtime.process_max_jobs_per_worker or None,
+        process_progress_rate=settings.runtime.process_progress_rate,
+        reap_interval=settings.runtime.job_reap_interval,
     )
 
     runtime = AsyncTaskRuntime(
@@ -62,6 +153,9 @@ def build_async_task_runtime(settings: QuantLabSettings) -> AsyncTaskRuntime:
         job_service=job_service,
         job_registry=registry,
         worker_pool=worker_pool,
+        metrics_registry=metrics,
+        metrics_renderer=render_prometheus,
     )
     runtime.register_event_jobs(default_event_job_subscriptions())
+    job_service.requeue_incomplete()
     return runtime
@@ -43,3 +43,19 @@ class JobFailed(DomainEvent):
     error: str
 
     EVENT_TYPE: ClassVar[str] = "job.failed"
+
+
+@dataclass(frozen=True, slots=True)
+class JobCancelled(DomainEvent):
+    job_id: str
+    reason: str = ""
+
+    EVENT_TYPE: ClassVar[str] = "job.cancelled"
+
+
+@dataclass(frozen=True, slots=True)
+class JobTimedOut(DomainEvent):
+    job_id: str
+    timeout: float
+
+    EVENT_TYPE: ClassVar[str] = "job.timed_out"
@@ -9,6 +9,9 @@ from quantlab.domain.events import (
     MarketDataDownloadRequested,
 )
 
+# interactive requests jump ahead of bulk sweeps in a priority-aware JobQueue
+INTERACTIVE_PRIORITY = 10
+
 
 def _request_metadata(event: DomainEvent) -> dict[str, str]:
     correlation_id = event.correlation_id or event.event_id
@@ -33,6 +36,7 @@ def build_market_data_download_job(event: DomainEvent) -> JobSpec | None:
         dedupe_key=f"download.market_data:{event.provider}:{event.symbol}:{event.start}:{event.end}",
         execution_mode=JobExecutionMode.THREAD,
         metadata=_request_metadata(event),
+        priority=INTERACTIVE_PRIORITY,
     )
 
 
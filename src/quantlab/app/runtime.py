@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 
 from quantlab.app.services.job_bridge import EventJobSubscription, register_event_job_subscriptions
@@ -8,6 +8,7 @@ from quantlab.app.services.job_service import JobService, JobStatusView, SubmitJ
 from quantlab.core.events import DomainEvent
 from quantlab.core.interfaces import EventBus, EventHandler, JobHandler, JobRegistry, WorkerPool
 from quantlab.core.jobs import JobRecord, JobSpec
+from quantlab.core.metrics import LatencySummary, Metrics
 
 
 @dataclass(slots=True)
@@ -16,12 +17,16 @@ class AsyncTaskRuntime:
     job_service: JobService
     job_registry: JobRegistry
     worker_pool: WorkerPool
+    metrics_registry: Metrics | None = None
+    metrics_renderer: Callable[[Metrics], str] | None = None
 
     def start(self) -> None:
         self.worker_pool.start()
 
     def stop(self) -> None:
         self.worker_pool.stop()
+        self.job_service.close()
+        self.bus.close()
 
     def submit_job(self, spec: JobSpec) -> SubmitJobResult:
         return self.job_service.submit(spec)
@@ -32,6 +37,19 @@ class AsyncTaskRuntime:
     def get_job_status(self, job_id: str) -> JobStatusView | None:
         return self.job_service.get_status(job_id)
 
+    def cancel_job(self, job_id: str) -> JobStatusView:
+        return JobStatusView.from_record(self.job_service.cancel(job_id))
+
+    def metrics(self) -> dict[str, float | LatencySummary]:
+        if self.metrics_registry is None:
+            return {}
+        return self.metrics_registry.snapshot()
+
+    def render_metrics(self) -> str:
+        if self.metrics_registry is None or self.metrics_renderer is None:
+            return ""
+        return self.metrics_renderer(self.metrics_registry)
+
     def register_job_handler(self, job_type: str, handler: JobHandler) -> None:
         self.job_registry.register(job_type, handler)
 
@@ -45,6 +63,9 @@ class AsyncTaskRuntime:
     def publish(self, event: DomainEvent) -> None:
         self.bus.publish(event)
 
+    def publish_batch(self, events: Iterable[DomainEvent]) -> None:
+        self.bus.publish_batch(events)
+
     def subscribe(self, event_type: str | type[DomainEvent], handler: EventHandler) -> None:
         self.bus.subscribe(event_type, handler)
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from quantlab.app.services.job_service import JobService
 from quantlab.core.interfaces import JobRegistry, JobRunner
+from quantlab.core.jobs import JobCancelledError, JobStatus
 
 
 class DefaultJobRunner(JobRunner):
@@ -12,10 +13,15 @@ class DefaultJobRunner(JobRunner):
     def run(self, job_id: str) -> None:
         try:
             job = self._job_service.mark_running(job_id)
+            if job.status is not JobStatus.RUNNING:
+                return  # cancelled while queued
             handler = self._registry.get(job.job_type)
-            ctx = self._job_service.build_context(job_id)
+            ctx = self._job_service.build_context(job_id, job.timeout)
             result = handler(job.payload, ctx)
+            ctx.flush()
             self._job_service.mark_succeeded(job_id, result)
+        except JobCancelledError:
+            self._job_service.mark_interrupted(job_id)
         except Exception as exc:
             try:
                 self._job_service.mark_failed(job_id, str(exc))
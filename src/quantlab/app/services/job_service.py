@@ -1,18 +1,24 @@
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, UTC
 from typing import Any
 
 from quantlab.app.events import (
+    JobCancelled,
     JobFailed,
     JobProgressed,
     JobQueued,
     JobStarted,
     JobSucceeded,
+    JobTimedOut,
 )
 from quantlab.core.jobs import JobRecord, JobSpec, JobStatus
 from quantlab.core.interfaces import EventBus, JobContext, JobQueue, JobRepository
+from quantlab.core.metrics import Metrics
+from quantlab.core.storage import SharedHandle, open_value
 
 
 def utc_now() -> datetime:
@@ -60,33 +66,131 @@ class JobStatusView:
             finished_at=job.finished_at,
         )
 
+    @property
+    def result_handles(self) -> dict[str, SharedHandle]:
+        """Result entries that reference shared data rather than holding it."""
+        return {key: value for key, value in (self.result or {}).items() if isinstance(value, SharedHandle)}
+
+    def open_result(self, key: str) -> Any:
+        """
+        Result entry `key`, with a `SharedHandle` (e.g. `ArrowHandle`) opened zero-copy on access.
+
+        The view itself only carries handles, so building it never
+        materializes large job outputs.
+        """
+        if self.result is None:
+            raise KeyError(key)
+        return open_value(self.result[key])
+
+
+class JobMetrics:
+    def __init__(self, registry: Metrics) -> None:
+        self._submitted = registry.counter("jobs_submitted_total", "Jobs created by submit.", ("job_type",))
+        self._deduplicated = registry.counter(
+            "jobs_deduplicated_total",
+            "Submissions answered by an active job with the same dedupe key.",
+            ("job_type",),
+        )
+        self._succeeded = registry.counter("jobs_succeeded_total", "Jobs that succeeded.", ("job_type",))
+        self._failed = registry.counter("jobs_failed_total", "Jobs that failed.", ("job_type",))
+        self._cancelled = registry.counter("jobs_cancelled_total", "Jobs cancelled before finishing.", ("job_type",))
+        self._timed_out = registry.counter("jobs_timed_out_total", "Jobs reaped after their timeout.", ("job_type",))
+        self._queue_wait = registry.histogram(
+            "job_queue_wait_seconds",
+            "Time from submit until mark_running.",
+            ("job_type",),
+        )
+        self._run_time = registry.histogram(
+            "job_run_seconds",
+            "Time from mark_running until the job finished.",
+            ("job_type",),
+        )
+
+    def submitted(self, job_type: str, created: bool) -> None:
+        family = self._submitted if created else self._deduplicated
+        family.labels(job_type).inc()
+
+    def started(self, job: JobRecord) -> None:
+        if job.started_at is not None:
+            self._queue_wait.labels(job.job_type).observe_seconds(
+                (job.started_at - job.created_at).total_seconds()
+            )
+
+    def finished(self, job: JobRecord) -> None:
+        family = {
+            JobStatus.SUCCEEDED: self._succeeded,
+            JobStatus.CANCELLED: self._cancelled,
+            JobStatus.TIMED_OUT: self._timed_out,
+        }.get(job.status, self._failed)
+        family.labels(job.job_type).inc()
+        if job.started_at is not None and job.finished_at is not None:
+            self._run_time.labels(job.job_type).observe_seconds(
+                (job.finished_at - job.started_at).total_seconds()
+            )
+
 
 class DefaultJobContext(JobContext):
+    """
+    Throttled, coalescing progress reporter for jobs running in this process.
+
+    An update is handed to `JobService.record_progress` only when at least
+    `min_interval` seconds have passed since the last one and either progress
+    moved by at least `min_delta` or the message changed; otherwise only the
+    latest value is kept. `flush()` applies whatever is held back, so the
+    final value always lands before the job is marked finished.
+
+    `is_cancelled()` turns true when `cancel_event` is set or the monotonic
+    `deadline` passes, so handlers calling `check_cancelled()` stop on time
+    even before the reaper marks the job.
+    """
+
     def __init__(
         self,
         job_id: str,
-        repo: JobRepository,
-        bus: EventBus,
+        job_service: "JobService",
+        *,
+        min_interval: float = 0.0,
+        min_delta: float = 0.0,
+        cancel_event: threading.Event | None = None,
+        deadline: float | None = None,
     ) -> None:
         self._job_id = job_id
-        self._repo = repo
-        self._bus = bus
+        self._job_service = job_service
+        self._min_interval = min_interval
+        self._min_delta = min_delta
+        self._next_emit = 0.0
+        self._emitted_progress = -1.0
+        self._emitted_message: str | None = None
+        self._pending: tuple[float, str] | None = None
+        self._cancel_event = cancel_event
+        self._deadline = deadline
 
     def set_progress(self, progress: float, message: str = "") -> None:
-        job = self._repo.get(self._job_id)
-        if job is None:
+        progress = max(0.0, min(1.0, progress))
+        now = time.monotonic()
+        if now < self._next_emit or (
+            abs(progress - self._emitted_progress) < self._min_delta and message == self._emitted_message
+        ):
+            self._pending = (progress, message)
             return
-        job.progress = max(0.0, min(1.0, progress))
-        job.message = message
-        job.updated_at = utc_now()
-        self._repo.update(job)
-        self._bus.publish(
-            JobProgressed(
-                job_id=self._job_id,
-                progress=job.progress,
-                message=message,
-            )
-        )
+        self._emit(progress, message, now)
+
+    def flush(self) -> None:
+        if self._pending is not None:
+            progress, message = self._pending
+            self._emit(progress, message, time.monotonic())
+
+    def is_cancelled(self) -> bool:
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            return True
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _emit(self, progress: float, message: str, now: float) -> None:
+        self._pending = None
+        self._emitted_progress = progress
+        self._emitted_message = message
+        self._next_emit = now + self._min_interval
+        self._job_service.record_progress(self._job_id, progress, message)
 
 
 class JobService:
@@ -95,15 +199,33 @@ class JobService:
         repo: JobRepository,
         queue: JobQueue,
         bus: EventBus,
+        metrics: Metrics | None = None,
+        *,
+        progress_min_interval: float = 0.0,
+        progress_min_delta: float = 0.0,
     ) -> None:
         self._repo = repo
         self._queue = queue
         self._bus = bus
+        self._progress_min_interval = progress_min_interval
+        self._progress_min_delta = progress_min_delta
+        self._metrics = JobMetrics(metrics) if metrics is not None else None
+        # serializes completion with progress relayed from other threads, so a
+        # late update cannot overwrite a terminal status
+        self._finish_lock = threading.Lock()
+        self._cancel_events: dict[str, threading.Event] = {}
 
     def submit(self, spec: JobSpec) -> SubmitJobResult:
+        job = JobRecord.create(spec)
+        job.status = JobStatus.QUEUED
+        job.message = "queued"
+        job.updated_at = utc_now()
+
         if spec.dedupe_key:
-            existing = self._repo.find_active_by_dedupe_key(spec.dedupe_key)
+            existing = self._repo.add_if_absent(spec.dedupe_key, job)
             if existing is not None:
+                if self._metrics is not None:
+                    self._metrics.submitted(existing.job_type, created=False)
                 return SubmitJobResult(
                     job_id=existing.job_id,
                     created=False,
@@ -111,13 +233,11 @@ class JobService:
                     job_type=existing.job_type,
                     execution_mode=existing.execution_mode.value,
                 )
-
-        job = JobRecord.create(spec)
-        job.status = JobStatus.QUEUED
-        job.message = "queued"
-        job.updated_at = utc_now()
-        self._repo.add(job)
-        self._queue.put(job.job_id)
+        else:
+            self._repo.add(job)
+        self._enqueue(job)
+        if self._metrics is not None:
+            self._metrics.submitted(job.job_type, created=True)
         self._bus.publish(JobQueued(job_id=job.job_id))
 
         return SubmitJobResult(
@@ -129,46 +249,168 @@ class JobService:
         )
 
     def mark_running(self, job_id: str) -> JobRecord:
-        job = self._require(job_id)
-        job.status = JobStatus.RUNNING
-        job.started_at = utc_now()
-        job.updated_at = job.started_at
-        job.progress = 0.0
-        job.message = "running"
-        self._repo.update(job)
+        """Move a job to RUNNING; a job cancelled meanwhile is returned unchanged and must not be run."""
+        with self._finish_lock:
+            job = self._require(job_id)
+            if job.is_terminal:
+                return job
+            job.status = JobStatus.RUNNING
+            job.started_at = utc_now()
+            job.updated_at = job.started_at
+            job.progress = 0.0
+            job.message = "running"
+            self._repo.update(job)
+        if self._metrics is not None:
+            self._metrics.started(job)
         self._bus.publish(JobStarted(job_id=job.job_id))
         return job
 
     def mark_succeeded(self, job_id: str, result: dict) -> JobRecord:
-        job = self._require(job_id)
-        job.status = JobStatus.SUCCEEDED
-        job.progress = 1.0
-        job.result = result
-        job.message = "completed"
-        job.finished_at = utc_now()
-        job.updated_at = job.finished_at
-        self._repo.update(job)
+        with self._finish_lock:
+            job = self._require(job_id)
+            if job.is_terminal:
+                return job
+            self._cancel_events.pop(job_id, None)
+            job.status = JobStatus.SUCCEEDED
+            job.progress = 1.0
+            job.result = result
+            job.message = "completed"
+            job.finished_at = utc_now()
+            job.updated_at = job.finished_at
+            self._repo.update(job)
+        if self._metrics is not None:
+            self._metrics.finished(job)
         self._bus.publish(JobSucceeded(job_id=job.job_id, result=result))
         return job
 
     def mark_failed(self, job_id: str, error: str) -> JobRecord:
-        job = self._require(job_id)
-        job.status = JobStatus.FAILED
-        job.error = error
-        job.message = error
-        job.finished_at = utc_now()
-        job.updated_at = job.finished_at
-        self._repo.update(job)
+        with self._finish_lock:
+            job = self._require(job_id)
+            if job.is_terminal:
+                return job
+            self._cancel_events.pop(job_id, None)
+            job.status = JobStatus.FAILED
+            job.error = error
+            job.message = error
+            job.finished_at = utc_now()
+            job.updated_at = job.finished_at
+            self._repo.update(job)
+        if self._metrics is not None:
+            self._metrics.finished(job)
         self._bus.publish(JobFailed(job_id=job.job_id, error=error))
         return job
 
-    def build_context(self, job_id: str) -> JobContext:
+    def cancel(self, job_id: str, reason: str = "cancelled") -> JobRecord:
+        """
+        Cancel a queued or running job; finished jobs are returned unchanged.
+
+        Queued jobs are skipped by the dispatcher, thread jobs see
+        `ctx.is_cancelled()`, and the worker pool's reaper kills process jobs.
+        """
+        with self._finish_lock:
+            job = self._require(job_id)
+            if job.is_terminal:
+                return job
+            self._signal_cancel(job_id)
+            job.status = JobStatus.CANCELLED
+            job.error = reason
+            job.message = reason
+            job.finished_at = utc_now()
+            job.updated_at = job.finished_at
+            self._repo.update(job)
+        if self._metrics is not None:
+            self._metrics.finished(job)
+        self._bus.publish(JobCancelled(job_id=job.job_id, reason=reason))
+        return job
+
+    def mark_timed_out(self, job_id: str) -> JobRecord:
+        with self._finish_lock:
+            job = self._require(job_id)
+            if job.is_terminal:
+                return job
+            self._signal_cancel(job_id)
+            job.status = JobStatus.TIMED_OUT
+            job.error = f"Timed out after {job.timeout:g}s"
+            job.message = job.error
+            job.finished_at = utc_now()
+            job.updated_at = job.finished_at
+            self._repo.update(job)
+        if self._metrics is not None:
+            self._metrics.finished(job)
+        self._bus.publish(JobTimedOut(job_id=job.job_id, timeout=job.timeout or 0.0))
+        return job
+
+    def mark_interrupted(self, job_id: str) -> JobRecord:
+        """Record a job whose handler stopped at `check_cancelled()`: timed out if past its timeout, else cancelled."""
+        job = self._require(job_id)
+        if job.is_terminal:
+            return job
+        if job.timeout is not None and job.started_at is not None:
+            if (utc_now() - job.started_at).total_seconds() >= job.timeout:
+                return self.mark_timed_out(job_id)
+        return self.cancel(job_id, "cancelled by handler")
+
+    def record_progress(self, job_id: str, progress: float, message: str = "") -> None:
+        """
+        Store progress on an unfinished job and publish `JobProgressed`.
+
+        Runs under the same lock as the status transitions, so an update
+        racing a cancel or timeout cannot bring the job back to RUNNING;
+        updates that arrive after the job finished are ignored.
+        """
+        with self._finish_lock:
+            job = self._repo.get(job_id)
+            if job is None or job.is_terminal:
+                return
+            job.progress = max(0.0, min(1.0, progress))
+            job.message = message
+            job.updated_at = utc_now()
+            self._repo.update(job)
+        self._bus.publish(
+            JobProgressed(
+                job_id=job_id,
+                progress=job.progress,
+                message=message,
+            )
+        )
+
+    def build_context(self, job_id: str, timeout: float | None = None) -> JobContext:
+        cancel_event = threading.Event()
+        with self._finish_lock:
+            self._cancel_events[job_id] = cancel_event
         return DefaultJobContext(
             job_id=job_id,
-            repo=self._repo,
-            bus=self._bus,
+            job_service=self,
+            min_interval=self._progress_min_interval,
+            min_delta=self._progress_min_delta,
+            cancel_event=cancel_event,
+            deadline=None if timeout is None else time.monotonic() + timeout,
         )
 
+    def requeue_incomplete(self) -> list[str]:
+        """
+        Re-enqueue jobs a previous process left QUEUED or RUNNING.
+
+        RUNNING jobs are reset to QUEUED since their worker is gone. Call once
+        at startup, before workers start.
+        """
+        job_ids: list[str] = []
+        for job in self._repo.find(status={JobStatus.QUEUED, JobStatus.RUNNING}):
+            if job.status == JobStatus.RUNNING:
+                job.status = JobStatus.QUEUED
+                job.progress = 0.0
+                job.started_at = None
+            job.message = "requeued after restart"
+            job.updated_at = utc_now()
+            self._repo.update(job)
+            self._enqueue(job)
+            self._bus.publish(JobQueued(job_id=job.job_id))
+            job_ids.append(job.job_id)
+        return job_ids
+
+    def close(self) -> None:
+        self._repo.close()
+
     def get_job(self, job_id: str) -> JobRecord | None:
         return self._repo.get(job_id)
 
@@ -178,6 +420,19 @@ class JobService:
             return None
         return JobStatusView.from_record(job)
 
+    def _enqueue(self, job: JobRecord) -> None:
+        self._queue.put(
+            job.job_id,
+            priority=job.priority,
+            job_type=job.job_type,
+            correlation_id=job.metadata.get("correlation_id"),
+        )
+
+    def _signal_cancel(self, job_id: str) -> None:
+        cancel_event = self._cancel_events.pop(job_id, None)
+        if cancel_event is not None:
+            cancel_event.set()
+
     def _require(self, job_id: str) -> JobRecord:
         job = self._repo.get(job_id)
         if job is None:
@@ -51,6 +51,7 @@ def load_settings(path: str | Path) -> QuantLabSettings:
             warehouse_dir=_path(storage.get("warehouse_dir"), StorageSettings().warehouse_dir),
             catalog_path=_path(storage.get("catalog_path"), StorageSettings().catalog_path),
             duckdb_path=_path(storage.get("duckdb_path"), StorageSettings().duckdb_path),
+            job_store_path=_path(storage.get("job_store_path"), StorageSettings().job_store_path),
             artifact_dir=_path(storage.get("artifact_dir"), StorageSettings().artifact_dir),
         ),
         research=ResearchSettings(
@@ -63,7 +64,31 @@ def load_settings(path: str | Path) -> QuantLabSettings:
             timezone=runtime.get("timezone", "UTC"),
             max_workers=int(runtime.get("max_workers", 4)),
             process_workers=int(runtime.get("process_workers", 2)),
+            process_warm_workers=bool(runtime.get("process_warm_workers", True)),
+            process_max_jobs_per_worker=int(runtime.get("process_max_jobs_per_worker", 0)),
+            process_progress_rate=float(runtime.get("process_progress_rate", 10.0)),
+            job_progress_min_interval=float(runtime.get("job_progress_min_interval", 0.1)),
+            job_progress_min_delta=float(runtime.get("job_progress_min_delta", 0.001)),
+            job_reap_interval=float(runtime.get("job_reap_interval", 0.25)),
+            duckdb_threads=int(runtime.get("duckdb_threads", 0)),
+            duckdb_memory_limit=str(runtime.get("duckdb_memory_limit", "")),
+            intraday_cache_max_bytes=int(runtime.get("intraday_cache_max_bytes", 2 * 1024**3)),
+            intraday_cache_ttl=float(runtime.get("intraday_cache_ttl", 86_400.0)),
             queue_poll_timeout=float(runtime.get("queue_poll_timeout", 0.5)),
+            event_bus=runtime.get("event_bus", "sync"),
+            bus_queue_capacity=int(runtime.get("bus_queue_capacity", 10_000)),
+            bus_backpressure=runtime.get("bus_backpressure", "block"),
+            bus_telemetry_sample_every=int(runtime.get("bus_telemetry_sample_every", 1)),
+            bus_handler_timing_sample_every=int(runtime.get("bus_handler_timing_sample_every", 16)),
+            job_store=runtime.get("job_store", "memory"),
+            job_queue=runtime.get("job_queue", "fifo"),
+            job_share_by=runtime.get("job_share_by", "job_type"),
+            job_share_weights={
+                key: float(value) for key, value in _section(runtime, "job_share_weights").items()
+            },
+            job_concurrency_limits={
+                key: int(value) for key, value in _section(runtime, "job_concurrency_limits").items()
+            },
         ),
         execution=ExecutionSettings(
             paper_trading=bool(execution.get("paper_trading", True)),
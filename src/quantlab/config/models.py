@@ -35,13 +35,17 @@ def _default_warehouse_dir() -> Path:
 
 
 def _default_catalog_path() -> Path:
-    return _default_crypto_data_root() / "catalog" / "catalog.json"
+    return _default_crypto_data_root() / "catalog" / "catalog.sqlite3"
 
 
 def _default_duckdb_path() -> Path:
     return _default_crypto_data_root() / "artifacts" / "quantlab.duckdb"
 
 
+def _default_job_store_path() -> Path:
+    return _default_crypto_data_root() / "artifacts" / "jobs.sqlite3"
+
+
 def _default_artifact_dir() -> Path:
     return _default_crypto_data_root() / "artifacts"
 
@@ -61,6 +65,7 @@ class StorageSettings:
     warehouse_dir: Path = field(default_factory=_default_warehouse_dir)
     catalog_path: Path = field(default_factory=_default_catalog_path)
     duckdb_path: Path = field(default_factory=_default_duckdb_path)
+    job_store_path: Path = field(default_factory=_default_job_store_path)
     artifact_dir: Path = field(default_factory=_default_artifact_dir)
 
 
@@ -77,7 +82,27 @@ class RuntimeSettings:
     timezone: str = "UTC"
     max_workers: int = 4
     process_workers: int = 2
+    process_warm_workers: bool = True
+    process_max_jobs_per_worker: int = 0  # 0 = never recycle
+    process_progress_rate: float = 10.0  # max progress updates applied per second from process jobs
+    job_progress_min_interval: float = 0.1  # seconds between progress writes from one thread job
+    job_progress_min_delta: float = 0.001  # smaller progress moves with the same message are coalesced
+    job_reap_interval: float = 0.25  # how often timeouts and cancellations of running jobs are enforced
+    duckdb_threads: int = 0  # 0 = DuckDB default (one per core)
+    duckdb_memory_limit: str = ""  # e.g. "8GB"; empty = DuckDB default
+    intraday_cache_max_bytes: int = 2 * 1024**3  # LRU eviction above this total
+    intraday_cache_ttl: float = 86_400.0  # seconds after which a cached frame is recomputed; 0 = never
     queue_poll_timeout: float = 0.5
+    event_bus: str = "sync"
+    bus_queue_capacity: int = 10_000
+    bus_backpressure: str = "block"
+    bus_telemetry_sample_every: int = 1
+    bus_handler_timing_sample_every: int = 16
+    job_store: str = "memory"
+    job_queue: str = "fifo"
+    job_share_by: str = "job_type"
+    job_share_weights: dict[str, float] = field(default_factory=dict)
+    job_concurrency_limits: dict[str, int] = field(default_factory=dict)
 
 
 @dataclass(frozen=True, slots=True)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
@@ -49,6 +49,58 @@ class LoggedEvent:
         )
 
 
+@dataclass(frozen=True, slots=True)
+class EventFilter:
+    """
+    Replay predicate that log readers can push down below full decoding.
+
+    Sequence bounds are inclusive, `start` is inclusive and `end` exclusive.
+    Logs are sequence-ordered, so readers stop once `max_sequence` is passed.
+    """
+
+    event_types: frozenset[str] | None = None
+    min_sequence: int | None = None
+    max_sequence: int | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+    correlation_ids: frozenset[str] | None = None
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        event_types: Iterable[str] | None = None,
+        min_sequence: int | None = None,
+        max_sequence: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        correlation_ids: Iterable[str] | None = None,
+    ) -> "EventFilter":
+        return cls(
+            event_types=frozenset(event_types) if event_types is not None else None,
+            min_sequence=min_sequence,
+            max_sequence=max_sequence,
+            start=start,
+            end=end,
+            correlation_ids=frozenset(correlation_ids) if correlation_ids is not None else None,
+        )
+
+    def matches(self, event: LoggedEvent) -> bool:
+        if self.event_types is not None and event.event_type not in self.event_types:
+            return False
+        if self.min_sequence is not None and event.sequence < self.min_sequence:
+            return False
+        if self.max_sequence is not None and event.sequence > self.max_sequence:
+            return False
+        if self.start is not None and event.occurred_at < self.start:
+            return False
+        if self.end is not None and event.occurred_at >= self.end:
+            return False
+        if self.correlation_ids is not None and event.correlation_id not in self.correlation_ids:
+            return False
+        return True
+
+
 class EventLog(ABC):
     @abstractmethod
     def append(self, event: LoggedEvent) -> None:
@@ -61,3 +113,30 @@ class EventLog(ABC):
     @abstractmethod
     def next_sequence(self) -> int:
         raise NotImplementedError
+
+    def read(self, event_filter: EventFilter | None = None) -> Iterable[LoggedEvent]:
+        if event_filter is None:
+            yield from self.read_all()
+            return
+        for event in self.read_all():
+            if event_filter.max_sequence is not None and event.sequence > event_filter.max_sequence:
+                return
+            if event_filter.matches(event):
+                yield event
+
+    def read_from(
+        self,
+        sequence: int | None,
+        event_types: Collection[str] | None = None,
+    ) -> Iterable[LoggedEvent]:
+        return self.read(EventFilter.build(min_sequence=sequence, event_types=event_types))
+
+    def append_many(self, events: Iterable[LoggedEvent]) -> None:
+        for event in events:
+            self.append(event)
+
+    def flush(self) -> None:
+        return
+
+    def close(self) -> None:
+        self.flush()
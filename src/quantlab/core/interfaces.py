@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Protocol
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from typing import Protocol, runtime_checkable
 
 from quantlab.core.events import DomainEvent
-from quantlab.core.jobs import JobRecord, JobSpec
+from quantlab.core.jobs import JobCancelledError, JobRecord, JobSpec, JobStatus
 
 
 class EventHandler(Protocol):
     def __call__(self, event: DomainEvent) -> None: ...
 
 
+@runtime_checkable
+class BatchEventHandler(Protocol):
+    """Handlers exposing `handle_batch` receive same-type batches from `publish_batch`."""
+
+    def __call__(self, event: DomainEvent) -> None: ...
+
+    def handle_batch(self, events: Sequence[DomainEvent]) -> None: ...
+
+
 class EventBus(ABC):
     @abstractmethod
     def subscribe(self, event_type: str | type[DomainEvent], handler: EventHandler) -> None:
@@ -20,6 +30,13 @@ class EventBus(ABC):
     def publish(self, event: DomainEvent) -> None:
         raise NotImplementedError
 
+    def publish_batch(self, events: Iterable[DomainEvent]) -> None:
+        for event in events:
+            self.publish(event)
+
+    def close(self) -> None:
+        return
+
 
 class JobRepository(ABC):
     @abstractmethod
@@ -30,6 +47,15 @@ class JobRepository(ABC):
     def get(self, job_id: str) -> JobRecord | None:
         raise NotImplementedError
 
+    def get_many(self, job_ids: Iterable[str]) -> dict[str, JobRecord]:
+        """Jobs by id in one round-trip where the backend allows it; unknown ids are omitted."""
+        jobs = {}
+        for job_id in job_ids:
+            job = self.get(job_id)
+            if job is not None:
+                jobs[job_id] = job
+        return jobs
+
     @abstractmethod
     def update(self, job: JobRecord) -> None:
         raise NotImplementedError
@@ -38,22 +64,91 @@ class JobRepository(ABC):
     def find_active_by_dedupe_key(self, dedupe_key: str) -> JobRecord | None:
         raise NotImplementedError
 
+    @abstractmethod
+    def add_if_absent(self, dedupe_key: str, job: JobRecord) -> JobRecord | None:
+        """
+        Atomically add `job` unless an active job already holds `dedupe_key`.
+
+        Returns that existing job, or None when `job` was added.
+        """
+        raise NotImplementedError
+
+    def find(
+        self,
+        *,
+        status: JobStatus | Collection[JobStatus] | None = None,
+        job_type: str | None = None,
+    ) -> list[JobRecord]:
+        """
+        Jobs matching every given criterion, oldest first.
+
+        Optional: the interface has no way to enumerate jobs, so backends
+        that cannot search raise here, and only the features that need it
+        (e.g. `JobService.requeue_incomplete`) are unavailable.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support find()")
+
+    def close(self) -> None:
+        return
+
 
 class JobQueue(ABC):
     @abstractmethod
-    def put(self, job_id: str) -> None:
+    def put(
+        self,
+        job_id: str,
+        *,
+        priority: int = 0,
+        job_type: str | None = None,
+        correlation_id: str | None = None,
+    ) -> None:
+        """Enqueue `job_id`; schedulers may use the keyword hints, FIFO queues ignore them."""
         raise NotImplementedError
 
     @abstractmethod
     def get(self, timeout: float | None = None) -> str | None:
         raise NotImplementedError
 
+    def get_many(self, max_items: int, timeout: float | None = None) -> list[str]:
+        """Wait up to `timeout` for one job id, then take up to `max_items` without waiting."""
+        first = self.get(timeout)
+        if first is None:
+            return []
+        job_ids = [first]
+        while len(job_ids) < max_items:
+            job_id = self.get(timeout=0)
+            if job_id is None:
+                break
+            job_ids.append(job_id)
+        return job_ids
+
+    def close(self) -> None:
+        """Wake blocked getters; afterwards `get` and `get_many` return immediately when empty."""
+        return
+
+    def task_done(self, job_id: str) -> None:
+        """Called by workers once a job taken with `get` has finished or been skipped."""
+        return
+
 
 class JobContext(ABC):
     @abstractmethod
     def set_progress(self, progress: float, message: str = "") -> None:
         raise NotImplementedError
 
+    def flush(self) -> None:
+        """Apply progress held back by throttling; runners call it before marking a job finished."""
+        return
+
+    def is_cancelled(self) -> bool:
+        """True once the job was cancelled or ran past its timeout."""
+        return False
+
+    def check_cancelled(self) -> None:
+        """Cooperative preemption point for long-running handlers."""
+        if self.is_cancelled():
+            raise JobCancelledError("Job was cancelled")
+
 
 class JobHandler(Protocol):
     def __call__(self, payload: dict, ctx: JobContext) -> dict: ...
@@ -68,6 +163,10 @@ class JobRegistry(ABC):
     def get(self, job_type: str) -> JobHandler:
         raise NotImplementedError
 
+    def handlers(self) -> Mapping[str, JobHandler]:
+        """Registered handlers by job_type, for preloading into workers; empty if not enumerable."""
+        return {}
+
 
 class JobRunner(Protocol):
     def run(self, job_id: str) -> None: ...
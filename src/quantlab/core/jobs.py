@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, UTC
 from enum import Enum
 from typing import Any
@@ -17,6 +17,55 @@ class JobStatus(str, Enum):
     RUNNING = "running"
     SUCCEEDED = "succeeded"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMED_OUT = "timed_out"
+
+
+class JobCancelledError(RuntimeError):
+    """Raised inside a handler by `JobContext.check_cancelled()` once its job was cancelled or timed out."""
+
+
+class ReadOnlyDict(dict[str, Any]):
+    """A `dict` that rejects mutation; copy it with `dict(...)` to change it."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("job records are read-only snapshots; assign a new dict instead")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (dict(self),)
+
+
+class ReadOnlyList(list[Any]):
+    """A `list` that rejects mutation; copy it with `list(...)` to change it."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("job records are read-only snapshots; assign a new list instead")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (list(self),)
+
+
+def read_only(value: Any) -> Any:
+    """`value` with every nested dict and list replaced by its read-only counterpart."""
+    if isinstance(value, (ReadOnlyDict, ReadOnlyList)):
+        return value  # built by this function, so already read-only all the way down
+    if isinstance(value, dict):
+        return ReadOnlyDict({key: read_only(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return ReadOnlyList(read_only(item) for item in value)
+    if isinstance(value, tuple) and type(value) is tuple:
+        return tuple(read_only(item) for item in value)
+    return value
 
 
 class JobExecutionMode(str, Enum):
@@ -31,6 +80,8 @@ class JobSpec:
     dedupe_key: str | None = None
     execution_mode: JobExecutionMode = JobExecutionMode.THREAD
     metadata: dict[str, Any] = field(default_factory=dict)
+    priority: int = 0  # higher runs first
+    timeout: float | None = None  # seconds of run time before the job is reaped
 
 
 @dataclass(slots=True)
@@ -42,6 +93,8 @@ class JobRecord:
     dedupe_key: str | None
     execution_mode: JobExecutionMode
     metadata: dict[str, Any]
+    priority: int = 0
+    timeout: float | None = None
     progress: float = 0.0
     message: str = ""
     result: dict[str, Any] | None = None
@@ -61,6 +114,24 @@ class JobRecord:
             dedupe_key=spec.dedupe_key,
             execution_mode=spec.execution_mode,
             metadata=dict(spec.metadata),
+            priority=spec.priority,
+            timeout=spec.timeout,
+        )
+
+    def snapshot(self) -> "JobRecord":
+        """
+        Copy whose top-level fields are independent and whose `payload`,
+        `metadata` and `result` are read-only (see `read_only`).
+
+        Containers that are already read-only are shared rather than copied,
+        so snapshots of a stored snapshot cost no copy; replacing a field
+        with a new dict is the way to change it.
+        """
+        return replace(
+            self,
+            payload=read_only(self.payload),
+            metadata=read_only(self.metadata),
+            result=read_only(self.result),
         )
 
     @property
@@ -69,4 +140,4 @@ class JobRecord:
 
     @property
     def is_terminal(self) -> bool:
-        return self.status in {JobStatus.SUCCEEDED, JobStatus.FAILED}
+        return self.status in {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED, JobStatus.TIMED_OUT}
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol, TypeVar
+
+
+@dataclass(frozen=True, slots=True)
+class LatencySummary:
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class CounterMetric(Protocol):
+    def inc(self, amount: float = 1.0) -> None: ...
+
+
+class GaugeMetric(Protocol):
+    def set(self, value: float) -> None: ...
+
+    def set_function(self, function: Callable[[], float]) -> None: ...
+
+
+class HistogramMetric(Protocol):
+    def observe_seconds(self, value: float) -> None: ...
+
+
+MetricT_co = TypeVar("MetricT_co", covariant=True)
+
+
+class LabeledMetric(Protocol[MetricT_co]):
+    def labels(self, *values: str) -> MetricT_co: ...
+
+
+class Metrics(Protocol):
+    """
+    What services need from a metrics registry; `quantlab.infra.metrics.MetricsRegistry` implements it.
+
+    Keeps `app` code instrumented without importing an implementation.
+    """
+
+    def counter(self, name: str, help: str = "", labelnames: tuple[str, ...] = ()) -> LabeledMetric[CounterMetric]: ...
+
+    def gauge(self, name: str, help: str = "", labelnames: tuple[str, ...] = ()) -> LabeledMetric[GaugeMetric]: ...
+
+    def histogram(
+        self, name: str, help: str = "", labelnames: tuple[str, ...] = ()
+    ) -> LabeledMetric[HistogramMetric]: ...
+
+    def snapshot(self) -> dict[str, float | LatencySummary]: ...
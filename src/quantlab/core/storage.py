@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Any
 
 
 class BinaryStore(ABC):
@@ -16,3 +17,26 @@ class BinaryStore(ABC):
     @abstractmethod
     def exists(self, key: str) -> bool:
         raise NotImplementedError
+
+
+class SharedHandle(ABC):
+    """
+    Picklable reference to data shared between processes instead of the data itself.
+
+    `quantlab.infra.storage.ArrowHandle` is the implementation for Arrow tables.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def open(self) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self) -> None:
+        raise NotImplementedError
+
+
+def open_value(value: Any) -> Any:
+    """`value.open()` for a `SharedHandle`, `value` unchanged otherwise."""
+    return value.open() if isinstance(value, SharedHandle) else value
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
 from quantlab.core.events import DomainEvent
 from quantlab.core.interfaces import EventBus, EventHandler
 from quantlab.domain.events import FeatureCalculated, MarketDataArrived
@@ -14,8 +19,24 @@ class FeatureCalculationHandler(EventHandler):
             return
 
         feature_value = event.last_price * event.volume
+        self._bus.publish(self._feature_event(event, feature_value))
+
+    def handle_batch(self, events: Sequence[DomainEvent]) -> None:
+        bars = [event for event in events if isinstance(event, MarketDataArrived)]
+        if not bars:
+            return
 
-        next_event = FeatureCalculated(
+        last_price = pa.array([event.last_price for event in bars], type=pa.float64())
+        volume = pa.array([event.volume for event in bars], type=pa.float64())
+        feature_values = pc.multiply(last_price, volume).to_pylist()
+
+        self._bus.publish_batch(
+            [self._feature_event(event, value) for event, value in zip(bars, feature_values)]
+        )
+
+    @staticmethod
+    def _feature_event(event: MarketDataArrived, feature_value: float) -> FeatureCalculated:
+        return FeatureCalculated(
             symbol=event.symbol,
             timestamp=event.timestamp,
             feature_name="price_x_volume",
@@ -24,5 +45,3 @@ class FeatureCalculationHandler(EventHandler):
             correlation_id=event.correlation_id or event.event_id,
             causation_id=event.event_id,
         )
-
-        self._bus.publish(next_event)
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
 from quantlab.core.events import DomainEvent
 from quantlab.core.interfaces import EventBus, EventHandler
 from quantlab.domain.events import FeatureCalculated, SignalGenerated
@@ -16,8 +21,26 @@ class SignalGenerationHandler(EventHandler):
 
         side = "BUY" if event.feature_value >= self._threshold else "FLAT"
         strength = min(event.feature_value / self._threshold, 2.0)
+        self._bus.publish(self._signal_event(event, side, strength))
+
+    def handle_batch(self, events: Sequence[DomainEvent]) -> None:
+        features = [event for event in events if isinstance(event, FeatureCalculated)]
+        if not features:
+            return
 
-        next_event = SignalGenerated(
+        values = pa.array([event.feature_value for event in features], type=pa.float64())
+        is_buy = pc.greater_equal(values, self._threshold).to_pylist()
+        strengths = pc.min_element_wise(pc.divide(values, self._threshold), 2.0).to_pylist()
+
+        self._bus.publish_batch(
+            [
+                self._signal_event(event, "BUY" if buy else "FLAT", strength)
+                for event, buy, strength in zip(features, is_buy, strengths)
+            ]
+        )
+
+    def _signal_event(self, event: FeatureCalculated, side: str, strength: float) -> SignalGenerated:
+        return SignalGenerated(
             symbol=event.symbol,
             timestamp=event.timestamp,
             side=side,
@@ -27,5 +50,3 @@ class SignalGenerationHandler(EventHandler):
             correlation_id=event.correlation_id or event.event_id,
             causation_id=event.event_id,
         )
-
-        self._bus.publish(next_event)
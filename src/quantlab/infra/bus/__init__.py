@@ -1,3 +1,4 @@
+from .async_bus import AsyncEventBus, BackpressurePolicy, LaneStats, default_coalesce_key
 from .in_memory import InMemoryEventBus
 from .middleware import (
     BusMiddleware,
@@ -6,6 +7,15 @@ from .middleware import (
     TimingMiddleware,
 )
 from .registry import SubscriptionRegistry
+from .telemetry import (
+    EventRecord,
+    EventTelemetry,
+    EveryNthSampler,
+    RateLimitSampler,
+    TelemetryMiddleware,
+    sample_all,
+    shared_telemetry,
+)
 
 __all__ = [
     "SubscriptionRegistry",
@@ -13,5 +23,16 @@ __all__ = [
     "LoggingMiddleware",
     "TimingMiddleware",
     "ExceptionMiddleware",
+    "TelemetryMiddleware",
+    "EventTelemetry",
+    "EventRecord",
+    "EveryNthSampler",
+    "RateLimitSampler",
+    "sample_all",
+    "shared_telemetry",
     "InMemoryEventBus",
+    "AsyncEventBus",
+    "BackpressurePolicy",
+    "LaneStats",
+    "default_coalesce_key",
 ]
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from enum import Enum
+
+from quantlab.core.events import DomainEvent
+from quantlab.core.interfaces import EventBus, EventHandler
+from quantlab.infra.bus.in_memory import Pipeline, build_pipeline, handler_name
+from quantlab.infra.bus.middleware import BusMiddleware
+from quantlab.infra.metrics import MetricsRegistry
+
+logger = logging.getLogger("quantlab.eventbus")
+
+CoalesceKey = Callable[[DomainEvent], Hashable]
+
+
+class BackpressurePolicy(str, Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE_LATEST = "coalesce_latest"
+
+
+def default_coalesce_key(event: DomainEvent) -> Hashable:
+    return (
+        event.event_type,
+        getattr(event, "symbol", None),
+        getattr(event, "job_id", None),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class LaneStats:
+    name: str
+    event_type: str
+    policy: str
+    capacity: int
+    depth: int
+    max_depth: int
+    enqueued: int
+    delivered: int
+    failed: int
+    dropped: int
+    coalesced: int
+
+
+class _SubscriberLane:
+    def __init__(
+        self,
+        name: str,
+        event_type: str,
+        pipeline: Pipeline,
+        capacity: int,
+        policy: BackpressurePolicy,
+        coalesce_key: CoalesceKey,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("lane capacity must be positive")
+
+        self.name = name
+        self.event_type = event_type
+        self._pipeline = pipeline
+        self._capacity = capacity
+        self._policy = policy
+        self._coalesce_key = coalesce_key
+        self._sequence = itertools.count()
+
+        self._pending: OrderedDict[Hashable, DomainEvent] = OrderedDict()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._busy = False
+        self._closed = False
+
+        self._max_depth = 0
+        self._enqueued = 0
+        self._delivered = 0
+        self._failed = 0
+        self._dropped = 0
+        self._coalesced = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"event-lane-{name}", daemon=True)
+        self._thread.start()
+
+    def offer(self, event: DomainEvent) -> None:
+        with self._lock:
+            if self._closed:
+                self._dropped += 1
+                return
+
+            if self._policy is BackpressurePolicy.COALESCE_LATEST:
+                key = self._coalesce_key(event)
+                if key in self._pending:
+                    self._pending[key] = event
+                    self._coalesced += 1
+                    return
+                if len(self._pending) >= self._capacity:
+                    self._pending.popitem(last=False)
+                    self._dropped += 1
+            else:
+                key = next(self._sequence)
+                if self._policy is BackpressurePolicy.DROP_OLDEST:
+                    if len(self._pending) >= self._capacity:
+                        self._pending.popitem(last=False)
+                        self._dropped += 1
+                else:
+                    while len(self._pending) >= self._capacity and not self._closed:
+                        self._not_full.wait()
+                    if self._closed:
+                        self._dropped += 1
+                        return
+
+            self._pending[key] = event
+            self._enqueued += 1
+            self._max_depth = max(self._max_depth, len(self._pending))
+            self._not_empty.notify()
+
+    def wait_idle(self, deadline: float | None) -> bool:
+        with self._lock:
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+            return True
+
+    def close(self, timeout: float | None) -> None:
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> LaneStats:
+        with self._lock:
+            return LaneStats(
+                name=self.name,
+                event_type=self.event_type,
+                policy=self._policy.value,
+                capacity=self._capacity,
+                depth=len(self._pending),
+                max_depth=self._max_depth,
+                enqueued=self._enqueued,
+                delivered=self._delivered,
+                failed=self._failed,
+                dropped=self._dropped,
+                coalesced=self._coalesced,
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._not_empty.wait()
+                if not self._pending:
+                    self._idle.notify_all()
+                    return
+                _, event = self._pending.popitem(last=False)
+                self._busy = True
+                self._not_full.notify()
+
+            failed = False
+            try:
+                self._pipeline(event)
+            except Exception:
+                # nobody awaits a lane, so log here what the sync bus raises to the publisher
+                logger.exception(
+                    "Handler on lane %s failed for event_type=%s event_id=%s",
+                    self.name,
+                    event.event_type,
+                    event.event_id,
+                )
+                failed = True
+
+            with self._lock:
+                if failed:
+                    self._failed += 1
+                else:
+                    self._delivered += 1
+                self._busy = False
+                if not self._pending:
+                    self._idle.notify_all()
+
+
+class AsyncEventBus(EventBus):
+    """
+    Event bus that hands every subscriber its own bounded queue and thread.
+
+    `publish` only enqueues, so a slow subscriber delays nobody but itself.
+    Middlewares run on the lane thread around each handler call. With the
+    BLOCK policy a handler must not publish into its own full lane.
+    """
+
+    def __init__(
+        self,
+        middlewares: Iterable[BusMiddleware] | None = None,
+        capacity: int = 10_000,
+        policy: BackpressurePolicy | str = BackpressurePolicy.BLOCK,
+        coalesce_key: CoalesceKey = default_coalesce_key,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        self._middlewares: tuple[BusMiddleware, ...] = tuple(middlewares or ())
+        self._capacity = capacity
+        self._policy = BackpressurePolicy(policy)
+        self._coalesce_key = coalesce_key
+
+        self._lanes: dict[str, list[_SubscriberLane]] = {}
+        self._routes: dict[str, tuple[_SubscriberLane, ...]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._published = None
+        self._lane_depth = None
+        if metrics is not None:
+            self._published = metrics.counter(
+                "eventbus_events_published_total",
+                "Events published on the bus.",
+                ("event_type",),
+            )
+            self._lane_depth = metrics.gauge(
+                "eventbus_lane_depth",
+                "Events waiting in each subscriber lane.",
+                ("lane",),
+            )
+
+    def subscribe(
+        self,
+        event_type: str | type[DomainEvent],
+        handler: EventHandler,
+        *,
+        capacity: int | None = None,
+        policy: BackpressurePolicy | str | None = None,
+        coalesce_key: CoalesceKey | None = None,
+    ) -> None:
+        key = event_type if isinstance(event_type, str) else event_type.event_name()
+
+        pipeline = build_pipeline(self._middlewares, handler)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("AsyncEventBus is closed")
+            lanes = self._lanes.setdefault(key, [])
+            lane = _SubscriberLane(
+                name=f"{key}#{len(lanes)}:{handler_name(handler)}",
+                event_type=key,
+                pipeline=pipeline,
+                capacity=capacity or self._capacity,
+                policy=BackpressurePolicy(policy) if policy is not None else self._policy,
+                coalesce_key=coalesce_key or self._coalesce_key,
+            )
+            lanes.append(lane)
+            self._routes = {}
+
+        if self._lane_depth is not None:
+            self._lane_depth.labels(lane.name).set_function(lambda: lane.stats().depth)
+
+    def publish(self, event: DomainEvent) -> None:
+        if self._published is not None:
+            self._published.labels(event.event_type).inc()
+        lanes = self._routes.get(event.event_type)
+        if lanes is None:
+            lanes = self._route(event.event_type)
+        for lane in lanes:
+            lane.offer(event)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every lane is empty and idle; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return all(lane.wait_idle(deadline) for lane in self._all_lanes())
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        with self._lock:
+            self._closed = True
+        for lane in self._all_lanes():
+            lane.close(timeout)
+        for middleware in self._middlewares:
+            middleware.close()
+
+    def lane_stats(self) -> list[LaneStats]:
+        return [lane.stats() for lane in self._all_lanes()]
+
+    def _all_lanes(self) -> list[_SubscriberLane]:
+        with self._lock:
+            return [lane for lanes in self._lanes.values() for lane in lanes]
+
+    def _route(self, event_type: str) -> tuple[_SubscriberLane, ...]:
+        with self._lock:
+            lanes = list(self._lanes.get(event_type, ()))
+            if event_type != "*":
+                lanes.extend(self._lanes.get("*", ()))
+            route = tuple(lanes)
+            self._routes[event_type] = route
+            return route
@@ -1,45 +1,275 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import itertools
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from time import perf_counter_ns
 
 from quantlab.core.events import DomainEvent
 from quantlab.core.interfaces import EventBus, EventHandler
 from quantlab.infra.bus.middleware import BusMiddleware
 from quantlab.infra.bus.registry import SubscriptionRegistry
+from quantlab.infra.metrics import Counter, Histogram, MetricsRegistry
+
+Pipeline = Callable[[DomainEvent], None]
+BatchPipeline = Callable[[Sequence[DomainEvent]], None]
+
+
+def _noop(event: object) -> None:
+    return
+
+
+def handler_name(handler: object) -> str:
+    return getattr(handler, "__qualname__", None) or type(handler).__qualname__
+
+
+def _timed(handler: Callable, histogram: Histogram, sample_every: int = 1) -> Callable:
+    """Time one call in `sample_every`; each sample is weighted by the rate so counts and sums stay comparable."""
+    calls = itertools.count()
+
+    def timed(arg: object) -> None:
+        if next(calls) % sample_every:
+            handler(arg)
+            return
+        start = perf_counter_ns()
+        try:
+            handler(arg)
+        finally:
+            histogram.observe_ns(perf_counter_ns() - start, sample_every)
+
+    return timed
+
+
+def _counted(pipeline: Pipeline, counter: Counter) -> Pipeline:
+    def counted(event: DomainEvent) -> None:
+        counter.inc()
+        pipeline(event)
+
+    return counted
+
+
+def _counted_batch(pipeline: BatchPipeline, counter: Counter) -> BatchPipeline:
+    def counted(events: Sequence[DomainEvent]) -> None:
+        counter.inc(len(events))
+        pipeline(events)
+
+    return counted
+
+
+def _build_dispatch(handlers: tuple[EventHandler, ...]) -> Pipeline:
+    if not handlers:
+        return _noop
+    if len(handlers) == 1:
+        return handlers[0]
+
+    def dispatch(event: DomainEvent) -> None:
+        for handler in handlers:
+            handler(event)
+
+    return dispatch
+
+
+def _as_batch_handler(handler: EventHandler) -> BatchPipeline:
+    handle_batch = getattr(handler, "handle_batch", None)
+    if handle_batch is not None:
+        return handle_batch
+
+    def dispatch_each(events: Sequence[DomainEvent]) -> None:
+        for event in events:
+            handler(event)
+
+    return dispatch_each
+
+
+def _build_batch_dispatch(batch_handlers: tuple[BatchPipeline, ...]) -> BatchPipeline:
+    if not batch_handlers:
+        return _noop
+    if len(batch_handlers) == 1:
+        return batch_handlers[0]
+
+    def dispatch(events: Sequence[DomainEvent]) -> None:
+        for handler in batch_handlers:
+            handler(events)
+
+    return dispatch
+
+
+def _wrap(middleware: BusMiddleware, next_call: Pipeline) -> Pipeline:
+    def wrapper(event: DomainEvent) -> None:
+        middleware(event, next_call)
+
+    return wrapper
+
+
+def _wrap_batch(middleware: BusMiddleware, next_call: BatchPipeline) -> BatchPipeline:
+    def wrapper(events: Sequence[DomainEvent]) -> None:
+        middleware.handle_batch(events, next_call)
+
+    return wrapper
+
+
+def build_pipeline(middlewares: Sequence[BusMiddleware], dispatch: Pipeline) -> Pipeline:
+    """Wrap `dispatch` in `middlewares`, the first one outermost; shared by every bus implementation."""
+    pipeline = dispatch
+    for middleware in reversed(middlewares):
+        pipeline = _wrap(middleware, pipeline)
+    return pipeline
+
+
+def build_batch_pipeline(middlewares: Sequence[BusMiddleware], dispatch: BatchPipeline) -> BatchPipeline:
+    """`build_pipeline` for same-type batches, going through each middleware's `handle_batch`."""
+    pipeline = dispatch
+    for middleware in reversed(middlewares):
+        pipeline = _wrap_batch(middleware, pipeline)
+    return pipeline
 
 
 class InMemoryEventBus(EventBus):
+    """
+    Synchronous bus that compiles one dispatch pipeline per event type.
+
+    Pipelines are cached until the registry version or the middleware list
+    changes, so steady-state publish is a dict lookup plus the handler calls.
+    With `metrics`, the publish counter is striped per thread and handler
+    latency is timed on one call in `timing_sample_every`.
+    """
+
     def __init__(
         self,
         registry: SubscriptionRegistry | None = None,
-        middlewares: list[BusMiddleware] | None = None,
+        middlewares: Iterable[BusMiddleware] | None = None,
+        metrics: MetricsRegistry | None = None,
+        timing_sample_every: int = 1,
     ) -> None:
+        if timing_sample_every <= 0:
+            raise ValueError("timing_sample_every must be positive")
         self._registry = registry or SubscriptionRegistry()
-        self._middlewares = middlewares or []
+        self._timing_sample_every = timing_sample_every
+        self._middlewares: tuple[BusMiddleware, ...] = tuple(middlewares or ())
+        self._published = None
+        self._handler_seconds = None
+        if metrics is not None:
+            self._published = metrics.counter(
+                "eventbus_events_published_total",
+                "Events published on the bus.",
+                ("event_type",),
+            )
+            self._handler_seconds = metrics.histogram(
+                "eventbus_handler_seconds",
+                "Time spent in each subscribed handler per call.",
+                ("event_type", "handler"),
+            )
+        self._pipelines: dict[str, Pipeline] = {}
+        self._batch_pipelines: dict[str, BatchPipeline] = {}
+        self._compiled_version = self._registry.version
+        self._lock = threading.Lock()
+
+    @property
+    def middlewares(self) -> tuple[BusMiddleware, ...]:
+        return self._middlewares
 
     def subscribe(self, event_type: str | type[DomainEvent], handler: EventHandler) -> None:
         self._registry.subscribe(event_type, handler)
 
+    def add_middleware(self, middleware: BusMiddleware) -> None:
+        self.set_middlewares((*self._middlewares, middleware))
+
+    def set_middlewares(self, middlewares: Iterable[BusMiddleware]) -> None:
+        with self._lock:
+            self._middlewares = tuple(middlewares)
+            self._pipelines = {}
+            self._batch_pipelines = {}
+
+    def close(self) -> None:
+        for middleware in self._middlewares:
+            middleware.close()
+
     def publish(self, event: DomainEvent) -> None:
-        handlers = self._registry.get_handlers(event.event_type)
-        handlers.extend(self._registry.get_handlers("*"))
+        pipeline = None
+        if self._registry.version == self._compiled_version:
+            pipeline = self._pipelines.get(event.event_type)
+        if pipeline is None:
+            pipeline = self._compile(event.event_type)
+        pipeline(event)
 
-        def dispatch(evt: DomainEvent) -> None:
-            for handler in handlers:
-                handler(evt)
+    def publish_batch(self, events: Iterable[DomainEvent]) -> None:
+        """
+        Group events by type and run each group through its batch pipeline.
 
-        pipeline: Callable[[DomainEvent], None] = dispatch
+        Order is preserved within an event type, not across types.
+        """
+        groups: dict[str, list[DomainEvent]] = {}
+        for event in events:
+            group = groups.get(event.event_type)
+            if group is None:
+                groups[event.event_type] = group = []
+            group.append(event)
 
-        for middleware in reversed(self._middlewares):
-            next_call = pipeline
+        for event_type, batch in groups.items():
+            pipeline = None
+            if self._registry.version == self._compiled_version:
+                pipeline = self._batch_pipelines.get(event_type)
+            if pipeline is None:
+                pipeline = self._compile_batch(event_type)
+            pipeline(batch)
 
-            def wrapper(
-                evt: DomainEvent,
-                mw: BusMiddleware = middleware,
-                nxt: Callable[[DomainEvent], None] = next_call,
-            ) -> None:
-                mw(evt, nxt)
+    def _handlers_for(self, event_type: str) -> tuple[EventHandler, ...]:
+        handlers = self._registry.get_handlers(event_type)
+        if event_type != "*":
+            handlers.extend(self._registry.get_handlers("*"))
+        return tuple(handlers)
 
-            pipeline = wrapper
+    def _instrument(
+        self,
+        event_type: str,
+        handlers: tuple[EventHandler, ...],
+        callables: tuple[Callable, ...],
+    ) -> tuple[Callable, ...]:
+        if self._handler_seconds is None:
+            return callables
+        return tuple(
+            _timed(call, self._handler_seconds.labels(event_type, handler_name(handler)), self._timing_sample_every)
+            for handler, call in zip(handlers, callables)
+        )
 
-        pipeline(event)
+    def _refresh_locked(self) -> None:
+        version = self._registry.version
+        if version != self._compiled_version:
+            self._pipelines = {}
+            self._batch_pipelines = {}
+            self._compiled_version = version
+
+    def _compile(self, event_type: str) -> Pipeline:
+        with self._lock:
+            self._refresh_locked()
+            pipeline = self._pipelines.get(event_type)
+            if pipeline is not None:
+                return pipeline
+
+            handlers = self._handlers_for(event_type)
+            pipeline = build_pipeline(
+                self._middlewares, _build_dispatch(self._instrument(event_type, handlers, handlers))
+            )
+            if self._published is not None:
+                pipeline = _counted(pipeline, self._published.labels(event_type))
+
+            self._pipelines[event_type] = pipeline
+            return pipeline
+
+    def _compile_batch(self, event_type: str) -> BatchPipeline:
+        with self._lock:
+            self._refresh_locked()
+            pipeline = self._batch_pipelines.get(event_type)
+            if pipeline is not None:
+                return pipeline
+
+            handlers = self._handlers_for(event_type)
+            batch_handlers = self._instrument(
+                event_type, handlers, tuple(_as_batch_handler(handler) for handler in handlers)
+            )
+            pipeline = build_batch_pipeline(self._middlewares, _build_batch_dispatch(batch_handlers))
+            if self._published is not None:
+                pipeline = _counted_batch(pipeline, self._published.labels(event_type))
+
+            self._batch_pipelines[event_type] = pipeline
+            return pipeline
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from time import perf_counter
 
 from quantlab.core.events import DomainEvent
 
 NextCallable = Callable[[DomainEvent], None]
+NextBatchCallable = Callable[[Sequence[DomainEvent]], None]
 
 
 class BusMiddleware(ABC):
@@ -14,6 +15,22 @@ class BusMiddleware(ABC):
     def __call__(self, event: DomainEvent, next_call: NextCallable) -> None:
         raise NotImplementedError
 
+    def handle_batch(self, events: Sequence[DomainEvent], next_call: NextBatchCallable) -> None:
+        """
+        Batch hook, called once per same-type batch from `publish_batch`.
+
+        The default keeps per-event semantics by running `__call__` for each
+        event and forwarding only the events it passed on.
+        """
+        passed: list[DomainEvent] = []
+        for event in events:
+            self(event, passed.append)
+        if passed:
+            next_call(passed)
+
+    def close(self) -> None:
+        return
+
 
 class LoggingMiddleware(BusMiddleware):
     def __call__(self, event: DomainEvent, next_call: NextCallable) -> None:
@@ -25,6 +42,16 @@ class LoggingMiddleware(BusMiddleware):
         )
         next_call(event)
 
+    def handle_batch(self, events: Sequence[DomainEvent], next_call: NextBatchCallable) -> None:
+        first = events[0]
+        print(
+            f"[EventBus] event_type={first.event_type} "
+            f"batch_size={len(events)} "
+            f"first_event_id={first.event_id} "
+            f"last_event_id={events[-1].event_id}"
+        )
+        next_call(events)
+
 
 class TimingMiddleware(BusMiddleware):
     def __call__(self, event: DomainEvent, next_call: NextCallable) -> None:
@@ -38,6 +65,18 @@ class TimingMiddleware(BusMiddleware):
                 f"elapsed_ms={elapsed_ms:.3f}"
             )
 
+    def handle_batch(self, events: Sequence[DomainEvent], next_call: NextBatchCallable) -> None:
+        start = perf_counter()
+        try:
+            next_call(events)
+        finally:
+            elapsed_ms = (perf_counter() - start) * 1000.0
+            print(
+                f"[EventBusTiming] event_type={events[0].event_type} "
+                f"batch_size={len(events)} "
+                f"elapsed_ms={elapsed_ms:.3f}"
+            )
+
 
 class ExceptionMiddleware(BusMiddleware):
     def __call__(self, event: DomainEvent, next_call: NextCallable) -> None:
@@ -50,3 +89,14 @@ class ExceptionMiddleware(BusMiddleware):
                 f"error={exc!r}"
             )
             raise
+
+    def handle_batch(self, events: Sequence[DomainEvent], next_call: NextBatchCallable) -> None:
+        try:
+            next_call(events)
+        except Exception as exc:
+            print(
+                f"[EventBusError] event_type={events[0].event_type} "
+                f"batch_size={len(events)} "
+                f"error={exc!r}"
+            )
+            raise
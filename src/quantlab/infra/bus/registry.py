@@ -10,14 +10,23 @@ from quantlab.core.interfaces import EventHandler
 class SubscriptionRegistry:
     """
     event_type -> ordered handlers
+
+    `version` is bumped on every subscription so buses can cache their
+    dispatch pipelines and detect when they have gone stale.
     """
 
     def __init__(self) -> None:
         self._handlers: DefaultDict[str, list[EventHandler]] = defaultdict(list)
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     def subscribe(self, event_type: str | type[DomainEvent], handler: EventHandler) -> None:
         key = event_type if isinstance(event_type, str) else event_type.event_name()
         self._handlers[key].append(handler)
+        self._version += 1
 
     def get_handlers(self, event_type: str) -> list[EventHandler]:
         return list(self._handlers.get(event_type, []))
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from time import perf_counter_ns
+
+from quantlab.core.events import DomainEvent
+from quantlab.infra.bus.middleware import BusMiddleware, NextBatchCallable, NextCallable
+from quantlab.infra.metrics import LatencyHistogram, LatencySummary
+
+logger = logging.getLogger("quantlab.eventbus")
+
+Sampler = Callable[[str], bool]
+RecordSink = Callable[[Sequence["EventRecord"]], None]
+
+
+@dataclass(frozen=True, slots=True)
+class EventRecord:
+    event_type: str
+    event_id: str
+    source: str | None
+    occurred_at: datetime
+    elapsed_ns: int
+    batch_size: int = 1
+    error: str | None = None
+
+
+def sample_all(event_type: str) -> bool:
+    return True
+
+
+class EveryNthSampler:
+    """Keeps one event in `n`, counted across all event types."""
+
+    def __init__(self, n: int) -> None:
+        if n <= 0:
+            raise ValueError("n must be positive")
+        self._n = n
+        self._counter = itertools.count()
+
+    def __call__(self, event_type: str) -> bool:
+        return next(self._counter) % self._n == 0
+
+
+class RateLimitSampler:
+    """
+    Keeps at most `per_second` events per event type in each one-second window.
+
+    `overrides` sets per-type limits. Counts are updated without a lock, so a
+    window may admit a few extra records under heavy contention.
+    """
+
+    def __init__(self, per_second: float, overrides: Mapping[str, float] | None = None) -> None:
+        self._default = per_second
+        self._limits = dict(overrides or {})
+        self._windows: dict[str, list[float]] = {}
+
+    def __call__(self, event_type: str) -> bool:
+        now = time.monotonic()
+        window = self._windows.get(event_type)
+        if window is None or now - window[0] >= 1.0:
+            self._windows[event_type] = [now, 1.0]
+            return self._limits.get(event_type, self._default) >= 1.0
+        if window[1] >= self._limits.get(event_type, self._default):
+            return False
+        window[1] += 1.0
+        return True
+
+
+def log_records(records: Sequence[EventRecord]) -> None:
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    for record in records:
+        logger.debug(
+            "event_type=%s event_id=%s source=%s occurred_at=%s elapsed_ms=%.3f batch_size=%d error=%s",
+            record.event_type,
+            record.event_id,
+            record.source,
+            record.occurred_at.isoformat(),
+            record.elapsed_ns / 1e6,
+            record.batch_size,
+            record.error,
+        )
+
+
+class EventTelemetry:
+    """
+    Ring buffer of `EventRecord`s drained by a background thread.
+
+    Publishers only append to a bounded deque (atomic under the GIL, no lock);
+    when it is full the oldest records are overwritten. The drainer folds each
+    record into a per-event-type latency histogram and hands batches to `sink`;
+    its thread starts with the first record, so an idle instance costs nothing.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 65_536,
+        flush_interval: float = 0.25,
+        sink: RecordSink | None = log_records,
+    ) -> None:
+        self._buffer: deque[EventRecord] = deque(maxlen=capacity)
+        self._capacity = capacity
+        self._flush_interval = flush_interval
+        self._sink = sink
+        self._overwritten = 0
+
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def overwritten(self) -> int:
+        return self._overwritten
+
+    def record(self, record: EventRecord) -> None:
+        if self._thread is None:
+            self._start_drainer()
+        buffer = self._buffer
+        if len(buffer) == self._capacity:
+            self._overwritten += 1
+        buffer.append(record)
+
+    def flush(self) -> None:
+        records: list[EventRecord] = []
+        buffer = self._buffer
+        with self._lock:
+            while True:
+                try:
+                    records.append(buffer.popleft())
+                except IndexError:
+                    break
+            for record in records:
+                histogram = self._histograms.get(record.event_type)
+                if histogram is None:
+                    histogram = self._histograms[record.event_type] = LatencyHistogram()
+                histogram.record(record.elapsed_ns // record.batch_size, record.batch_size)
+                if record.error is not None:
+                    self._errors[record.event_type] = self._errors.get(record.event_type, 0) + 1
+
+        if records and self._sink is not None:
+            try:
+                self._sink(records)
+            except Exception:
+                logger.exception("event telemetry sink failed")
+
+    def latency_summary(self) -> dict[str, LatencySummary]:
+        self.flush()
+        with self._lock:
+            return {event_type: histogram.summary() for event_type, histogram in self._histograms.items()}
+
+    def error_counts(self) -> dict[str, int]:
+        self.flush()
+        with self._lock:
+            return dict(self._errors)
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop_event.set()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=2.0)
+        self.flush()
+
+    def _start_drainer(self) -> None:
+        with self._lock:
+            if self._thread is not None or self._stop_event.is_set():
+                return  # started by another publisher, or closed: records wait for flush()
+            self._thread = threading.Thread(target=self._drain_loop, name="event-telemetry", daemon=True)
+            self._thread.start()
+
+    def _drain_loop(self) -> None:
+        while not self._stop_event.wait(self._flush_interval):
+            self.flush()
+
+
+_shared_telemetry: EventTelemetry | None = None
+_shared_telemetry_lock = threading.Lock()
+
+
+def shared_telemetry() -> EventTelemetry:
+    """The process-wide `EventTelemetry` used by middlewares that are not given one."""
+    global _shared_telemetry
+    with _shared_telemetry_lock:
+        if _shared_telemetry is None:
+            _shared_telemetry = EventTelemetry()
+        return _shared_telemetry
+
+
+class TelemetryMiddleware(BusMiddleware):
+    """
+    Non-blocking replacement for LoggingMiddleware + TimingMiddleware.
+
+    Sampled events are timed and pushed into `EventTelemetry` as structured
+    records; formatting and I/O happen on the telemetry thread. Without a
+    `telemetry`, records go to `shared_telemetry()`, so any number of buses
+    share one drain thread. A telemetry may serve several buses, so
+    `close()` only flushes it; whoever created it closes it.
+    """
+
+    def __init__(self, telemetry: EventTelemetry | None = None, sampler: Sampler = sample_all) -> None:
+        self._telemetry = telemetry if telemetry is not None else shared_telemetry()
+        self._sampler = sampler
+
+    @property
+    def telemetry(self) -> EventTelemetry:
+        return self._telemetry
+
+    def __call__(self, event: DomainEvent, next_call: NextCallable) -> None:
+        if not self._sampler(event.event_type):
+            next_call(event)
+            return
+
+        error: str | None = None
+        start = perf_counter_ns()
+        try:
+            next_call(event)
+        except Exception as exc:
+            error = repr(exc)
+            raise
+        finally:
+            self._telemetry.record(
+                EventRecord(
+                    event_type=event.event_type,
+                    event_id=event.event_id,
+                    source=event.source,
+                    occurred_at=event.occurred_at,
+                    elapsed_ns=perf_counter_ns() - start,
+                    error=error,
+                )
+            )
+
+    def handle_batch(self, events: Sequence[DomainEvent], next_call: NextBatchCallable) -> None:
+        first = events[0]
+        if not self._sampler(first.event_type):
+            next_call(events)
+            return
+
+        error: str | None = None
+        start = perf_counter_ns()
+        try:
+            next_call(events)
+        except Exception as exc:
+            error = repr(exc)
+            raise
+        finally:
+            self._telemetry.record(
+                EventRecord(
+                    event_type=first.event_type,
+                    event_id=first.event_id,
+                    source=first.source,
+                    occurred_at=first.occurred_at,
+                    elapsed_ns=perf_counter_ns() - start,
+                    batch_size=len(events),
+                    error=error,
+                )
+            )
+
+    def close(self) -> None:
+        self._telemetry.flush()
@@ -1,7 +1,17 @@
-from .jsonl_store import JsonlEventLog
-from .replay import EventReplayer
+from .binary_store import BinaryEventLog, convert_jsonl_to_binary
+from .jsonl_store import Durability, JsonlEventLog
+from .replay import EventReplayer, ReplayError, default_partition_key
+from .segmented import RetentionPolicy, SegmentInfo, SegmentedEventLog
 
 __all__ = [
+    "BinaryEventLog",
+    "convert_jsonl_to_binary",
+    "Durability",
     "JsonlEventLog",
     "EventReplayer",
+    "ReplayError",
+    "default_partition_key",
+    "RetentionPolicy",
+    "SegmentInfo",
+    "SegmentedEventLog",
 ]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+
+import pyarrow as pa
+
+from quantlab.core.event_log import LoggedEvent
+from quantlab.infra.event_log.jsonl_store import encode_json
+
+EVENT_SCHEMA = pa.schema(
+    [
+        ("sequence", pa.int64()),
+        ("event_id", pa.string()),
+        ("event_type", pa.string()),
+        ("payload", pa.string()),
+        ("occurred_at", pa.timestamp("us", tz="UTC")),
+        ("source", pa.string()),
+        ("correlation_id", pa.string()),
+        ("causation_id", pa.string()),
+        ("metadata", pa.string()),
+    ]
+)
+
+
+def events_to_table(events: Iterable[LoggedEvent]) -> pa.Table:
+    """Columnar form of `LoggedEvent`s; payload and metadata are kept as JSON text."""
+    columns: dict[str, list] = {name: [] for name in EVENT_SCHEMA.names}
+    for event in events:
+        columns["sequence"].append(event.sequence)
+        columns["event_id"].append(event.event_id)
+        columns["event_type"].append(event.event_type)
+        columns["payload"].append(encode_json(event.payload))
+        columns["occurred_at"].append(event.occurred_at)
+        columns["source"].append(event.source)
+        columns["correlation_id"].append(event.correlation_id)
+        columns["causation_id"].append(event.causation_id)
+        columns["metadata"].append(encode_json(event.metadata))
+    return pa.table(columns, schema=EVENT_SCHEMA)
+
+
+def table_to_events(table: pa.Table) -> Iterator[LoggedEvent]:
+    for batch in table.to_batches():
+        for row in batch.to_pylist():
+            yield LoggedEvent(
+                sequence=row["sequence"],
+                event_id=row["event_id"],
+                event_type=row["event_type"],
+                payload=json.loads(row["payload"]),
+                occurred_at=row["occurred_at"],
+                source=row["source"],
+                correlation_id=row["correlation_id"],
+                causation_id=row["causation_id"],
+                metadata=json.loads(row["metadata"]),
+            )
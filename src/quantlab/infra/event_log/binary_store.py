@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Collection, Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from json.encoder import encode_basestring
+from pathlib import Path
+from typing import Any
+
+from quantlab.core.event_log import EventFilter, EventLog, LoggedEvent
+from quantlab.infra.event_log.jsonl_store import (
+    Durability,
+    JsonlEventLog,
+    _json_default,
+    decode_json,
+    encode_json,
+)
+
+MAGIC = b"QLEVLOG"
+FORMAT_VERSION = 1
+
+# file header: magic, version, payload codec id
+_FILE_HEADER = struct.Struct("<7sBB")
+# record prefix: length of everything after the prefix, record kind
+_RECORD = struct.Struct("<IB")
+# event record header: sequence, occurred_at (ns since epoch), interned event_type id
+_EVENT = struct.Struct("<qqI")
+# event type definition: id, followed by the utf-8 name
+_TYPE_DEF = struct.Struct("<I")
+
+_KIND_EVENT = 0
+_KIND_TYPE_DEF = 1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _to_ns(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+def _from_ns(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value // 1_000)
+
+
+class _JsonCodec:
+    codec_id = 0
+
+    def encode(self, value: Any) -> bytes:
+        return encode_json(value).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return decode_json(data)
+
+    def needle(self, value: str) -> bytes:
+        """Bytes that must occur in an encoded body containing the string `value`."""
+        return encode_basestring(value).encode("utf-8")
+
+
+class _MsgpackCodec:
+    codec_id = 1
+
+    def __init__(self) -> None:
+        try:
+            import msgpack
+        except ImportError as exc:
+            raise ImportError("codec='msgpack' requires the optional 'msgpack' package") from exc
+        self._msgpack = msgpack
+
+    def encode(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, default=_json_default, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, raw=False)
+
+    def needle(self, value: str) -> bytes:
+        return value.encode("utf-8")
+
+
+def _codec(name: str | int) -> _JsonCodec | _MsgpackCodec:
+    if name in ("json", _JsonCodec.codec_id):
+        return _JsonCodec()
+    if name in ("msgpack", _MsgpackCodec.codec_id):
+        return _MsgpackCodec()
+    raise ValueError(f"Unknown payload codec: {name!r}")
+
+
+class BinaryEventLog(EventLog):
+    """
+    Length-prefixed binary event log read through a memory map.
+
+    Every event record carries a fixed header (sequence, timestamp as int64
+    ns, interned event_type id) ahead of the encoded body, so readers filter
+    on type or sequence without decoding payloads. Type names are written
+    once as definition records. Writes use the same group commit and
+    durability modes as `JsonlEventLog`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        codec: str = "json",
+        durability: Durability | str = Durability.BATCH,
+        max_batch_events: int = 4096,
+        max_batch_bytes: int = 1 << 20,
+        flush_interval: float | None = 0.2,
+    ) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._durability = Durability(durability)
+        self._max_batch_events = max_batch_events
+        self._max_batch_bytes = max_batch_bytes
+        self._flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._type_ids: dict[str, int] = {}
+        self._type_names: list[str] = []
+        self._last_sequence = 0
+        self._codec = self._open_or_create(codec)
+        self._pending: list[bytes] = []
+        self._pending_count = 0
+        self._pending_bytes = 0
+        self._file = self._path.open("ab")
+        self._closed = False
+
+        self._stop_event = threading.Event()
+        self._flusher: threading.Thread | None = None
+        if flush_interval is not None and self._durability is not Durability.EVENT:
+            self._flusher = threading.Thread(target=self._flush_loop, name="binary-event-log-flusher", daemon=True)
+            self._flusher.start()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def last_sequence(self) -> int:
+        return self._last_sequence
+
+    def append(self, event: LoggedEvent) -> None:
+        with self._lock:
+            self._ensure_open()
+            self._pending.append(self._encode(event))
+            self._pending_count += 1
+            self._last_sequence = max(self._last_sequence, event.sequence)
+            self._maybe_write()
+
+    def append_many(self, events: Iterable[LoggedEvent]) -> None:
+        with self._lock:
+            self._ensure_open()
+            for event in events:
+                self._pending.append(self._encode(event))
+                self._pending_count += 1
+                self._last_sequence = max(self._last_sequence, event.sequence)
+            self._maybe_write()
+
+    def read_all(self) -> Iterable[LoggedEvent]:
+        return self.read(None)
+
+    def read(self, event_filter: EventFilter | None = None) -> Iterator[LoggedEvent]:
+        """
+        Events matching `event_filter`.
+
+        Sequence, type and time bounds are checked on the fixed record header
+        and correlation ids on the raw body, so skipped events are never decoded.
+        """
+        self.flush()
+        with self._path.open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= _FILE_HEADER.size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                yield from self._scan(view, size, event_filter or EventFilter())
+
+    def read_from(
+        self,
+        sequence: int | None,
+        event_types: Collection[str] | None = None,
+    ) -> Iterator[LoggedEvent]:
+        """Events at or after `sequence`; bodies of other event types are never decoded."""
+        return self.read(EventFilter.build(min_sequence=sequence, event_types=event_types))
+
+    def next_sequence(self) -> int:
+        return self._last_sequence + 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._write_pending()
+
+    def close(self) -> None:
+        self._stop_event.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=2.0)
+            self._flusher = None
+        with self._lock:
+            if self._closed:
+                return
+            self._write_pending()
+            self._file.close()
+            self._closed = True
+
+    def __enter__(self) -> "BinaryEventLog":
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    def _scan(self, view: mmap.mmap, size: int, event_filter: EventFilter) -> Iterator[LoggedEvent]:
+        names: list[str] = []
+        wanted: set[int] = set()
+        codec = self._codec
+        event_types = event_filter.event_types
+        min_sequence = event_filter.min_sequence
+        max_sequence = event_filter.max_sequence
+        start_ns = None if event_filter.start is None else _to_ns(event_filter.start)
+        end_ns = None if event_filter.end is None else _to_ns(event_filter.end)
+        correlation_ids = event_filter.correlation_ids
+        needles = None if correlation_ids is None else tuple(map(codec.needle, correlation_ids))
+        unpack_record = _RECORD.unpack_from
+        unpack_event = _EVENT.unpack_from
+        offset = _FILE_HEADER.size
+        while offset + _RECORD.size <= size:
+            length, kind = unpack_record(view, offset)
+            body_start = offset + _RECORD.size
+            end = offset + 4 + length
+            if end > size:
+                break
+            if kind == _KIND_TYPE_DEF:
+                (type_id,) = _TYPE_DEF.unpack_from(view, body_start)
+                name = view[body_start + _TYPE_DEF.size : end].decode("utf-8")
+                names.append(name)
+                if event_types is None or name in event_types:
+                    wanted.add(type_id)
+            elif kind == _KIND_EVENT:
+                event_sequence, occurred_ns, type_id = unpack_event(view, body_start)
+                if max_sequence is not None and event_sequence > max_sequence:
+                    return
+                if (
+                    type_id in wanted
+                    and (min_sequence is None or event_sequence >= min_sequence)
+                    and (start_ns is None or occurred_ns >= start_ns)
+                    and (end_ns is None or occurred_ns < end_ns)
+                ):
+                    body = view[body_start + _EVENT.size : end]
+                    if needles is not None and not any(needle in body for needle in needles):
+                        offset = end
+                        continue
+                    event_id, source, correlation_id, causation_id, payload, metadata = codec.decode(body)
+                    if correlation_ids is not None and correlation_id not in correlation_ids:
+                        offset = end
+                        continue
+                    yield LoggedEvent(
+                        sequence=event_sequence,
+                        event_id=event_id,
+                        event_type=names[type_id],
+                        payload=payload,
+                        occurred_at=_from_ns(occurred_ns),
+                        source=source,
+                        correlation_id=correlation_id,
+                        causation_id=causation_id,
+                        metadata=metadata,
+                    )
+            offset = end
+
+    def _encode(self, event: LoggedEvent) -> bytes:
+        body = self._codec.encode(
+            [
+                event.event_id,
+                event.source,
+                event.correlation_id,
+                event.causation_id,
+                event.payload,
+                event.metadata,
+            ]
+        )
+
+        parts: list[bytes] = []
+        type_id = self._type_ids.get(event.event_type)
+        if type_id is None:
+            type_id = len(self._type_names)
+            self._type_ids[event.event_type] = type_id
+            self._type_names.append(event.event_type)
+            name = event.event_type.encode("utf-8")
+            parts.append(_RECORD.pack(1 + _TYPE_DEF.size + len(name), _KIND_TYPE_DEF))
+            parts.append(_TYPE_DEF.pack(type_id))
+            parts.append(name)
+
+        parts.append(_RECORD.pack(1 + _EVENT.size + len(body), _KIND_EVENT))
+        parts.append(_EVENT.pack(event.sequence, _to_ns(event.occurred_at), type_id))
+        parts.append(body)
+        record = b"".join(parts)
+        self._pending_bytes += len(record)
+        return record
+
+    def _open_or_create(self, codec: str) -> _JsonCodec | _MsgpackCodec:
+        if not self._path.exists() or self._path.stat().st_size == 0:
+            selected = _codec(codec)
+            with self._path.open("wb") as f:
+                f.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION, selected.codec_id))
+            return selected
+
+        with self._path.open("rb+") as f:
+            magic, version, codec_id = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"Not a QuantLab binary event log: {self._path}")
+            size = f.seek(0, os.SEEK_END)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                complete = self._recover(view, size)
+            if complete != size:
+                f.truncate(complete)
+        return _codec(codec_id)
+
+    def _recover(self, view: mmap.mmap, size: int) -> int:
+        """Rebuild the type table and high-water mark from headers; returns the intact length."""
+        offset = _FILE_HEADER.size
+        while offset + _RECORD.size <= size:
+            length, kind = _RECORD.unpack_from(view, offset)
+            end = offset + 4 + length
+            if end > size:
+                break
+            body_start = offset + _RECORD.size
+            if kind == _KIND_TYPE_DEF:
+                (type_id,) = _TYPE_DEF.unpack_from(view, body_start)
+                name = view[body_start + _TYPE_DEF.size : end].decode("utf-8")
+                self._type_ids[name] = type_id
+                self._type_names.append(name)
+            elif kind == _KIND_EVENT:
+                (sequence,) = struct.unpack_from("<q", view, body_start)
+                self._last_sequence = max(self._last_sequence, sequence)
+            offset = end
+        return offset
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise ValueError(f"Event log is closed: {self._path}")
+
+    def _maybe_write(self) -> None:
+        if (
+            self._durability is Durability.EVENT
+            or self._pending_count >= self._max_batch_events
+            or self._pending_bytes >= self._max_batch_bytes
+        ):
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        self._file.write(b"".join(self._pending))
+        self._pending.clear()
+        self._pending_count = 0
+        self._pending_bytes = 0
+        self._file.flush()
+        if self._durability is not Durability.NONE:
+            os.fsync(self._file.fileno())
+
+    def _flush_loop(self) -> None:
+        assert self._flush_interval is not None
+        while not self._stop_event.wait(self._flush_interval):
+            self.flush()
+
+
+def convert_jsonl_to_binary(
+    source: str | Path,
+    target: str | Path,
+    *,
+    codec: str = "json",
+    batch_size: int = 10_000,
+) -> int:
+    """Copy every event of a `.jsonl` log into a new binary log; returns the event count."""
+    if Path(target).exists() and Path(target).stat().st_size > 0:
+        raise FileExistsError(f"Refusing to append converted events to existing log: {target}")
+
+    jsonl = JsonlEventLog(source, flush_interval=None, read_only=True)
+    count = 0
+    try:
+        with BinaryEventLog(target, codec=codec, flush_interval=None) as binary:
+            batch: list[LoggedEvent] = []
+            for event in jsonl.read_all():
+                batch.append(event)
+                if len(batch) >= batch_size:
+                    binary.append_many(batch)
+                    count += len(batch)
+                    batch.clear()
+            binary.append_many(batch)
+            count += len(batch)
+    finally:
+        jsonl.close()
+    return count
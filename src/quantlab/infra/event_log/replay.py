@@ -1,16 +1,220 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import multiprocessing
+import queue
+import traceback
+import zlib
+from collections.abc import Callable, Collection
+from typing import Any
 
-from quantlab.core.event_log import EventLog, LoggedEvent
+from quantlab.core.event_log import EventFilter, EventLog, LoggedEvent
 
 ReplayHandler = Callable[[LoggedEvent], None]
+HandlerFactory = Callable[[int], ReplayHandler]
+PartitionKey = Callable[[LoggedEvent], Any]
+
+# How long the parent waits on a worker's queue before checking the worker is still alive.
+_LIVENESS_INTERVAL = 0.5
+
+
+def default_partition_key(event: LoggedEvent) -> Any:
+    """Partition by symbol when the payload has one, otherwise by event type."""
+    symbol = event.payload.get("symbol") if isinstance(event.payload, dict) else None
+    return symbol if symbol is not None else event.event_type
+
+
+def partition_of(key: Any, partitions: int) -> int:
+    # crc32 rather than hash(): str hashes are salted per process.
+    return zlib.crc32(str(key).encode("utf-8")) % partitions
+
+
+def _handler_result(handler: ReplayHandler) -> Any:
+    result = getattr(handler, "result", None)
+    return result() if callable(result) else None
+
+
+def _partition_worker(
+    handler_factory: HandlerFactory,
+    partition_ids: list[int],
+    inbox: Any,
+    outbox: Any,
+) -> None:
+    failure: str | None = None
+    handlers: dict[int, ReplayHandler] = {}
+    try:
+        handlers = {partition: handler_factory(partition) for partition in partition_ids}
+    except BaseException:
+        failure = traceback.format_exc()
+    while True:
+        item = inbox.get()
+        if item is None:
+            break
+        if failure is not None:
+            # keep draining so the parent never blocks on a full inbox
+            continue
+        partition, events = item
+        handler = handlers[partition]
+        try:
+            for event in events:
+                handler(event)
+        except BaseException:
+            failure = traceback.format_exc()
+    if failure is not None:
+        outbox.put(("error", failure))
+        return
+    try:
+        outbox.put(("ok", {partition: _handler_result(handler) for partition, handler in handlers.items()}))
+    except BaseException:
+        outbox.put(("error", traceback.format_exc()))
+
+
+class ReplayError(RuntimeError):
+    pass
+
+
+def _died(process: Any) -> ReplayError:
+    return ReplayError(f"Partitioned replay worker {process.name} exited with code {process.exitcode}")
+
+
+def _send(inbox: Any, item: Any, process: Any) -> None:
+    """`inbox.put` that gives up with `ReplayError` once the worker reading it is gone."""
+    while True:
+        try:
+            inbox.put(item, timeout=_LIVENESS_INTERVAL)
+            return
+        except queue.Full:
+            if not process.is_alive():
+                raise _died(process) from None
+
+
+def _receive(outbox: Any, processes: list[Any]) -> tuple[str, Any]:
+    """`outbox.get` that raises `ReplayError` once a worker died or all exited without reporting."""
+    while True:
+        try:
+            return outbox.get(timeout=_LIVENESS_INTERVAL)
+        except queue.Empty:
+            pass
+        for process in processes:
+            if process.exitcode not in (None, 0):
+                raise _died(process)
+        if all(process.exitcode is not None for process in processes):
+            # a worker's result is flushed before it exits, so this is the last chance
+            try:
+                return outbox.get(timeout=_LIVENESS_INTERVAL)
+            except queue.Empty:
+                raise ReplayError("Partitioned replay workers exited without reporting a result") from None
 
 
 class EventReplayer:
     def __init__(self, event_log: EventLog) -> None:
         self._event_log = event_log
 
-    def replay(self, handler: ReplayHandler) -> None:
-        for event in self._event_log.read_all():
+    def replay(
+        self,
+        handler: ReplayHandler,
+        from_sequence: int | None = None,
+        event_types: Collection[str] | None = None,
+        *,
+        event_filter: EventFilter | None = None,
+    ) -> None:
+        for event in self._event_log.read(self._filter(from_sequence, event_types, event_filter)):
             handler(event)
+
+    def replay_partitioned(
+        self,
+        handler_factory: HandlerFactory,
+        *,
+        key: PartitionKey = default_partition_key,
+        partitions: int = 4,
+        workers: int = 1,
+        event_filter: EventFilter | None = None,
+        chunk_size: int = 512,
+        max_inflight_chunks: int = 8,
+        mp_context: str | None = None,
+    ) -> dict[int, Any]:
+        """
+        Replay with events split into `partitions` by `key`, one handler per partition.
+
+        Events sharing a key always land in the same partition and are handled
+        in log order. With `workers > 1` partitions are spread over that many
+        worker processes, so `handler_factory`, the handlers' `result()` values
+        and the events must be picklable. Returns `{partition: handler.result()}`
+        for handlers that define `result()`, else `None` per partition.
+
+        A worker that dies without reporting (killed, out of memory,
+        `os._exit`) makes this raise `ReplayError` within a second instead of
+        blocking, and the remaining workers are terminated.
+        """
+        if partitions < 1:
+            raise ValueError("partitions must be >= 1")
+        events = self._event_log.read(event_filter)
+        if workers <= 1:
+            handlers = {partition: handler_factory(partition) for partition in range(partitions)}
+            for event in events:
+                handlers[partition_of(key(event), partitions)](event)
+            return {partition: _handler_result(handler) for partition, handler in handlers.items()}
+
+        workers = min(workers, partitions)
+        context = multiprocessing.get_context(mp_context)
+        outbox = context.Queue()
+        inboxes = [context.Queue(maxsize=max_inflight_chunks) for _ in range(workers)]
+        processes = [
+            context.Process(
+                target=_partition_worker,
+                args=(handler_factory, list(range(index, partitions, workers)), inboxes[index], outbox),
+                name=f"event-replay-{index}",
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        results: dict[int, Any] = {}
+        errors: list[str] = []
+        try:
+            buffers: list[list[LoggedEvent]] = [[] for _ in range(partitions)]
+            for event in events:
+                partition = partition_of(key(event), partitions)
+                buffer = buffers[partition]
+                buffer.append(event)
+                if len(buffer) >= chunk_size:
+                    _send(inboxes[partition % workers], (partition, buffer), processes[partition % workers])
+                    buffers[partition] = []
+            for partition, buffer in enumerate(buffers):
+                if buffer:
+                    _send(inboxes[partition % workers], (partition, buffer), processes[partition % workers])
+            for inbox, process in zip(inboxes, processes):
+                _send(inbox, None, process)
+            for _ in processes:
+                status, value = _receive(outbox, processes)
+                if status == "ok":
+                    results.update(value)
+                else:
+                    errors.append(value)
+        except BaseException:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for inbox in inboxes:
+                inbox.cancel_join_thread()  # chunks nobody will read must not hold up exit
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        if errors:
+            raise ReplayError("Partitioned replay failed in a worker:\n" + errors[0])
+        return dict(sorted(results.items()))
+
+    @staticmethod
+    def _filter(
+        from_sequence: int | None,
+        event_types: Collection[str] | None,
+        event_filter: EventFilter | None,
+    ) -> EventFilter:
+        if event_filter is None:
+            return EventFilter.build(min_sequence=from_sequence, event_types=event_types)
+        if from_sequence is not None or event_types is not None:
+            raise ValueError("Pass either event_filter or from_sequence/event_types, not both")
+        return event_filter
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+from quantlab.core.event_log import EventFilter, EventLog, LoggedEvent
+from quantlab.infra.event_log.jsonl_store import Durability, JsonlEventLog
+from quantlab.infra.storage.parquet_store import ParquetStore
+
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass(frozen=True, slots=True)
+class SegmentInfo:
+    path: str
+    format: str
+    first_sequence: int
+    last_sequence: int
+    created_at: float
+    closed_at: float | None = None
+    size_bytes: int = 0
+
+    @property
+    def is_active(self) -> bool:
+        return self.closed_at is None
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    max_age_seconds: float | None = None
+    max_segments: int | None = None
+    max_total_bytes: int | None = None
+
+
+def _parquet_filters(event_filter: EventFilter) -> list[tuple] | None:
+    filters: list[tuple] = []
+    if event_filter.min_sequence is not None:
+        filters.append(("sequence", ">=", event_filter.min_sequence))
+    if event_filter.max_sequence is not None:
+        filters.append(("sequence", "<=", event_filter.max_sequence))
+    if event_filter.event_types is not None:
+        filters.append(("event_type", "in", sorted(event_filter.event_types)))
+    if event_filter.start is not None:
+        filters.append(("occurred_at", ">=", event_filter.start))
+    if event_filter.end is not None:
+        filters.append(("occurred_at", "<", event_filter.end))
+    if event_filter.correlation_ids is not None:
+        filters.append(("correlation_id", "in", sorted(event_filter.correlation_ids)))
+    return filters or None
+
+
+class SegmentedEventLog(EventLog):
+    """
+    Event log split into rolling JSONL segments under one directory.
+
+    A new segment starts when the active one exceeds `max_segment_bytes` or
+    `max_segment_age_seconds`. `manifest.json` records each segment's
+    sequence range so reads skip whole files; closed segments can be dropped
+    by a `RetentionPolicy` or compacted into Parquet. The manifest is only
+    rewritten when segments roll, compact or expire, never per append.
+    Segments other than the one being appended to are opened read-only, so
+    reads never recover, truncate or hold append handles on them. Once
+    closed, the log still serves reads but rejects appends.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_segment_bytes: int = 256 * 1024 * 1024,
+        max_segment_age_seconds: float | None = 24 * 3600.0,
+        retention: RetentionPolicy | None = None,
+        durability: Durability | str = Durability.BATCH,
+        flush_interval: float | None = 0.2,
+    ) -> None:
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._max_segment_bytes = max_segment_bytes
+        self._max_segment_age_seconds = max_segment_age_seconds
+        self._retention = retention or RetentionPolicy()
+        self._durability = Durability(durability)
+        self._flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._segments: list[SegmentInfo] = self._load_manifest()
+        self._active: JsonlEventLog | None = None
+        self._closed = False
+        if self._segments and self._segments[-1].is_active:
+            self._active = self._open_segment(self._segments[-1].path)
+        self._last_sequence = max(
+            (self._active.last_sequence if self._active else 0),
+            max((segment.last_sequence for segment in self._segments), default=0),
+        )
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def segments(self) -> list[SegmentInfo]:
+        with self._lock:
+            return [self._refresh_active(segment) for segment in self._segments]
+
+    def append(self, event: LoggedEvent) -> None:
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Event log is closed: {self._root}")
+            self._writer_for(event.sequence).append(event)
+            self._last_sequence = max(self._last_sequence, event.sequence)
+
+    def append_many(self, events: Iterable[LoggedEvent]) -> None:
+        with self._lock:
+            for event in events:
+                self.append(event)
+
+    def read_all(self) -> Iterable[LoggedEvent]:
+        return self.read(None)
+
+    def read(self, event_filter: EventFilter | None = None) -> Iterator[LoggedEvent]:
+        """Events matching `event_filter`; segments outside its sequence range are never opened."""
+        self.flush()
+        with self._lock:
+            segments = list(self._segments)
+        event_filter = event_filter or EventFilter()
+        for segment in segments:
+            if event_filter.max_sequence is not None and segment.first_sequence > event_filter.max_sequence:
+                return
+            if (
+                event_filter.min_sequence is not None
+                and not segment.is_active
+                and segment.last_sequence < event_filter.min_sequence
+            ):
+                continue
+            yield from self._read_segment(segment, event_filter)
+
+    def read_from(
+        self,
+        sequence: int | None,
+        event_types: Collection[str] | None = None,
+    ) -> Iterator[LoggedEvent]:
+        return self.read(EventFilter.build(min_sequence=sequence, event_types=event_types))
+
+    def next_sequence(self) -> int:
+        return self._last_sequence + 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._active is not None:
+                self._active.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            if self._active is not None:
+                self._active.close()
+                self._active = None
+                self._segments[-1] = self._refresh_active(self._segments[-1])
+                self._write_manifest()
+
+    def roll(self) -> None:
+        """Close the active segment; the next append starts a new one."""
+        with self._lock:
+            if self._active is None:
+                return
+            self._active.close()
+            segment = self._refresh_active(self._segments[-1])
+            self._segments[-1] = replace(segment, closed_at=time.time())
+            self._active = None
+            self._write_manifest()
+            self.apply_retention()
+
+    def apply_retention(self) -> list[SegmentInfo]:
+        """Delete the oldest closed segments until `retention` is satisfied."""
+        policy = self._retention
+        removed: list[SegmentInfo] = []
+        with self._lock:
+            now = time.time()
+            while True:
+                closed = [segment for segment in self._segments if not segment.is_active]
+                if not closed:
+                    break
+                oldest = closed[0]
+                total_bytes = sum(segment.size_bytes for segment in self.segments())
+                expired = (
+                    (policy.max_age_seconds is not None and now - oldest.closed_at > policy.max_age_seconds)
+                    or (policy.max_segments is not None and len(self._segments) > policy.max_segments)
+                    or (policy.max_total_bytes is not None and total_bytes > policy.max_total_bytes)
+                )
+                if not expired:
+                    break
+                self._segments.remove(oldest)
+                self._delete_files(oldest)
+                removed.append(oldest)
+            if removed:
+                self._write_manifest()
+        return removed
+
+    def compact(self, store: ParquetStore | None = None, keep_recent: int = 1) -> list[SegmentInfo]:
+        """Rewrite closed JSONL segments as Parquet, leaving the newest `keep_recent` closed ones as JSONL."""
+        from quantlab.infra.event_log.arrow_codec import events_to_table
+
+        store = store or ParquetStore(self._root)
+        compacted: list[SegmentInfo] = []
+        with self._lock:
+            closed = [
+                (position, segment)
+                for position, segment in enumerate(self._segments)
+                if not segment.is_active and segment.format == "jsonl"
+            ]
+            candidates = closed[: max(0, len(closed) - keep_recent)]
+            for position, segment in candidates:
+                table = events_to_table(self._read_segment(segment, EventFilter()))
+                parquet_path = store.write_table(Path(segment.path).with_suffix(".parquet").name, table)
+                updated = replace(
+                    segment,
+                    path=self._relative(parquet_path),
+                    format="parquet",
+                    size_bytes=parquet_path.stat().st_size,
+                )
+                self._segments[position] = updated
+                self._write_manifest()
+                self._delete_files(segment)
+                compacted.append(updated)
+        return compacted
+
+    def __enter__(self) -> "SegmentedEventLog":
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    def _writer_for(self, sequence: int) -> JsonlEventLog:
+        if self._active is not None and self._should_roll():
+            self.roll()
+        if self._active is None:
+            name = f"segment-{sequence:020d}.jsonl"
+            self._active = self._open_segment(name)
+            self._segments.append(
+                SegmentInfo(
+                    path=name,
+                    format="jsonl",
+                    first_sequence=sequence,
+                    last_sequence=sequence,
+                    created_at=time.time(),
+                )
+            )
+            self._write_manifest()
+            self.apply_retention()
+        return self._active
+
+    def _should_roll(self) -> bool:
+        assert self._active is not None
+        if self._active.size_bytes >= self._max_segment_bytes:
+            return True
+        age = time.time() - self._segments[-1].created_at
+        return self._max_segment_age_seconds is not None and age >= self._max_segment_age_seconds
+
+    def _refresh_active(self, segment: SegmentInfo) -> SegmentInfo:
+        if not segment.is_active:
+            return segment
+        if self._active is not None:
+            return replace(
+                segment,
+                last_sequence=max(segment.last_sequence, self._active.last_sequence),
+                size_bytes=self._active.size_bytes,
+            )
+        path = self._root / segment.path
+        return replace(segment, size_bytes=path.stat().st_size if path.exists() else 0)
+
+    def _open_segment(self, name: str) -> JsonlEventLog:
+        return JsonlEventLog(
+            self._root / name,
+            durability=self._durability,
+            flush_interval=self._flush_interval,
+        )
+
+    def _read_segment(self, segment: SegmentInfo, event_filter: EventFilter) -> Iterator[LoggedEvent]:
+        path = self._root / segment.path
+        if segment.format == "parquet":
+            from quantlab.infra.event_log.arrow_codec import table_to_events
+            import pyarrow.parquet as pq
+
+            yield from table_to_events(pq.read_table(path, filters=_parquet_filters(event_filter)))
+            return
+
+        if segment.is_active and self._active is not None:
+            yield from self._active.read(event_filter)
+            return
+        log = JsonlEventLog(path, flush_interval=None, read_only=True)
+        try:
+            yield from log.read(event_filter)
+        finally:
+            log.close()
+
+    def _delete_files(self, segment: SegmentInfo) -> None:
+        path = self._root / segment.path
+        path.unlink(missing_ok=True)
+        path.with_name(path.name + ".idx").unlink(missing_ok=True)
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self._root))
+        except ValueError:
+            return str(path)
+
+    def _load_manifest(self) -> list[SegmentInfo]:
+        path = self._root / MANIFEST_NAME
+        if not path.exists():
+            return []
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return [SegmentInfo(**entry) for entry in data["segments"]]
+
+    def _write_manifest(self) -> None:
+        segments = [asdict(self._refresh_active(segment)) for segment in self._segments]
+        path = self._root / MANIFEST_NAME
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"version": 1, "segments": segments}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(path)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import bisect
+from collections.abc import Sequence
+from pathlib import Path
+
+
+class SparseSequenceIndex:
+    """
+    Sidecar index of `sequence -> byte offset`, one entry every `interval` events.
+
+    Stored as text lines `"<sequence> <offset>"` appended next to the log.
+    Entries pointing past the end of the data file (e.g. after a crash that
+    truncated the log) are discarded on load.
+    """
+
+    def __init__(self, path: str | Path, interval: int = 1024) -> None:
+        if interval <= 0:
+            raise ValueError("index interval must be positive")
+        self._path = Path(path)
+        self._interval = interval
+        self._sequences: list[int] = []
+        self._offsets: list[int] = []
+        self._since_last = 0
+        self._unwritten: list[str] = []
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._sequences)
+
+    def load(self, data_size: int, *, repair: bool = True) -> None:
+        """Read the sidecar, keeping entries before `data_size`; `repair` rewrites it without the rest."""
+        self._sequences.clear()
+        self._offsets.clear()
+        if not self._path.exists():
+            return
+
+        valid = True
+        with self._path.open("r", encoding="ascii") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 2:
+                    valid = False
+                    break
+                sequence, offset = int(parts[0]), int(parts[1])
+                if offset >= data_size or (self._sequences and sequence <= self._sequences[-1]):
+                    valid = False
+                    break
+                self._sequences.append(sequence)
+                self._offsets.append(offset)
+
+        if not valid and repair:
+            self._rewrite()
+
+    def observe(self, sequences: Sequence[int], offsets: Sequence[int]) -> None:
+        """Record lines written at `offsets`; keeps one entry per `interval` lines."""
+        first = (self._interval - self._since_last) % self._interval
+        for position in range(first, len(sequences), self._interval):
+            sequence = sequences[position]
+            if self._sequences and sequence <= self._sequences[-1]:
+                continue
+            self._sequences.append(sequence)
+            self._offsets.append(offsets[position])
+            self._unwritten.append(f"{sequence} {offsets[position]}\n")
+        self._since_last = (self._since_last + len(sequences)) % self._interval
+
+    def persist(self) -> None:
+        if not self._unwritten:
+            return
+        with self._path.open("a", encoding="ascii") as f:
+            f.write("".join(self._unwritten))
+        self._unwritten.clear()
+
+    def reset(self) -> None:
+        self._sequences.clear()
+        self._offsets.clear()
+        self._unwritten.clear()
+        self._since_last = 0
+        self._path.unlink(missing_ok=True)
+
+    def floor_offset(self, sequence: int) -> int:
+        """Byte offset of the last indexed line with sequence <= `sequence` (0 if none)."""
+        position = bisect.bisect_right(self._sequences, sequence) - 1
+        return self._offsets[position] if position >= 0 else 0
+
+    def _rewrite(self) -> None:
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        with tmp.open("w", encoding="ascii") as f:
+            f.writelines(f"{sequence} {offset}\n" for sequence, offset in zip(self._sequences, self._offsets))
+        tmp.replace(self._path)
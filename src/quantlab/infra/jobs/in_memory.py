@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import copy
+from collections.abc import Collection, Iterable, Mapping
 from threading import RLock
 
 from quantlab.core.jobs import JobRecord, JobStatus
@@ -8,31 +8,96 @@ from quantlab.core.interfaces import JobRepository, JobRegistry, JobHandler
 
 
 class InMemoryJobRepository(JobRepository):
+    """
+    Dict-backed repository that stores and hands out snapshots.
+
+    `get` returns an independent `JobRecord` whose `payload`, `metadata` and
+    `result` are read-only containers shared with the stored copy instead of
+    deep-copies (see `JobRecord.snapshot`); callers replace them to change
+    them. Secondary indexes by status, job_type and active dedupe key are
+    maintained on every write.
+    """
+
     def __init__(self) -> None:
         self._jobs: dict[str, JobRecord] = {}
+        # every active holder of a key, since `add` does not enforce uniqueness
+        self._active_by_dedupe_key: dict[str, dict[str, None]] = {}
+        self._by_status: dict[JobStatus, dict[str, None]] = {status: {} for status in JobStatus}
+        self._by_job_type: dict[str, dict[str, None]] = {}
         self._lock = RLock()
 
     def add(self, job: JobRecord) -> None:
-        with self._lock:
-            self._jobs[job.job_id] = copy.deepcopy(job)
+        self.update(job)
 
     def get(self, job_id: str) -> JobRecord | None:
         with self._lock:
             job = self._jobs.get(job_id)
-            return copy.deepcopy(job) if job is not None else None
+            return job.snapshot() if job is not None else None
+
+    def get_many(self, job_ids: Iterable[str]) -> dict[str, JobRecord]:
+        with self._lock:
+            return {job_id: self._jobs[job_id].snapshot() for job_id in job_ids if job_id in self._jobs}
 
     def update(self, job: JobRecord) -> None:
+        stored = job.snapshot()
         with self._lock:
-            self._jobs[job.job_id] = copy.deepcopy(job)
+            previous = self._jobs.get(job.job_id)
+            if previous is not None:
+                self._unindex(previous)
+            self._jobs[job.job_id] = stored
+            self._index(stored)
 
     def find_active_by_dedupe_key(self, dedupe_key: str) -> JobRecord | None:
         with self._lock:
-            for job in self._jobs.values():
-                if job.dedupe_key != dedupe_key:
-                    continue
-                if job.status in {JobStatus.PENDING, JobStatus.QUEUED, JobStatus.RUNNING}:
-                    return copy.deepcopy(job)
-        return None
+            job_id = self._active_holder(dedupe_key)
+            return self._jobs[job_id].snapshot() if job_id is not None else None
+
+    def add_if_absent(self, dedupe_key: str, job: JobRecord) -> JobRecord | None:
+        with self._lock:
+            job_id = self._active_holder(dedupe_key)
+            if job_id is not None:
+                return self._jobs[job_id].snapshot()
+            self.update(job)
+            return None
+
+    def find(
+        self,
+        *,
+        status: JobStatus | Collection[JobStatus] | None = None,
+        job_type: str | None = None,
+    ) -> list[JobRecord]:
+        with self._lock:
+            candidates: Iterable[str]
+            if status is None:
+                candidates = self._jobs.keys() if job_type is None else self._by_job_type.get(job_type, {})
+            else:
+                statuses = [status] if isinstance(status, JobStatus) else list(status)
+                candidates = [job_id for value in statuses for job_id in self._by_status[JobStatus(value)]]
+            jobs = [self._jobs[job_id] for job_id in candidates]
+            if job_type is not None and status is not None:
+                jobs = [job for job in jobs if job.job_type == job_type]
+            return [job.snapshot() for job in sorted(jobs, key=lambda job: job.created_at)]
+
+    def _active_holder(self, dedupe_key: str) -> str | None:
+        holders = self._active_by_dedupe_key.get(dedupe_key)
+        if not holders:
+            return None
+        return min(holders, key=lambda job_id: self._jobs[job_id].created_at)
+
+    def _index(self, job: JobRecord) -> None:
+        self._by_status[job.status][job.job_id] = None
+        self._by_job_type.setdefault(job.job_type, {})[job.job_id] = None
+        if job.dedupe_key and job.is_active:
+            self._active_by_dedupe_key.setdefault(job.dedupe_key, {})[job.job_id] = None
+
+    def _unindex(self, job: JobRecord) -> None:
+        self._by_status[job.status].pop(job.job_id, None)
+        self._by_job_type.get(job.job_type, {}).pop(job.job_id, None)
+        holders = self._active_by_dedupe_key.get(job.dedupe_key) if job.dedupe_key else None
+        if holders is not None:
+            holders.pop(job.job_id, None)
+            if not holders:
+                del self._active_by_dedupe_key[job.dedupe_key]
 
 
 class InMemoryJobRegistry(JobRegistry):
@@ -47,3 +112,6 @@ class InMemoryJobRegistry(JobRegistry):
             return self._handlers[job_type]
         except KeyError as exc:
             raise KeyError(f"No handler registered for job_type={job_type!r}") from exc
+
+    def handlers(self) -> Mapping[str, JobHandler]:
+        return dict(self._handlers)
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Collection, Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from quantlab.core.interfaces import JobRepository
+from quantlab.core.jobs import JobExecutionMode, JobRecord, JobStatus
+from quantlab.infra.storage.shared_buffers import HANDLE_KEY, ArrowHandle
+
+# Inlined rather than bound so the planner can use the partial dedupe index.
+_ACTIVE_PREDICATE = "status IN ('pending', 'queued', 'running')"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    dedupe_key TEXT,
+    execution_mode TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    timeout REAL,
+    progress REAL NOT NULL,
+    message TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_active_dedupe ON jobs (dedupe_key, created_at)
+    WHERE dedupe_key IS NOT NULL AND {_ACTIVE_PREDICATE};
+CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS ix_jobs_job_type ON jobs (job_type, created_at);
+"""
+
+_COLUMNS = (
+    "job_id",
+    "job_type",
+    "status",
+    "dedupe_key",
+    "execution_mode",
+    "payload",
+    "metadata",
+    "priority",
+    "timeout",
+    "progress",
+    "message",
+    "result",
+    "error",
+    "created_at",
+    "updated_at",
+    "started_at",
+    "finished_at",
+)
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM jobs"
+_UPSERT = (
+    f"INSERT INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+    f"ON CONFLICT(job_id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _COLUMNS[1:])
+)
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, ArrowHandle):
+        return value.to_json()
+    # anything else would come back as a different type after a round-trip
+    raise TypeError(f"Cannot store {type(value).__name__} in a job payload or result; use JSON types or an ArrowHandle")
+
+
+def _decode(value: dict[str, Any]) -> Any:
+    return ArrowHandle.from_json(value) if HANDLE_KEY in value else value
+
+
+def _dump(value: Any) -> str | None:
+    return None if value is None else json.dumps(value, separators=(",", ":"), default=_encode)
+
+
+def _load(value: str) -> Any:
+    return json.loads(value, object_hook=_decode)
+
+
+def _time(value: datetime | None) -> str | None:
+    return None if value is None else value.isoformat()
+
+
+def _to_row(job: JobRecord) -> tuple[Any, ...]:
+    return (
+        job.job_id,
+        job.job_type,
+        job.status.value,
+        job.dedupe_key,
+        job.execution_mode.value,
+        _dump(job.payload),
+        _dump(job.metadata),
+        job.priority,
+        job.timeout,
+        job.progress,
+        job.message,
+        _dump(job.result),
+        job.error,
+        _time(job.created_at),
+        _time(job.updated_at),
+        _time(job.started_at),
+        _time(job.finished_at),
+    )
+
+
+def _from_row(row: tuple[Any, ...]) -> JobRecord:
+    (
+        job_id,
+        job_type,
+        status,
+        dedupe_key,
+        execution_mode,
+        payload,
+        metadata,
+        priority,
+        timeout,
+        progress,
+        message,
+        result,
+        error,
+        created_at,
+        updated_at,
+        started_at,
+        finished_at,
+    ) = row
+    return JobRecord(
+        job_id=job_id,
+        job_type=job_type,
+        payload=_load(payload),
+        status=JobStatus(status),
+        dedupe_key=dedupe_key,
+        execution_mode=JobExecutionMode(execution_mode),
+        metadata=json.loads(metadata),
+        priority=priority,
+        timeout=timeout,
+        progress=progress,
+        message=message,
+        result=_load(result) if result is not None else None,
+        error=error,
+        created_at=datetime.fromisoformat(created_at),
+        updated_at=datetime.fromisoformat(updated_at),
+        started_at=datetime.fromisoformat(started_at) if started_at else None,
+        finished_at=datetime.fromisoformat(finished_at) if finished_at else None,
+    )
+
+
+class SqliteJobRepository(JobRepository):
+    """
+    Durable job repository on SQLite in WAL mode.
+
+    Writes are buffered per job and committed in one `executemany`
+    transaction. A write that changes a job's status (and any `add`)
+    commits the whole buffer before returning, so submissions and state
+    transitions survive a crash; progress-only updates are coalesced and
+    committed every `flush_interval` or once `max_pending` jobs are dirty.
+    Reads consult the buffer first. Payloads and results are stored as JSON
+    (plus `ArrowHandle`s); other values raise `TypeError` from the write that
+    introduces them, not later from the background flush.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        flush_interval: float | None = 0.05,
+        max_pending: int = 1024,
+    ) -> None:
+        self._path = Path(path)
+        if str(path) != ":memory:":
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._migrate()
+        self._max_pending = max_pending
+        self._flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._pending: dict[str, JobRecord] = {}
+        self._stored_status: dict[str, JobStatus] = {}
+        # payload, metadata and result last checked to encode, per active job
+        self._encodable: dict[str, tuple[Any, Any, Any]] = {}
+        self._closed = False
+
+        self._stop_event = threading.Event()
+        self._flusher: threading.Thread | None = None
+        if flush_interval is not None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="sqlite-job-repo-flusher", daemon=True)
+            self._flusher.start()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def add(self, job: JobRecord) -> None:
+        with self._lock:
+            self._ensure_open()
+            self._pending[job.job_id] = self._checked_snapshot(job)
+            self._write_pending()
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._lock:
+            job = self._pending.get(job_id)
+            if job is not None:
+                return job.snapshot()
+            row = self._connection.execute(f"{_SELECT} WHERE job_id = ?", (job_id,)).fetchone()
+        return _from_row(row) if row is not None else None
+
+    def get_many(self, job_ids: Iterable[str]) -> dict[str, JobRecord]:
+        jobs: dict[str, JobRecord] = {}
+        with self._lock:
+            missing = []
+            for job_id in job_ids:
+                pending = self._pending.get(job_id)
+                if pending is not None:
+                    jobs[job_id] = pending.snapshot()
+                else:
+                    missing.append(job_id)
+            rows = (
+                self._connection.execute(
+                    f"{_SELECT} WHERE job_id IN ({', '.join('?' for _ in missing)})", missing
+                ).fetchall()
+                if missing
+                else []
+            )
+        for row in rows:
+            job = _from_row(row)
+            jobs[job.job_id] = job
+        return jobs
+
+    def update(self, job: JobRecord) -> None:
+        with self._lock:
+            self._ensure_open()
+            self._pending[job.job_id] = self._checked_snapshot(job)
+            if self._status_changed(job) or len(self._pending) >= self._max_pending:
+                self._write_pending()
+
+    def find_active_by_dedupe_key(self, dedupe_key: str) -> JobRecord | None:
+        with self._lock:
+            self._write_pending()
+            row = self._connection.execute(
+                f"{_SELECT} WHERE dedupe_key = ? AND {_ACTIVE_PREDICATE} ORDER BY created_at LIMIT 1",
+                (dedupe_key,),
+            ).fetchone()
+        return _from_row(row) if row is not None else None
+
+    def add_if_absent(self, dedupe_key: str, job: JobRecord) -> JobRecord | None:
+        """Check and insert in one IMMEDIATE transaction, so other processes sharing the file are excluded too."""
+        with self._lock:
+            self._ensure_open()
+            self._write_pending()
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    f"{_SELECT} WHERE dedupe_key = ? AND {_ACTIVE_PREDICATE} ORDER BY created_at LIMIT 1",
+                    (dedupe_key,),
+                ).fetchone()
+                if row is None:
+                    connection.execute(_UPSERT, _to_row(job))
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            if row is not None:
+                return _from_row(row)
+            if job.is_active:
+                self._stored_status[job.job_id] = job.status
+            return None
+
+    def find(
+        self,
+        *,
+        status: JobStatus | Collection[JobStatus] | None = None,
+        job_type: str | None = None,
+    ) -> list[JobRecord]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if status is not None:
+            statuses = [status] if isinstance(status, JobStatus) else list(status)
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(JobStatus(value).value for value in statuses)
+        if job_type is not None:
+            clauses.append("job_type = ?")
+            params.append(job_type)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            self._write_pending()
+            rows = self._connection.execute(f"{_SELECT}{where} ORDER BY created_at", params).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._write_pending()
+
+    def close(self) -> None:
+        self._stop_event.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=2.0)
+            self._flusher = None
+        with self._lock:
+            if self._closed:
+                return
+            self._write_pending()
+            self._connection.close()
+            self._closed = True
+
+    def __enter__(self) -> "SqliteJobRepository":
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(jobs)")}
+        if "priority" not in columns:
+            self._connection.execute("ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+        if "timeout" not in columns:
+            self._connection.execute("ALTER TABLE jobs ADD COLUMN timeout REAL")
+
+    def _status_changed(self, job: JobRecord) -> bool:
+        previous = self._stored_status.get(job.job_id)
+        if previous is None:
+            row = self._connection.execute("SELECT status FROM jobs WHERE job_id = ?", (job.job_id,)).fetchone()
+            previous = JobStatus(row[0]) if row is not None else None
+        return previous is not job.status
+
+    def _checked_snapshot(self, job: JobRecord) -> JobRecord:
+        """Snapshot of `job` whose containers are known to encode; re-checked only when they were replaced."""
+        stored = job.snapshot()
+        fields = (stored.payload, stored.metadata, stored.result)
+        checked = self._encodable.get(job.job_id)
+        if checked is None or any(old is not new for old, new in zip(checked, fields)):
+            for value in fields:
+                _dump(value)
+            self._encodable[job.job_id] = fields
+        return stored
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise ValueError(f"Job repository is closed: {self._path}")
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        jobs = list(self._pending.values())
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(_UPSERT, [_to_row(job) for job in jobs])
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        self._pending.clear()
+        for job in jobs:
+            if job.is_active:
+                self._stored_status[job.job_id] = job.status
+            else:
+                self._stored_status.pop(job.job_id, None)
+                self._encodable.pop(job.job_id, None)
+
+    def _flush_loop(self) -> None:
+        assert self._flush_interval is not None
+        while not self._stop_event.wait(self._flush_interval):
+            self.flush()
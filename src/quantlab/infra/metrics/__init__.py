@@ -0,0 +1,24 @@
+from .histogram import LatencyHistogram, LatencySummary
+from .prometheus import render_prometheus
+from .registry import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricFamily,
+    MetricKind,
+    MetricSample,
+    MetricsRegistry,
+)
+
+__all__ = [
+    "LatencyHistogram",
+    "LatencySummary",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricFamily",
+    "MetricKind",
+    "MetricSample",
+    "MetricsRegistry",
+    "render_prometheus",
+]
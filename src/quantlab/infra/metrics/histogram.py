@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import math
+
+from quantlab.core.metrics import LatencySummary
+
+_SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_BUCKETS:
+        return value
+    exponent = value.bit_length() - _SUB_BUCKET_BITS - 1
+    return exponent * _SUB_BUCKETS + (value >> exponent)
+
+
+def _bucket_upper_bound(index: int) -> int:
+    if index < _SUB_BUCKETS:
+        return index
+    exponent = index // _SUB_BUCKETS - 1
+    top = index % _SUB_BUCKETS + _SUB_BUCKETS
+    return ((top + 1) << exponent) - 1
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram over non-negative integer values (nanoseconds).
+
+    Values below 16 are exact; above that each power of two is split into
+    16 sub-buckets, so reported percentiles are within ~6% of the true value.
+    Not synchronised: record from a single thread or under a lock.
+    """
+
+    __slots__ = ("_counts", "_count", "_total", "_max")
+
+    def __init__(self) -> None:
+        self._counts: dict[int, int] = {}
+        self._count = 0
+        self._total = 0
+        self._max = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    @property
+    def max(self) -> int:
+        return self._max
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(0, int(value))
+        index = _bucket_index(value)
+        self._counts[index] = self._counts.get(index, 0) + count
+        self._count += count
+        self._total += value * count
+        if value > self._max:
+            self._max = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self._count += other._count
+        self._total += other._total
+        self._max = max(self._max, other._max)
+
+    def percentile(self, pct: float) -> int:
+        if self._count == 0:
+            return 0
+        rank = max(1, math.ceil(pct / 100.0 * self._count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(_bucket_upper_bound(index), self._max)
+        return self._max
+
+    def buckets(self) -> list[tuple[int, int]]:
+        return [(_bucket_upper_bound(index), self._counts[index]) for index in sorted(self._counts)]
+
+    def summary(self) -> LatencySummary:
+        mean = self._total / self._count if self._count else 0.0
+        return LatencySummary(
+            count=self._count,
+            mean_ms=mean / 1e6,
+            p50_ms=self.percentile(50) / 1e6,
+            p99_ms=self.percentile(99) / 1e6,
+            max_ms=self._max / 1e6,
+        )
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from quantlab.infra.metrics.registry import Histogram, MetricKind, MetricsRegistry
+
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def render_prometheus(registry: MetricsRegistry) -> str:
+    """Render the registry in Prometheus text exposition format (histograms as summaries, in seconds)."""
+    lines: list[str] = []
+    for family in registry.families():
+        prom_type = "summary" if family.kind is MetricKind.HISTOGRAM else family.kind.value
+        if family.help:
+            lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {prom_type}")
+
+        for values, child in family.children():
+            if isinstance(child, Histogram):
+                quantiles, total_ns, count = child.quantiles(SUMMARY_QUANTILES)
+                for quantile, value_ns in quantiles:
+                    labels = _labels(family.labelnames, values, (("quantile", str(quantile)),))
+                    lines.append(f"{family.name}{labels} {value_ns / 1e9:.9g}")
+                labels = _labels(family.labelnames, values)
+                lines.append(f"{family.name}_sum{labels} {total_ns / 1e9:.9g}")
+                lines.append(f"{family.name}_count{labels} {count}")
+            else:
+                lines.append(f"{family.name}{_labels(family.labelnames, values)} {child.value:.17g}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from enum import Enum
+from typing import Generic, TypeVar
+
+from quantlab.infra.metrics.histogram import LatencyHistogram, LatencySummary
+
+
+class MetricKind(str, Enum):
+    COUNTER = "counter"
+    GAUGE = "gauge"
+    HISTOGRAM = "histogram"
+
+
+class Counter:
+    """
+    Monotonic counter striped per thread.
+
+    Each thread adds into its own cell, so `inc` takes no lock on the hot
+    path; `value` sums the cells, including those of threads that exited.
+    """
+
+    __slots__ = ("_local", "_cells", "_lock")
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._cells: list[list[float]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> float:
+        with self._lock:
+            cells = list(self._cells)
+        return sum(cell[0] for cell in cells)
+
+    def inc(self, amount: float = 1.0) -> None:
+        try:
+            self._local.cell[0] += amount
+        except AttributeError:
+            cell = self._local.cell = [amount]
+            with self._lock:
+                self._cells.append(cell)
+
+
+class Gauge:
+    __slots__ = ("_value", "_lock", "_function")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+        self._function: Callable[[], float] | None = None
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the value at collection time instead of on every change."""
+        self._function = function
+
+
+class Histogram:
+    """Thread-safe wrapper around `LatencyHistogram`; observations are nanoseconds."""
+
+    __slots__ = ("_histogram", "_lock")
+
+    def __init__(self) -> None:
+        self._histogram = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def observe_ns(self, value: int, count: int = 1) -> None:
+        """Record `value`; a sampled caller passes its 1-in-`count` rate so totals stay estimates of all calls."""
+        with self._lock:
+            self._histogram.record(value, count)
+
+    def observe_seconds(self, value: float) -> None:
+        self.observe_ns(int(value * 1e9))
+
+    def summary(self) -> LatencySummary:
+        with self._lock:
+            return self._histogram.summary()
+
+    def quantiles(self, quantiles: tuple[float, ...]) -> tuple[list[tuple[float, int]], int, int]:
+        with self._lock:
+            histogram = self._histogram
+            values = [(quantile, histogram.percentile(quantile * 100.0)) for quantile in quantiles]
+            return values, histogram.total, histogram.count
+
+
+MetricT = TypeVar("MetricT", Counter, Gauge, Histogram)
+
+
+class MetricFamily(Generic[MetricT]):
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        kind: MetricKind,
+        labelnames: tuple[str, ...],
+        factory: Callable[[], MetricT],
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = labelnames
+        self._factory = factory
+        self._children: dict[tuple[str, ...], MetricT] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> MetricT:
+        """Return the child for `values`; callers on hot paths should keep a reference."""
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        with self._lock:
+            child = self._children.get(values)
+            if child is None:
+                child = self._children[values] = self._factory()
+            return child
+
+    def children(self) -> Iterator[tuple[tuple[str, ...], MetricT]]:
+        with self._lock:
+            items = list(self._children.items())
+        return iter(items)
+
+
+@dataclass(frozen=True, slots=True)
+class MetricSample:
+    name: str
+    labels: dict[str, str]
+    value: float | LatencySummary
+
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and HDR-style histograms.
+
+    Registering the same name twice returns the existing family, so
+    components can share one registry without coordinating setup.
+    """
+
+    def __init__(self) -> None:
+        self._families: dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str = "", labelnames: tuple[str, ...] = ()) -> MetricFamily[Counter]:
+        return self._register(name, help, MetricKind.COUNTER, labelnames, Counter)
+
+    def gauge(self, name: str, help: str = "", labelnames: tuple[str, ...] = ()) -> MetricFamily[Gauge]:
+        return self._register(name, help, MetricKind.GAUGE, labelnames, Gauge)
+
+    def histogram(self, name: str, help: str = "", labelnames: tuple[str, ...] = ()) -> MetricFamily[Histogram]:
+        return self._register(name, help, MetricKind.HISTOGRAM, labelnames, Histogram)
+
+    def families(self) -> list[MetricFamily]:
+        with self._lock:
+            return list(self._families.values())
+
+    def collect(self) -> list[MetricSample]:
+        samples: list[MetricSample] = []
+        for family in self.families():
+            for values, child in family.children():
+                labels = dict(zip(family.labelnames, values))
+                value = child.summary() if isinstance(child, Histogram) else child.value
+                samples.append(MetricSample(name=family.name, labels=labels, value=value))
+        return samples
+
+    def snapshot(self) -> dict[str, float | LatencySummary]:
+        return {_series_name(sample.name, sample.labels): sample.value for sample in self.collect()}
+
+    def _register(
+        self,
+        name: str,
+        help: str,
+        kind: MetricKind,
+        labelnames: tuple[str, ...],
+        factory: Callable[[], MetricT],
+    ) -> MetricFamily[MetricT]:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(name, help, kind, labelnames, factory)
+            elif family.kind is not kind or family.labelnames != labelnames:
+                raise ValueError(f"Metric {name!r} already registered as {family.kind.value}{family.labelnames}")
+            return family
+
+
+def _series_name(name: str, labels: dict[str, str]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return f"{name}{{{rendered}}}"
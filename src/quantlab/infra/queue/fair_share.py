@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from itertools import count
+
+from quantlab.core.interfaces import JobQueue
+
+_DEFAULT_SHARE = "default"
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerStats:
+    queued: dict[str, int]
+    running: dict[str, int]
+
+
+class FairShareJobQueue(JobQueue):
+    """
+    Priority queue with weighted fair share and per-type concurrency caps.
+
+    Higher `priority` always wins. Among jobs of equal priority, share groups
+    (`job_type` or `correlation_id`, per `share_by`) are served by stride
+    scheduling: each dispatch advances the group's virtual time by
+    `1 / weight`, and the group with the lowest virtual time goes next, so a
+    bulk sweep cannot starve other groups. Jobs whose type has reached its
+    limit in `concurrency_limits` stay queued until `task_done` frees a slot.
+    """
+
+    def __init__(
+        self,
+        *,
+        share_by: str = "job_type",
+        weights: Mapping[str, float] | None = None,
+        concurrency_limits: Mapping[str, int] | None = None,
+    ) -> None:
+        if share_by not in ("job_type", "correlation_id"):
+            raise ValueError(f"Unknown share_by={share_by!r}, expected 'job_type' or 'correlation_id'")
+        self._share_by = share_by
+        self._weights = dict(weights or {})
+        self._limits = dict(concurrency_limits or {})
+
+        self._condition = threading.Condition()
+        self._sequence = count()
+        # (share, job_type) -> heap of (-priority, sequence, job_id)
+        self._lanes: dict[tuple[str, str], list[tuple[int, int, str]]] = {}
+        self._virtual_time: dict[str, float] = {}
+        self._clock = 0.0
+        self._running: dict[str, int] = {}
+        self._running_types: dict[str, str] = {}
+        self._closed = False
+
+    def put(
+        self,
+        job_id: str,
+        *,
+        priority: int = 0,
+        job_type: str | None = None,
+        correlation_id: str | None = None,
+    ) -> None:
+        job_type = job_type or _DEFAULT_SHARE
+        share = (job_type if self._share_by == "job_type" else correlation_id) or _DEFAULT_SHARE
+        with self._condition:
+            lane = self._lanes.setdefault((share, job_type), [])
+            if not lane and not self._share_queued(share):
+                # a group that was idle rejoins at the current clock instead of
+                # replaying the turns it skipped
+                self._virtual_time[share] = max(self._virtual_time.get(share, 0.0), self._clock)
+            heapq.heappush(lane, (-priority, next(self._sequence), job_id))
+            self._condition.notify()
+
+    def get(self, timeout: float | None = None) -> str | None:
+        job_ids = self.get_many(1, timeout)
+        return job_ids[0] if job_ids else None
+
+    def get_many(self, max_items: int, timeout: float | None = None) -> list[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                job_ids: list[str] = []
+                while len(job_ids) < max_items and (job_id := self._pop_next()) is not None:
+                    job_ids.append(job_id)
+                if job_ids or self._closed:
+                    return job_ids
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                self._condition.wait(remaining)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def task_done(self, job_id: str) -> None:
+        with self._condition:
+            job_type = self._running_types.pop(job_id, None)
+            if job_type is None:
+                return
+            self._running[job_type] -= 1
+            self._condition.notify()
+
+    def stats(self) -> SchedulerStats:
+        with self._condition:
+            queued: dict[str, int] = {}
+            for (_, job_type), lane in self._lanes.items():
+                if lane:
+                    queued[job_type] = queued.get(job_type, 0) + len(lane)
+            return SchedulerStats(queued=queued, running={k: v for k, v in self._running.items() if v})
+
+    def _share_queued(self, share: str) -> bool:
+        return any(lane for (lane_share, _), lane in self._lanes.items() if lane_share == share)
+
+    def _pop_next(self) -> str | None:
+        best: tuple[int, float, int] | None = None
+        best_key: tuple[str, str] | None = None
+        for key, lane in self._lanes.items():
+            if not lane:
+                continue
+            share, job_type = key
+            limit = self._limits.get(job_type)
+            if limit is not None and self._running.get(job_type, 0) >= limit:
+                continue
+            neg_priority, sequence, _ = lane[0]
+            candidate = (neg_priority, self._virtual_time.get(share, 0.0), sequence)
+            if best is None or candidate < best:
+                best, best_key = candidate, key
+        if best_key is None:
+            return None
+
+        share, job_type = best_key
+        lane = self._lanes[best_key]
+        _, _, job_id = heapq.heappop(lane)
+        if not lane:
+            del self._lanes[best_key]
+        self._clock = self._virtual_time.get(share, 0.0)
+        self._virtual_time[share] = self._clock + 1.0 / self._weights.get(share, 1.0)
+        if not lane and not self._share_queued(share):
+            # keep per-share state bounded when sharing by correlation id
+            self._virtual_time.pop(share)
+        self._running[job_type] = self._running.get(job_type, 0) + 1
+        self._running_types[job_id] = job_type
+        return job_id
@@ -4,16 +4,55 @@ from queue import Empty, Queue
 
 from quantlab.core.interfaces import JobQueue
 
+_CLOSED = object()
+
 
 class InMemoryJobQueue(JobQueue):
     def __init__(self) -> None:
-        self._queue: Queue[str] = Queue()
+        self._queue: Queue[object] = Queue()
+        self._closed = False
 
-    def put(self, job_id: str) -> None:
+    def put(
+        self,
+        job_id: str,
+        *,
+        priority: int = 0,
+        job_type: str | None = None,
+        correlation_id: str | None = None,
+    ) -> None:
         self._queue.put(job_id)
 
     def get(self, timeout: float | None = None) -> str | None:
-        try:
-            return self._queue.get(timeout=timeout)
-        except Empty:
-            return None
\ No newline at end of file
+        while True:
+            try:
+                item = self._queue.get(timeout=0 if self._closed else timeout)
+            except Empty:
+                return None
+            if item is not _CLOSED:
+                return item  # type: ignore[return-value]
+            # pass the sentinel on so every blocked getter wakes up
+            self._queue.put(_CLOSED)
+            if self._queue.qsize() == 1:
+                return None
+            # ids put after close sit behind the sentinel; still hand them out
+
+    def get_many(self, max_items: int, timeout: float | None = None) -> list[str]:
+        first = self.get(timeout)
+        if first is None:
+            return []
+        job_ids = [first]
+        while len(job_ids) < max_items:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if item is _CLOSED:
+                self._queue.put(_CLOSED)
+                break
+            job_ids.append(item)  # type: ignore[arg-type]
+        return job_ids
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSED)
@@ -1,9 +1,30 @@
+from .catalog import CatalogEntry, DatasetCatalog
+from .duckdb_engine import DuckDBQueryEngine
 from .file_store import LocalFileStore
+from .intraday_cache import CacheStats, IntradayCache, cache_key
 from .parquet_store import ParquetStore
+from .parquet_writer import ParquetWriteOptions, StreamingParquetWriter, WriteStats, report_progress, write_batches
+from .partitioned_dataset import PartitionedDataset
 from .path_resolver import PathResolver
+from .shared_buffers import ArrowHandle, open_value, share_table
 
 __all__ = [
+    "ArrowHandle",
+    "CacheStats",
+    "CatalogEntry",
+    "DatasetCatalog",
+    "DuckDBQueryEngine",
+    "IntradayCache",
     "LocalFileStore",
     "ParquetStore",
+    "ParquetWriteOptions",
+    "PartitionedDataset",
     "PathResolver",
+    "StreamingParquetWriter",
+    "WriteStats",
+    "cache_key",
+    "open_value",
+    "report_progress",
+    "share_table",
+    "write_batches",
 ]
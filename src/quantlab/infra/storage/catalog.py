@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    symbol TEXT,
+    frequency TEXT,
+    partition TEXT NOT NULL,
+    num_rows INTEGER,
+    min_timestamp INTEGER,
+    max_timestamp INTEGER,
+    schema_hash TEXT,
+    size_bytes INTEGER NOT NULL,
+    written_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_files_lookup ON files (dataset, symbol, min_timestamp, max_timestamp);
+"""
+
+_COLUMNS = (
+    "path",
+    "dataset",
+    "symbol",
+    "frequency",
+    "partition",
+    "num_rows",
+    "min_timestamp",
+    "max_timestamp",
+    "schema_hash",
+    "size_bytes",
+    "written_at",
+)
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM files"
+_UPSERT = (
+    f"INSERT INTO files ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+    f"ON CONFLICT(path) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _COLUMNS[1:])
+)
+
+# Timestamps are stored as UTC microseconds so range filters compare integers.
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    path: str
+    dataset: str
+    size_bytes: int
+    partition: Mapping[str, str] = field(default_factory=dict)  # hive keys from the path, e.g. symbol, date
+    num_rows: int | None = None  # statistics are None for files that are not Parquet
+    min_timestamp: datetime | None = None
+    max_timestamp: datetime | None = None
+    schema_hash: str | None = None
+    written_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+
+def schema_hash(schema: pa.Schema) -> str:
+    """Stable short hash of field names and types, ignoring schema metadata."""
+    return hashlib.sha256(schema.remove_metadata().to_string().encode()).hexdigest()[:16]
+
+
+def describe_file(
+    path: str | Path,
+    dataset: str,
+    *,
+    metadata: pq.FileMetaData | None = None,
+    timestamp_column: str = "timestamp",
+) -> CatalogEntry:
+    """
+    Build a `CatalogEntry` for a file on disk.
+
+    For Parquet files the row count, schema and timestamp range come from the
+    footer (`metadata`, if the writer already has it, saves reading it), so
+    no data pages are touched.
+    """
+    path = Path(path).resolve()
+    entry = CatalogEntry(
+        path=str(path),
+        dataset=dataset,
+        size_bytes=path.stat().st_size,
+        partition=_hive_partition(path),
+    )
+    if path.suffix != ".parquet":
+        return entry
+    metadata = metadata or pq.read_metadata(path)
+    schema = metadata.schema.to_arrow_schema()
+    low, high = _timestamp_range(metadata, schema.get_field_index(timestamp_column))
+    return CatalogEntry(
+        path=entry.path,
+        dataset=dataset,
+        size_bytes=entry.size_bytes,
+        partition=entry.partition,
+        num_rows=metadata.num_rows,
+        min_timestamp=low,
+        max_timestamp=high,
+        schema_hash=schema_hash(schema),
+    )
+
+
+class DatasetCatalog:
+    """
+    SQLite index of the files written into the data stores.
+
+    One row per file: dataset name, hive partition keys, row count, min/max
+    timestamp, schema hash and size. Stores that are given a catalog record
+    each file as they commit it, and `PartitionedDataset` asks `files()`
+    which files can hold a symbol / time range before opening any, instead
+    of listing directories. Writes are short transactions in WAL mode, so
+    several processes can share the file; the catalog pickles as its path.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        if str(path) != ":memory:":
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._indexed: set[str] = set()  # directories `index_directory` has run on in this process
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def record(self, entries: Iterable[CatalogEntry], *, replace: Iterable[str | Path] = ()) -> None:
+        """
+        Upsert `entries` in one transaction.
+
+        Entries under the `replace` directories that are not among `entries`
+        are dropped in the same transaction, for writers that overwrite
+        whole partitions.
+        """
+        rows = [_to_row(entry) for entry in entries]
+        prefixes = [_prefix(directory) for directory in replace]
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for prefix in prefixes:
+                    kept = [row[0] for row in rows if row[0].startswith(prefix)]
+                    connection.execute(
+                        f"DELETE FROM files WHERE substr(path, 1, ?) = ? "
+                        f"AND path NOT IN ({', '.join('?' for _ in kept)})",
+                        [len(prefix), prefix, *kept],
+                    )
+                connection.executemany(_UPSERT, rows)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def record_file(self, path: str | Path, dataset: str, **kwargs: Any) -> CatalogEntry:
+        entry = describe_file(path, dataset, **kwargs)
+        self.record([entry])
+        return entry
+
+    def remove(self, path: str | Path) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM files WHERE path = ?", (str(Path(path).resolve()),))
+
+    def get(self, path: str | Path) -> CatalogEntry | None:
+        with self._lock:
+            row = self._connection.execute(f"{_SELECT} WHERE path = ?", (str(Path(path).resolve()),)).fetchone()
+        return _from_row(row) if row is not None else None
+
+    def files(
+        self,
+        dataset: str,
+        *,
+        symbols: Iterable[str] | None = None,
+        frequency: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        under: str | Path | None = None,
+    ) -> list[CatalogEntry]:
+        """
+        Files of `dataset` that may hold rows for `symbols` in [`start`, `end`).
+
+        `under` limits the result to one store's directory when several
+        stores share the catalog. Files without timestamp statistics are
+        always included.
+        """
+        clauses = ["dataset = ?"]
+        params: list[Any] = [dataset]
+        if under is not None:
+            prefix = _prefix(under)
+            clauses.append("substr(path, 1, ?) = ?")
+            params.extend((len(prefix), prefix))
+        if symbols is not None:
+            symbols = list(symbols)
+            clauses.append(f"symbol IN ({', '.join('?' for _ in symbols)})" if symbols else "0")
+            params.extend(symbols)
+        if frequency is not None:
+            clauses.append("frequency = ?")
+            params.append(frequency)
+        if start is not None:
+            clauses.append("(max_timestamp IS NULL OR max_timestamp >= ?)")
+            params.append(_micros(start))
+        if end is not None:
+            clauses.append("(min_timestamp IS NULL OR min_timestamp < ?)")
+            params.append(_micros(end))
+        with self._lock:
+            rows = self._connection.execute(f"{_SELECT} WHERE {' AND '.join(clauses)} ORDER BY path", params).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def datasets(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT DISTINCT dataset FROM files ORDER BY dataset")]
+
+    def index_directory(
+        self,
+        directory: str | Path,
+        dataset: str,
+        *,
+        pattern: str = "*.parquet",
+        timestamp_column: str = "timestamp",
+    ) -> int:
+        """
+        Record files under `directory` that are missing or changed in size, and
+        drop entries whose file is gone; returns the number of files recorded.
+
+        Use it once to backfill data written before the catalog existed.
+        """
+        root = Path(directory).resolve()
+        prefix = _prefix(root)
+        with self._lock:
+            known = dict(
+                self._connection.execute(
+                    "SELECT path, size_bytes FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+                ).fetchall()
+            )
+        entries = [
+            describe_file(path, dataset, timestamp_column=timestamp_column)
+            for path in sorted(root.rglob(pattern))
+            if path.is_file() and known.get(str(path)) != path.stat().st_size
+        ]
+        gone = [path for path in known if not Path(path).exists()]
+        self.record(entries)
+        with self._lock:
+            self._connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in gone])
+        return len(entries)
+
+    def ensure_indexed(
+        self,
+        directory: str | Path,
+        dataset: str,
+        *,
+        pattern: str = "*.parquet",
+        timestamp_column: str = "timestamp",
+    ) -> None:
+        """
+        `index_directory` once per directory for the lifetime of this catalog.
+
+        Readers that take their file list from the catalog call this first,
+        so data already on disk when the catalog was attached is not missed.
+        """
+        key = _prefix(directory)
+        with self._lock:
+            if key in self._indexed:
+                return
+        self.index_directory(directory, dataset, pattern=pattern, timestamp_column=timestamp_column)
+        with self._lock:
+            self._indexed.add(key)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "DatasetCatalog":
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"path": self._path}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["path"])
+
+
+def _prefix(directory: str | Path) -> str:
+    return os.path.join(Path(directory).resolve(), "")
+
+
+def _hive_partition(path: Path) -> dict[str, str]:
+    return {
+        key: unquote(value)
+        for key, _, value in (part.partition("=") for part in path.parent.parts if "=" in part)
+    }
+
+
+def _timestamp_range(metadata: pq.FileMetaData, column: int) -> tuple[datetime | None, datetime | None]:
+    if column < 0 or metadata.num_row_groups == 0:
+        return None, None
+    lows, highs = [], []
+    for index in range(metadata.num_row_groups):
+        statistics = metadata.row_group(index).column(column).statistics
+        if statistics is None or not statistics.has_min_max or not isinstance(statistics.min, datetime):
+            return None, None
+        lows.append(statistics.min)
+        highs.append(statistics.max)
+    return _utc(min(lows)), _utc(max(highs))
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _micros(value: datetime) -> int:
+    return (_utc(value) - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int | None) -> datetime | None:
+    return None if value is None else _EPOCH + value * _MICROSECOND
+
+
+def _to_row(entry: CatalogEntry) -> tuple[Any, ...]:
+    return (
+        entry.path,
+        entry.dataset,
+        entry.partition.get("symbol"),
+        entry.partition.get("frequency"),
+        json.dumps(dict(entry.partition), separators=(",", ":")),
+        entry.num_rows,
+        None if entry.min_timestamp is None else _micros(entry.min_timestamp),
+        None if entry.max_timestamp is None else _micros(entry.max_timestamp),
+        entry.schema_hash,
+        entry.size_bytes,
+        entry.written_at.isoformat(),
+    )
+
+
+def _from_row(row: tuple[Any, ...]) -> CatalogEntry:
+    (
+        path,
+        dataset,
+        _symbol,
+        _frequency,
+        partition,
+        num_rows,
+        min_timestamp,
+        max_timestamp,
+        schema_hash_value,
+        size_bytes,
+        written_at,
+    ) = row
+    return CatalogEntry(
+        path=path,
+        dataset=dataset,
+        size_bytes=size_bytes,
+        partition=json.loads(partition),
+        num_rows=num_rows,
+        min_timestamp=_from_micros(min_timestamp),
+        max_timestamp=_from_micros(max_timestamp),
+        schema_hash=schema_hash_value,
+        written_at=datetime.fromisoformat(written_at),
+    )
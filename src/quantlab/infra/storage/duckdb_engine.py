@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pyarrow as pa
+
+from quantlab.domain.data.enums import DatasetKind
+
+logger = logging.getLogger("quantlab.storage")
+
+# Partition columns written by PartitionedDataset; typed explicitly so DuckDB
+# does not guess `date=` or numeric-looking symbols.
+_HIVE_TYPES = "{'symbol': VARCHAR, 'frequency': VARCHAR, 'date': DATE}"
+_HIVE_GLOB = ("symbol=*", "frequency=*", "date=*", "*.parquet")
+
+
+class DuckDBQueryEngine:
+    """
+    SQL over the partitioned Parquet datasets, executed by DuckDB.
+
+    Every `DatasetKind` directory under `root` that holds the layout written
+    by `PartitionedDataset` (`ParquetStore(root).dataset(kind)`) is exposed
+    as a view named after the kind, e.g. `trade` or `bar`, with `symbol`,
+    `frequency` and `date` as columns. Only files inside the hive partition
+    directories belong to a view; other Parquet files under a kind are
+    ignored, and a kind DuckDB cannot read is logged and skipped.
+    DuckDB prunes partitions and row groups from the WHERE clause and runs
+    scans, aggregates and joins on its own threads; results come back as
+    Arrow tables or record batch readers without going through pandas.
+
+    Each thread gets its own cursor on a shared database, so one engine can
+    be used from all thread workers. Only the process that created the engine
+    opens `database`; any other process (a forked worker that inherited it,
+    or one that received it pickled) opens a private in-memory database with
+    the same views, because a DuckDB file can be opened read-write by only
+    one process at a time.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        database: str | Path = ":memory:",
+        *,
+        threads: int | None = None,
+        memory_limit: str | None = None,
+    ) -> None:
+        self._root = Path(root)
+        self._database = str(database)
+        self._threads = threads
+        self._memory_limit = memory_limit
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connection: duckdb.DuckDBPyConnection | None = None
+        self._cursors: list[duckdb.DuckDBPyConnection] = []
+        self._views: list[str] = []
+        self._pid: int | None = None  # process that opened `_connection`
+        self._owner_pid = os.getpid()  # the only process allowed to open `database`
+
+    @property
+    def views(self) -> list[str]:
+        self._cursor()
+        return list(self._views)
+
+    def refresh(self) -> list[str]:
+        """Re-create the views, e.g. after a new dataset kind was written; returns their names."""
+        self._cursor()
+        with self._lock:
+            self._register_views(self._connection)
+        return list(self._views)
+
+    def query(self, sql: str, params: Sequence[Any] | None = None) -> pa.Table:
+        return _to_table(self._cursor().execute(sql, params))
+
+    def stream(
+        self,
+        sql: str,
+        params: Sequence[Any] | None = None,
+        batch_size: int = 128 * 1024,
+    ) -> pa.RecordBatchReader:
+        """Like `query`, but yields record batches as DuckDB produces them."""
+        return _to_reader(self._cursor().execute(sql, params), batch_size)
+
+    def register(self, name: str, table: pa.Table) -> None:
+        """Expose an Arrow table as `name` to this thread's queries; DuckDB scans it in place."""
+        self._cursor().register(name, table)
+
+    def unregister(self, name: str) -> None:
+        self._cursor().unregister(name)
+
+    def resample(
+        self,
+        source: str | DatasetKind,
+        every: timedelta,
+        *,
+        symbols: Iterable[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        price: str = "price",
+        volume: str | None = None,
+        timestamp: str = "timestamp",
+    ) -> pa.Table:
+        """
+        OHLC(V) bars per symbol and `every`-sized bucket of `source`.
+
+        `start` is inclusive and `end` exclusive, as in `PartitionedDataset`.
+        """
+        columns = [
+            f"first({_ident(price)} ORDER BY {_ident(timestamp)}) AS open",
+            f"max({_ident(price)}) AS high",
+            f"min({_ident(price)}) AS low",
+            f"last({_ident(price)} ORDER BY {_ident(timestamp)}) AS close",
+        ]
+        if volume is not None:
+            columns.append(f"sum({_ident(volume)}) AS volume")
+        where, params = _filters(symbols, start, end, timestamp)
+        sql = (
+            f"SELECT symbol, time_bucket(?, {_ident(timestamp)}) AS {_ident(timestamp)}, {', '.join(columns)} "
+            f"FROM {_ident(str(source))}{where} GROUP BY ALL ORDER BY symbol, {_ident(timestamp)}"
+        )
+        return self.query(sql, [every, *params])
+
+    def asof_join(
+        self,
+        left: str | DatasetKind | pa.Table,
+        right: str | DatasetKind | pa.Table,
+        *,
+        on: str = "timestamp",
+        by: Sequence[str] = ("symbol",),
+        columns: Sequence[str] | None = None,
+    ) -> pa.Table:
+        """
+        Each `left` row with the latest `right` row at or before it, per `by` key.
+
+        Either side may be a view name or an Arrow table. `columns` picks the
+        `right` columns to attach (default: those `left` does not have); left
+        rows without a match keep NULLs.
+        """
+        cursor = self._cursor()
+        registered: list[str] = []
+        try:
+            names = []
+            for side, value in (("left", left), ("right", right)):
+                if isinstance(value, pa.Table):
+                    name = f"__asof_{side}_{threading.get_ident()}"
+                    cursor.register(name, value)
+                    registered.append(name)
+                    names.append(name)
+                else:
+                    names.append(str(value))
+            if columns is None:
+                taken = set(_column_names(cursor, names[0]))
+                columns = [column for column in _column_names(cursor, names[1]) if column not in taken]
+            conditions = [f"l.{_ident(key)} = r.{_ident(key)}" for key in by]
+            conditions.append(f"l.{_ident(on)} >= r.{_ident(on)}")
+            selected = ", ".join(["l.*", *(f"r.{_ident(column)}" for column in columns)])
+            sql = (
+                f"SELECT {selected} FROM {_ident(names[0])} AS l "
+                f"ASOF LEFT JOIN {_ident(names[1])} AS r ON {' AND '.join(conditions)}"
+            )
+            return _to_table(cursor.execute(sql))
+        finally:
+            for name in registered:
+                cursor.unregister(name)
+
+    def close(self) -> None:
+        with self._lock:
+            for cursor in self._cursors:
+                cursor.close()
+            if self._connection is not None:
+                self._connection.close()
+            self._cursors.clear()
+            self._connection = None
+            self._local = threading.local()
+            self._pid = None
+
+    def __enter__(self) -> "DuckDBQueryEngine":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "root": self._root,
+            "database": self._database,
+            "threads": self._threads,
+            "memory_limit": self._memory_limit,
+            "owner_pid": self._owner_pid,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(
+            state["root"],
+            state["database"],
+            threads=state["threads"],
+            memory_limit=state["memory_limit"],
+        )
+        self._owner_pid = state["owner_pid"]
+
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        pid = os.getpid()
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is not None and self._pid == pid:
+            return cursor
+        with self._lock:
+            if self._pid != pid:
+                # first use here; a forked child must not touch the parent's handles
+                database = self._database if pid == self._owner_pid else ":memory:"
+                self._connection = self._connect(database)
+                self._cursors = []
+                self._pid = pid
+                self._local = threading.local()
+            cursor = self._connection.cursor()
+            self._cursors.append(cursor)
+        self._local.cursor = cursor
+        return cursor
+
+    def _connect(self, database: str) -> duckdb.DuckDBPyConnection:
+        if database != ":memory:":
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+        config: dict[str, Any] = {}
+        if self._threads:
+            config["threads"] = self._threads
+        if self._memory_limit:
+            config["memory_limit"] = self._memory_limit
+        connection = duckdb.connect(database, config=config)
+        self._register_views(connection)
+        return connection
+
+    def _register_views(self, connection: duckdb.DuckDBPyConnection) -> None:
+        views = []
+        for kind in DatasetKind:
+            directory = self._root / kind.value
+            if next(directory.glob("/".join(_HIVE_GLOB)), None) is None:
+                continue  # DuckDB rejects a view over a glob that matches nothing
+            pattern = str(directory.joinpath(*_HIVE_GLOB)).replace("'", "''")
+            try:
+                connection.execute(
+                    f"CREATE OR REPLACE VIEW {_ident(kind.value)} AS SELECT * FROM read_parquet("
+                    f"'{pattern}', hive_partitioning = true, hive_types = {_HIVE_TYPES}, union_by_name = true)"
+                )
+            except duckdb.Error:
+                logger.exception("Skipping view %s over %s", kind.value, directory)
+                continue
+            views.append(kind.value)
+        self._views = views
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_names(cursor: duckdb.DuckDBPyConnection, relation: str) -> list[str]:
+    return [column[0] for column in cursor.execute(f"SELECT * FROM {_ident(relation)} LIMIT 0").description]
+
+
+def _filters(
+    symbols: Iterable[str] | None,
+    start: datetime | None,
+    end: datetime | None,
+    timestamp: str,
+) -> tuple[str, list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if symbols is not None:
+        symbols = list(symbols)
+        clauses.append(f"symbol IN ({', '.join('?' * len(symbols))})" if symbols else "FALSE")
+        params.extend(symbols)
+    if start is not None:
+        clauses.append(f"{_ident(timestamp)} >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append(f"{_ident(timestamp)} < ?")
+        params.append(end)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _to_table(result: duckdb.DuckDBPyConnection) -> pa.Table:
+    # `to_arrow_table` replaces `fetch_arrow_table` in newer DuckDB releases
+    fetch = getattr(result, "to_arrow_table", None) or result.fetch_arrow_table
+    return fetch()
+
+
+def _to_reader(result: duckdb.DuckDBPyConnection, batch_size: int) -> pa.RecordBatchReader:
+    fetch = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+    return fetch(batch_size)
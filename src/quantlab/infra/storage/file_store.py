@@ -3,18 +3,23 @@ from __future__ import annotations
 from pathlib import Path
 
 from quantlab.core.storage import BinaryStore
+from .catalog import DatasetCatalog
 from .path_resolver import PathResolver
 
 
 class LocalFileStore(BinaryStore):
-    def __init__(self, root: str | Path) -> None:
+    def __init__(self, root: str | Path, catalog: DatasetCatalog | None = None) -> None:
         self._resolver = PathResolver(root)
         self._resolver.root.mkdir(parents=True, exist_ok=True)
+        self._catalog = catalog
 
     def write_bytes(self, key: str, data: bytes) -> Path:
         path = self._resolver.resolve(key)
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_bytes(data)
+        if self._catalog is not None:
+            # dataset = first key component, as in ParquetStore
+            self._catalog.record_file(path, Path(key).parts[0])
         return path
 
     def read_bytes(self, key: str) -> bytes:
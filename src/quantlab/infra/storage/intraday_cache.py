@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from quantlab.infra.metrics import MetricsRegistry
+
+_SUFFIX = ".arrow"
+
+
+def cache_key(
+    dataset: str,
+    *,
+    columns: Iterable[str] | None = None,
+    filter: Any = None,
+    version: str | int = 1,
+    **params: Any,
+) -> str:
+    """
+    Content hash of what a cached frame was derived from.
+
+    `filter` may be anything with a stable `str()` (a `pyarrow.dataset`
+    expression, a SQL predicate, a dict); bump `version` when the transform
+    that produces the frame changes, so stale entries are never read.
+    """
+    description = {
+        "dataset": dataset,
+        "columns": None if columns is None else list(columns),
+        "filter": None if filter is None else str(filter),
+        "version": str(version),
+        "params": params,
+    }
+    encoded = json.dumps(description, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:32]
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+@dataclass(slots=True)
+class _Entry:
+    size: int
+    written_at: float
+    accessed_at: float
+
+
+class IntradayCache:
+    """
+    Size- and age-bounded cache of Arrow tables in Feather (Arrow IPC) files.
+
+    Entries live in `directory` as `<key>.arrow`, written uncompressed to a
+    temp file and renamed into place, and are memory-mapped on `get()`, so a
+    hit costs no copy. Each process keeps an in-memory index of sizes and
+    access times; the files themselves are the shared state: the mtime is
+    the write time (for `ttl`) and the atime, set explicitly on every hit,
+    the last access (for LRU). When the total passes `max_bytes`, the
+    directory is rescanned, so entries written by other processes count,
+    and the least recently used files are deleted until the total is back
+    under `max_bytes * low_watermark`.
+
+    Safe to share between threads; the cache pickles as its configuration,
+    so process workers can receive it and open their own index.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        max_bytes: int = 2 * 1024**3,
+        ttl: float | None = 24 * 3600.0,
+        low_watermark: float = 0.8,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._low_watermark = low_watermark
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._hit_counter = self._miss_counter = self._eviction_counter = None
+        if metrics is not None:
+            self._hit_counter = metrics.counter("intraday_cache_hits_total", "Cache lookups served.").labels()
+            self._miss_counter = metrics.counter("intraday_cache_misses_total", "Cache lookups missed.").labels()
+            self._eviction_counter = metrics.counter(
+                "intraday_cache_evictions_total", "Intraday cache entries evicted.", ("reason",)
+            )
+            metrics.gauge("intraday_cache_bytes", "Bytes held by the intraday cache.").labels().set_function(
+                lambda: self._size
+            )
+        with self._lock:
+            self._index = self._scan()
+            self._size = sum(entry.size for entry in self._index.values())
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def get(self, key: str) -> pa.Table | None:
+        path = self._path(key)
+        now = time.time()
+        try:
+            stat = path.stat()
+            if self._expired(stat.st_mtime, now):
+                self._evict(key, "ttl")
+                return self._miss()
+            table = feather.read_table(str(path), memory_map=True)
+            os.utime(path, (now, stat.st_mtime))  # record the access for other processes' LRU
+        except FileNotFoundError:
+            self._forget(key)
+            return self._miss()
+        with self._lock:
+            self._remember(key, _Entry(size=stat.st_size, written_at=stat.st_mtime, accessed_at=now))
+            self._hits += 1
+        if self._hit_counter is not None:
+            self._hit_counter.inc()
+        return table
+
+    def put(self, key: str, table: pa.Table) -> None:
+        path = self._path(key)
+        tmp_path = path.with_name(f".{key}.{uuid4().hex}.tmp")
+        try:
+            feather.write_feather(table, str(tmp_path), compression="uncompressed")
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        now = time.time()
+        with self._lock:
+            self._remember(key, _Entry(size=path.stat().st_size, written_at=now, accessed_at=now))
+            over = self._size > self._max_bytes
+        if over:
+            self.evict()
+
+    def get_or_compute(self, key: str, compute: Callable[[], pa.Table]) -> pa.Table:
+        """
+        Cached table for `key`, or `compute()` it and cache the result.
+
+        Threads asking for the same key wait for one computation; separate
+        processes may both compute it, and the last write wins.
+        """
+        table = self.get(key)
+        if table is not None:
+            return table
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                table = self._peek(key)
+                if table is None:
+                    table = compute()
+                    self.put(key, table)
+                return table
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+    def invalidate(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+        self._forget(key)
+
+    def clear(self) -> None:
+        for path in self._directory.glob(f"*{_SUFFIX}"):
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._index.clear()
+            self._size = 0
+
+    def evict(self) -> int:
+        """Drop expired entries, then LRU entries while over budget; returns the number removed."""
+        now = time.time()
+        with self._lock:
+            self._index = self._scan()
+            self._size = sum(entry.size for entry in self._index.values())
+            doomed: list[tuple[str, str]] = [
+                (key, "ttl") for key, entry in self._index.items() if self._expired(entry.written_at, now)
+            ]
+            size = self._size - sum(self._index[key].size for key, _ in doomed)
+            if size > self._max_bytes:
+                target = self._max_bytes * self._low_watermark
+                expired = {key for key, _ in doomed}
+                for key, entry in sorted(self._index.items(), key=lambda item: item[1].accessed_at):
+                    if size <= target:
+                        break
+                    if key not in expired:
+                        doomed.append((key, "size"))
+                        size -= entry.size
+        for key, reason in doomed:
+            self._evict(key, reason)
+        return len(doomed)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._index),
+                size_bytes=self._size,
+            )
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "directory": self._directory,
+            "max_bytes": self._max_bytes,
+            "ttl": self._ttl,
+            "low_watermark": self._low_watermark,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        directory = state.pop("directory")
+        self.__init__(directory, **state)
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}{_SUFFIX}"
+
+    def _peek(self, key: str) -> pa.Table | None:
+        """`get` without counting a second miss for the same lookup."""
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if self._expired(stat.st_mtime, time.time()):
+                return None
+            return feather.read_table(str(path), memory_map=True)
+        except FileNotFoundError:
+            return None
+
+    def _expired(self, written_at: float, now: float) -> bool:
+        return self._ttl is not None and now - written_at > self._ttl
+
+    def _miss(self) -> None:
+        with self._lock:
+            self._misses += 1
+        if self._miss_counter is not None:
+            self._miss_counter.inc()
+        return None
+
+    def _evict(self, key: str, reason: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+        self._forget(key)
+        with self._lock:
+            self._evictions += 1
+        if self._eviction_counter is not None:
+            self._eviction_counter.labels(reason).inc()
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        previous = self._index.get(key)
+        self._index[key] = entry
+        self._size += entry.size - (previous.size if previous is not None else 0)
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            entry = self._index.pop(key, None)
+            if entry is not None:
+                self._size -= entry.size
+
+    def _scan(self) -> dict[str, _Entry]:
+        index: dict[str, _Entry] = {}
+        for path in self._directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process meanwhile
+            index[path.name[: -len(_SUFFIX)]] = _Entry(
+                size=stat.st_size, written_at=stat.st_mtime, accessed_at=stat.st_atime
+            )
+        return index
@@ -2,19 +2,87 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from quantlab.domain.data.enums import DatasetKind
+from quantlab.infra.storage.catalog import DatasetCatalog
+from quantlab.infra.storage.partitioned_dataset import PartitionedDataset
+from quantlab.infra.storage.parquet_writer import (
+    ParquetWriteOptions,
+    StreamingParquetWriter,
+    WriteStats,
+    write_batches,
+)
+
 
 class ParquetStore:
-    def __init__(self, root: str | Path) -> None:
+    """
+    Parquet files under one root directory.
+
+    With a `catalog`, every file written through the store (and through its
+    `dataset()` views) is recorded there; the dataset name is the first
+    component of the relative path.
+    """
+
+    def __init__(self, root: str | Path, catalog: DatasetCatalog | None = None) -> None:
         self._root = Path(root)
         self._root.mkdir(parents=True, exist_ok=True)
+        self._catalog = catalog
+
+    @property
+    def root(self) -> Path:
+        return self._root
 
     def write_dataframe(self, relative_path: str, df) -> Path:
         path = self._root / relative_path
         path.parent.mkdir(parents=True, exist_ok=True)
         df.to_parquet(path, index=False)
+        self._record(relative_path, path)
         return path
 
     def read_dataframe(self, relative_path: str):
         path = self._root / relative_path
         import pandas as pd
-        return pd.read_parquet(path)
\ No newline at end of file
+        return pd.read_parquet(path)
+
+    def write_table(self, relative_path: str, table) -> Path:
+        import pyarrow.parquet as pq
+
+        path = self._root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, path)
+        self._record(relative_path, path)
+        return path
+
+    def dataset(self, kind: DatasetKind | str, **options) -> PartitionedDataset:
+        """Hive-partitioned view of `kind` under this store's root; see `PartitionedDataset`."""
+        options.setdefault("catalog", self._catalog)
+        return PartitionedDataset(self._root, kind, **options)
+
+    def open_writer(self, relative_path: str, schema, **kwargs) -> StreamingParquetWriter:
+        """Streaming writer for `relative_path`; see `StreamingParquetWriter`."""
+        if self._catalog is not None:
+            kwargs.setdefault("on_commit", lambda path: self._record(relative_path, path))
+        return StreamingParquetWriter(self._root / relative_path, schema, **kwargs)
+
+    def write_batches(
+        self,
+        relative_path: str,
+        batches,
+        schema=None,
+        *,
+        options: ParquetWriteOptions | None = None,
+        on_progress=None,
+    ) -> WriteStats:
+        """Write an iterator of record batches row group by row group, committing atomically."""
+        path = self._root / relative_path
+        stats = write_batches(path, batches, schema, options=options, on_progress=on_progress)
+        self._record(relative_path, path)
+        return stats
+
+    def read_table(self, relative_path: str, columns: list[str] | None = None):
+        import pyarrow.parquet as pq
+
+        return pq.read_table(self._root / relative_path, columns=columns)
+
+    def _record(self, relative_path: str, path: Path) -> None:
+        if self._catalog is not None:
+            self._catalog.record_file(path, Path(relative_path).parts[0])
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from quantlab.core.interfaces import JobContext
+
+
+@dataclass(frozen=True, slots=True)
+class ParquetWriteOptions:
+    row_group_size: int = 256 * 1024  # rows; one row group per this many rows
+    compression: str = "zstd"
+    compression_level: int | None = None
+    use_dictionary: bool | list[str] = True  # or only these columns, e.g. ["symbol", "side"]
+    data_page_size: int = 1024 * 1024
+    durable: bool = True  # fsync before the rename
+
+
+@dataclass(frozen=True, slots=True)
+class WriteStats:
+    rows: int
+    row_groups: int
+    bytes_written: int
+
+
+class StreamingParquetWriter:
+    """
+    Writes record batches to one Parquet file without holding the dataset in memory.
+
+    Batches are buffered only until `row_group_size` rows are available,
+    then written as a row group, so memory stays around one row group
+    regardless of input size. Output goes to a temp file next to `path` and
+    is renamed into place by `commit()`; used as a context manager, the file
+    is committed on success and discarded on error. `on_progress` receives
+    a `WriteStats` after every row group; `on_commit` the final path once
+    the file is in place.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        schema: pa.Schema,
+        options: ParquetWriteOptions | None = None,
+        on_progress: Callable[[WriteStats], None] | None = None,
+        on_commit: Callable[[Path], None] | None = None,
+    ) -> None:
+        self._path = Path(path)
+        self._options = options or ParquetWriteOptions()
+        self._on_progress = on_progress
+        self._on_commit = on_commit
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self._path.with_name(f".{self._path.name}.{uuid4().hex}.tmp")
+        self._sink = pa.OSFile(str(self._tmp_path), "wb")
+        self._writer = pq.ParquetWriter(
+            self._sink,
+            schema,
+            compression=self._options.compression,
+            compression_level=self._options.compression_level,
+            use_dictionary=self._options.use_dictionary,
+            data_page_size=self._options.data_page_size,
+        )
+        self._schema = schema
+        self._pending: list[pa.RecordBatch] = []
+        self._pending_rows = 0
+        self._rows = 0
+        self._row_groups = 0
+        self._bytes_written = 0
+        self._done = False
+
+    @property
+    def stats(self) -> WriteStats:
+        return WriteStats(rows=self._rows, row_groups=self._row_groups, bytes_written=self._bytes_written)
+
+    def write(self, data: pa.RecordBatch | pa.Table) -> None:
+        batches = data.to_batches() if isinstance(data, pa.Table) else [data]
+        for batch in batches:
+            if batch.num_rows:
+                self._pending.append(batch)
+                self._pending_rows += batch.num_rows
+        if self._pending_rows >= self._options.row_group_size:
+            self._write_row_groups(final=False)
+
+    def commit(self) -> Path:
+        if self._done:
+            raise RuntimeError(f"Writer for {self._path} is already closed")
+        try:
+            self._write_row_groups(final=True)
+            self._writer.close()
+            self._bytes_written = self._sink.tell()
+            if self._options.durable:
+                with open(self._tmp_path, "rb+") as handle:
+                    os.fsync(handle.fileno())
+            self._sink.close()
+            os.replace(self._tmp_path, self._path)
+        except BaseException:
+            self.abort()
+            raise
+        self._done = True
+        if self._on_commit is not None:
+            self._on_commit(self._path)
+        return self._path
+
+    def abort(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        try:
+            self._writer.close()
+        except Exception:
+            pass
+        self._sink.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "StreamingParquetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def _write_row_groups(self, final: bool) -> None:
+        if not self._pending_rows:
+            return
+        size = self._options.row_group_size
+        table = pa.Table.from_batches(self._pending, schema=self._schema)
+        ready = table.num_rows if final else table.num_rows - table.num_rows % size
+        self._writer.write_table(table.slice(0, ready), row_group_size=size)
+        rest = table.slice(ready)
+        self._pending = rest.to_batches()
+        self._pending_rows = rest.num_rows
+        self._rows += ready
+        self._row_groups += -(-ready // size)
+        self._bytes_written = self._sink.tell()
+        if self._on_progress is not None:
+            self._on_progress(self.stats)
+
+
+def write_batches(
+    path: str | Path,
+    batches: Iterable[pa.RecordBatch],
+    schema: pa.Schema | None = None,
+    *,
+    options: ParquetWriteOptions | None = None,
+    on_progress: Callable[[WriteStats], None] | None = None,
+) -> WriteStats:
+    """Stream `batches` into `path` atomically; `schema` defaults to the first batch's."""
+    iterator = iter(batches)
+    first = next(iterator, None) if schema is None else None
+    if schema is None:
+        if first is None:
+            raise ValueError("Cannot infer a schema from an empty batch stream")
+        schema = first.schema
+    with StreamingParquetWriter(path, schema, options, on_progress) as writer:
+        if first is not None:
+            writer.write(first)
+        for batch in iterator:
+            writer.write(batch)
+    return writer.stats
+
+
+def report_progress(ctx: JobContext, expected_rows: int | None = None) -> Callable[[WriteStats], None]:
+    """`on_progress` callback that forwards rows and bytes written to `ctx.set_progress`."""
+
+    def report(stats: WriteStats) -> None:
+        fraction = min(stats.rows / expected_rows, 1.0) if expected_rows else 0.0
+        ctx.set_progress(fraction, f"wrote {stats.rows:,} rows, {stats.bytes_written:,} bytes")
+
+    return report
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, date, datetime
+from pathlib import Path
+from urllib.parse import unquote
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from quantlab.domain.data.enums import DataFrequency, DatasetKind
+from quantlab.infra.storage.catalog import DatasetCatalog, describe_file
+
+PARTITION_SCHEMA = pa.schema([("symbol", pa.string()), ("frequency", pa.string()), ("date", pa.date32())])
+_PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+# files in the partition layout; other Parquet files under a kind are not part of it
+_HIVE_FILES = "symbol=*/frequency=*/date=*/*.parquet"
+
+_WRITE_MODES = {"append": "overwrite_or_ignore", "overwrite_partitions": "delete_matching"}
+
+
+class PartitionedDataset:
+    """
+    One `DatasetKind` laid out as hive partitions under a root directory:
+    `<root>/<kind>/symbol=<symbol>/frequency=<frequency>/date=<YYYY-MM-DD>/part-*.parquet`.
+
+    Reads go through `pyarrow.dataset`: `symbols` and `frequency` select
+    partition directories before any file is listed, the time range prunes
+    `date=` partitions and, via Parquet row-group statistics on the
+    timestamp column, row groups inside files; `columns` limits what is
+    decoded. Results are Arrow tables, so pandas is never involved unless
+    the caller converts.
+
+    With a `catalog`, writes record each file and reads take the candidate
+    files from it, pruned by symbol, frequency and timestamp range, instead
+    of listing partition directories. The first read through a catalog
+    indexes the partition files already under the kind's directory (see
+    `DatasetCatalog.ensure_indexed`); files added later by writers that do
+    not share the catalog stay invisible until `catalog.index_directory`
+    runs on the directory again.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        kind: DatasetKind | str,
+        *,
+        timestamp_column: str = "timestamp",
+        row_group_size: int = 64 * 1024,
+        catalog: DatasetCatalog | None = None,
+    ) -> None:
+        self._kind = DatasetKind(kind)
+        self._path = Path(root) / self._kind.value
+        self._timestamp_column = timestamp_column
+        self._row_group_size = row_group_size
+        self._catalog = catalog
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def write(
+        self,
+        table: pa.Table,
+        frequency: DataFrequency | str = DataFrequency.TICK,
+        *,
+        mode: str = "append",
+    ) -> list[Path]:
+        """
+        Write rows (which need `symbol` and timestamp columns) into their partitions.
+
+        `mode="append"` adds new files next to existing ones;
+        `"overwrite_partitions"` replaces every partition the table touches,
+        e.g. when a day is re-downloaded. Rows are sorted by symbol and time
+        so row-group statistics stay selective.
+        """
+        try:
+            behavior = _WRITE_MODES[mode]
+        except KeyError:
+            raise ValueError(f"Unknown mode={mode!r}, expected one of {sorted(_WRITE_MODES)}") from None
+        timestamps = table.column(self._timestamp_column)
+        table = (
+            table.append_column("frequency", pa.array([DataFrequency(frequency).value] * table.num_rows, pa.string()))
+            .append_column("date", pc.cast(pc.cast(timestamps, pa.timestamp("us", "UTC")), pa.date32()))
+            .sort_by([("symbol", "ascending"), (self._timestamp_column, "ascending")])
+        )
+
+        files: list[ds.WrittenFile] = []
+        ds.write_dataset(
+            table,
+            self._path,
+            format="parquet",
+            partitioning=_PARTITIONING,
+            basename_template=f"part-{uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior=behavior,
+            max_rows_per_group=self._row_group_size,
+            min_rows_per_group=min(self._row_group_size, table.num_rows) or 1,
+            file_visitor=files.append,
+        )
+        written = [Path(file.path) for file in files]
+        if self._catalog is not None:
+            entries = [
+                describe_file(
+                    file.path, self._kind.value, metadata=file.metadata, timestamp_column=self._timestamp_column
+                )
+                for file in files
+            ]
+            self._catalog.record(
+                entries,
+                replace={path.parent for path in written} if mode == "overwrite_partitions" else (),
+            )
+        return written
+
+    def scanner(
+        self,
+        *,
+        symbols: Iterable[str] | None = None,
+        frequency: DataFrequency | str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        columns: list[str] | None = None,
+        filter: ds.Expression | None = None,
+        batch_size: int = 128 * 1024,
+    ) -> ds.Scanner | None:
+        """
+        Scanner over matching rows, for streaming with `to_batches()`.
+
+        `start` is inclusive and `end` exclusive. Returns None when no
+        partition matches.
+        """
+        if self._catalog is not None:
+            dataset = self._catalog_dataset(symbols, frequency, start, end)
+        else:
+            dataset = self._dataset(symbols, frequency)
+        if dataset is None:
+            return None
+        predicate = self._time_predicate(dataset.schema, start, end)
+        if filter is not None:
+            predicate = filter if predicate is None else predicate & filter
+        return dataset.scanner(columns=columns, filter=predicate, batch_size=batch_size)
+
+    def read(
+        self,
+        *,
+        symbols: Iterable[str] | None = None,
+        frequency: DataFrequency | str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        columns: list[str] | None = None,
+        filter: ds.Expression | None = None,
+    ) -> pa.Table:
+        scanner = self.scanner(
+            symbols=symbols, frequency=frequency, start=start, end=end, columns=columns, filter=filter
+        )
+        if scanner is None:
+            return pa.table({name: pa.array([], pa.null()) for name in columns or ()})
+        return scanner.to_table()
+
+    def symbols(self) -> list[str]:
+        return sorted(self._partition_dirs(self._path, "symbol"))
+
+    def _dataset(
+        self,
+        symbols: Iterable[str] | None,
+        frequency: DataFrequency | str | None,
+    ) -> ds.Dataset | None:
+        symbol_dirs = self._partition_dirs(self._path, "symbol")
+        if symbols is not None:
+            symbol_dirs = {symbol: symbol_dirs[symbol] for symbol in symbols if symbol in symbol_dirs}
+        directories = list(symbol_dirs.values())
+        if frequency is not None:
+            wanted = DataFrequency(frequency).value
+            directories = [
+                path
+                for directory in directories
+                if (path := self._partition_dirs(directory, "frequency").get(wanted)) is not None
+            ]
+        if not directories:
+            return None
+        children = [
+            ds.dataset(
+                str(directory),
+                format="parquet",
+                partitioning=_PARTITIONING,
+                partition_base_dir=str(self._path),
+            )
+            for directory in directories
+        ]
+        return children[0] if len(children) == 1 else ds.dataset(children)
+
+    def _catalog_dataset(
+        self,
+        symbols: Iterable[str] | None,
+        frequency: DataFrequency | str | None,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> ds.Dataset | None:
+        self._catalog.ensure_indexed(
+            self._path,
+            self._kind.value,
+            pattern=_HIVE_FILES,
+            timestamp_column=self._timestamp_column,
+        )
+        entries = self._catalog.files(
+            self._kind.value,
+            symbols=symbols,
+            frequency=None if frequency is None else DataFrequency(frequency).value,
+            start=start,
+            end=end,
+            under=self._path,
+        )
+        if not entries:
+            return None
+        return ds.dataset(
+            [entry.path for entry in entries],
+            format="parquet",
+            partitioning=_PARTITIONING,
+            partition_base_dir=str(self._path.resolve()),
+        )
+
+    def _time_predicate(
+        self,
+        schema: pa.Schema,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> ds.Expression | None:
+        timestamp = ds.field(self._timestamp_column)
+        timestamp_type = schema.field(self._timestamp_column).type
+        predicate: ds.Expression | None = None
+        if start is not None:
+            predicate = (ds.field("date") >= _utc_date(start)) & (timestamp >= pa.scalar(start, timestamp_type))
+        if end is not None:
+            upper = (ds.field("date") <= _utc_date(end)) & (timestamp < pa.scalar(end, timestamp_type))
+            predicate = upper if predicate is None else predicate & upper
+        return predicate
+
+    @staticmethod
+    def _partition_dirs(directory: Path, key: str) -> dict[str, Path]:
+        if not directory.is_dir():
+            return {}
+        prefix = f"{key}="
+        return {
+            unquote(child.name[len(prefix):]): child
+            for child in directory.iterdir()
+            if child.is_dir() and child.name.startswith(prefix)
+        }
+
+
+def _utc_date(value: datetime) -> date:
+    return value.astimezone(UTC).date() if value.tzinfo is not None else value.date()
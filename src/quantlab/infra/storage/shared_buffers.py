@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import ctypes
+import os
+import sys
+from dataclasses import asdict, dataclass
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import pyarrow as pa
+
+from quantlab.core.storage import SharedHandle, open_value
+
+# Marker key used when a handle is stored as JSON (e.g. by SqliteJobRepository).
+HANDLE_KEY = "__arrow_handle__"
+
+
+@dataclass(frozen=True, slots=True)
+class ArrowHandle(SharedHandle):
+    """
+    Picklable reference to an Arrow table in shared memory or a memory-mapped file.
+
+    Put handles in job payloads and results instead of the data itself: only
+    the handle crosses process boundaries and sits in the repository, and
+    `open()` maps the table without copying it. Whoever consumes the data
+    last calls `release()`.
+    """
+
+    location: str  # shared memory block name, or path of an Arrow IPC file
+    size: int
+    num_rows: int
+    shared_memory: bool
+
+    def open(self) -> pa.Table:
+        if not self.shared_memory:
+            return pa.ipc.open_file(pa.memory_map(self.location)).read_all()
+        return pa.ipc.open_file(_map_block(self.location, self.size)).read_all()
+
+    def release(self) -> None:
+        """Free the underlying memory or file; tables already opened in this process stay valid."""
+        if not self.shared_memory:
+            Path(self.location).unlink(missing_ok=True)
+            return
+        _unlink(self.location)
+
+    def to_json(self) -> dict[str, Any]:
+        return {HANDLE_KEY: asdict(self)}
+
+    @classmethod
+    def from_json(cls, value: dict[str, Any]) -> "ArrowHandle":
+        return cls(**value[HANDLE_KEY])
+
+
+def share_table(table: pa.Table, directory: str | Path | None = None) -> ArrowHandle:
+    """
+    Write `table` once in Arrow IPC file format and return a handle to it.
+
+    Without `directory` the table goes to a `multiprocessing.shared_memory`
+    block; with it, to a file there (e.g. under `artifact_dir`) that outlives
+    the process and is memory-mapped on `open()`.
+    """
+    sink = pa.MockOutputStream()
+    _write(sink, table)
+    size = sink.size()
+
+    if directory is not None:
+        path = Path(directory) / f"{uuid4().hex}.arrow"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            _write(sink, table)
+        os.replace(tmp_path, path)
+        return ArrowHandle(location=str(path), size=size, num_rows=table.num_rows, shared_memory=False)
+
+    block = _untracked_block(create=True, size=max(size, 1))
+    try:
+        _write(pa.FixedSizeBufferWriter(pa.py_buffer(block.buf)), table)
+    except BaseException:
+        _unlink(block.name)
+        raise
+    finally:
+        # unmap in the writer (typically a warm worker) so it does not pin
+        # the block after the consumer releases it
+        block.close()
+    return ArrowHandle(location=block.name, size=size, num_rows=table.num_rows, shared_memory=True)
+
+
+def _write(sink: Any, table: pa.Table) -> None:
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _map_block(name: str, size: int) -> pa.Buffer:
+    """Map a shared memory block as an Arrow buffer that keeps the mapping alive until Arrow drops it."""
+    block = _untracked_block(name=name)
+    anchor = ctypes.c_char.from_buffer(block.buf)
+    address = ctypes.addressof(anchor)
+    del anchor  # drop the buffer export; `base=block` keeps the memory mapped
+    return pa.foreign_buffer(address, size, base=block)
+
+
+def _untracked_block(**kwargs: Any) -> shared_memory.SharedMemory:
+    """
+    Create or attach a block that no resource tracker owns.
+
+    Before 3.13 every process that creates or attaches a block registers it
+    with its resource tracker, which unlinks it when that process exits, so
+    a result written by a process worker would vanish when the worker is
+    recycled, killed or shut down. Handles are released explicitly instead.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(track=False, **kwargs)
+    block = shared_memory.SharedMemory(**kwargs)
+    if os.name == "posix":
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def _unlink(name: str) -> None:
+    try:
+        block = shared_memory.SharedMemory(name=name)  # tracked, so unlink() leaves the tracker balanced
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
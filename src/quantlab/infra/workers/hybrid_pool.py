@@ -1,17 +1,57 @@
 from __future__ import annotations
 
+import heapq
+import itertools
 import threading
-from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections.abc import Callable
 from typing import Any, Final
 
 from quantlab.app.services.job_runner import DefaultJobRunner
 from quantlab.app.services.job_service import JobService
-from quantlab.core.jobs import JobExecutionMode
+from quantlab.core.jobs import JobExecutionMode, JobRecord, JobStatus
 from quantlab.core.interfaces import JobQueue, JobRegistry, JobRepository, WorkerPool
-from quantlab.infra.workers.process_pool import run_process_job
+from quantlab.infra.metrics import MetricsRegistry
+from quantlab.infra.workers.metrics import WorkerPoolMetrics
+from quantlab.infra.workers.process_worker import ProcessWorkers
+from quantlab.infra.workers.reaper import JobReaper
+
+# How often the dispatcher looks for freed slots while jobs wait in a mode backlog.
+_BACKLOG_POLL_INTERVAL = 0.02
 
 
 class HybridWorkerPool(WorkerPool):
+    """
+    Routes jobs to a thread or process executor by `execution_mode`.
+
+    The dispatcher takes at most as many jobs as there are free worker
+    slots (one `get_many` plus one `repo.get_many` per round), so ordering
+    decisions stay with the `JobQueue` (e.g. priority and fair share in
+    `FairShareJobQueue`) instead of piling up in executor backlogs.
+    A job whose mode has no free slot is never waited on: it goes to a
+    per-mode backlog, ordered by priority and then dequeue order, and runs
+    when a slot of its mode frees up, so a saturated process pool does not
+    stop thread jobs queued behind it. Each backlog holds at most as many
+    jobs as its mode has workers: a pull is never larger than the room left
+    in any backlog, since the queue cannot tell which mode it will return,
+    and once a backlog is full the dispatcher stops pulling until a slot
+    frees, so everything else stays in the queue under its own ordering and
+    concurrency limits. `task_done` is reported to the queue when each job
+    finishes. The idle dispatcher blocks in the queue and slot waits (it
+    polls only while a backlog is waiting); `stop()` wakes it by closing the
+    queue and requeues backlogged jobs.
+
+    PROCESS jobs run in warm workers by default: handlers registered before
+    `start()` are installed once per worker and resolved by job_type, so
+    only the payload is pickled per job (see `ProcessWorkers`). Their
+    `ctx.set_progress` calls are relayed back and applied at most
+    `process_progress_rate` times a second.
+
+    A `JobReaper` checks running jobs every `reap_interval` seconds: jobs
+    past `JobSpec.timeout` become TIMED_OUT, and cancelled or timed-out
+    PROCESS jobs have their worker killed and replaced so the slot frees up.
+    """
+
     def __init__(
         self,
         queue: JobQueue,
@@ -21,6 +61,13 @@ class HybridWorkerPool(WorkerPool):
         thread_workers: int = 4,
         process_workers: int = 2,
         poll_timeout: float = 0.5,
+        metrics: MetricsRegistry | None = None,
+        *,
+        warm_process_workers: bool = True,
+        max_jobs_per_process_worker: int | None = None,
+        process_initializer: Callable[[], None] | None = None,
+        process_progress_rate: float = 10.0,
+        reap_interval: float = 0.25,
     ) -> None:
         self._queue = queue
         self._repo = repo
@@ -30,11 +77,29 @@ class HybridWorkerPool(WorkerPool):
         self._thread_workers: Final[int] = thread_workers
         self._process_workers: Final[int] = process_workers
         self._poll_timeout = poll_timeout
+        self._thread_metrics = WorkerPoolMetrics(metrics, "thread", thread_workers) if metrics else None
+        self._process_metrics = WorkerPoolMetrics(metrics, "process", process_workers) if metrics else None
+        self._warm_process_workers = warm_process_workers
+        self._max_jobs_per_process_worker = max_jobs_per_process_worker
+        self._process_initializer = process_initializer
+        self._process_progress_rate = process_progress_rate
+        self._reaper = JobReaper(repo, job_service, interval=reap_interval)
 
         self._thread_executor: ThreadPoolExecutor | None = None
-        self._process_executor: ProcessPoolExecutor | None = None
+        self._process_executor: ProcessWorkers | None = None
         self._dispatcher_thread: threading.Thread | None = None
         self._stop_event = threading.Event()
+        self._slot_condition = threading.Condition()
+        self._slots = {
+            JobExecutionMode.THREAD: thread_workers,
+            JobExecutionMode.PROCESS: process_workers,
+        }
+        self._free_slots = dict(self._slots)
+        self._backlog: dict[JobExecutionMode, list[tuple[int, int, JobRecord]]] = {
+            JobExecutionMode.THREAD: [],
+            JobExecutionMode.PROCESS: [],
+        }
+        self._backlog_order = itertools.count()
 
     def start(self) -> None:
         if self._dispatcher_thread is not None:
@@ -43,7 +108,16 @@ class HybridWorkerPool(WorkerPool):
         self._stop_event.clear()
         self._thread_executor = ThreadPoolExecutor(max_workers=self._thread_workers)
         if self._process_workers > 0:
-            self._process_executor = ProcessPoolExecutor(max_workers=self._process_workers)
+            self._process_executor = ProcessWorkers(
+                self._registry,
+                self._job_service,
+                self._process_workers,
+                warm=self._warm_process_workers,
+                max_jobs_per_worker=self._max_jobs_per_process_worker,
+                initializer=self._process_initializer,
+                progress_updates_per_second=self._process_progress_rate,
+            )
+        self._reaper.start()
         self._dispatcher_thread = threading.Thread(
             target=self._dispatch_loop,
             name="hybrid-job-dispatcher",
@@ -53,6 +127,9 @@ class HybridWorkerPool(WorkerPool):
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._queue.close()
+        with self._slot_condition:
+            self._slot_condition.notify_all()
 
         if self._dispatcher_thread is not None:
             self._dispatcher_thread.join(timeout=2.0)
@@ -63,50 +140,141 @@ class HybridWorkerPool(WorkerPool):
             self._thread_executor = None
 
         if self._process_executor is not None:
-            self._process_executor.shutdown(wait=True, cancel_futures=False)
+            self._process_executor.shutdown()
             self._process_executor = None
+        self._reaper.stop()
 
     def _dispatch_loop(self) -> None:
         while not self._stop_event.is_set():
-            job_id = self._queue.get(timeout=self._poll_timeout)
-            if job_id is None:
+            self._dispatch_backlog()
+            wanted = self._wait_for_pull_size()
+            if wanted == 0:
                 continue
-
-            job = self._repo.get(job_id)
-            if job is None or not job.is_active:
+            waiting = any(self._backlog.values())
+            job_ids = self._queue.get_many(wanted, timeout=_BACKLOG_POLL_INTERVAL if waiting else None)
+            if not job_ids:
+                if not waiting:
+                    # only reached when the queue was closed by another owner
+                    self._stop_event.wait(self._poll_timeout)
                 continue
 
-            if job.execution_mode == JobExecutionMode.PROCESS:
-                self._submit_process_job(job.job_id)
-                continue
+            jobs = self._repo.get_many(job_ids)
+            for job_id in job_ids:
+                job = jobs.get(job_id)
+                if job is None or not job.is_active:
+                    self._queue.task_done(job_id)
+                    continue
 
-            assert self._thread_executor is not None
-            self._thread_executor.submit(self._thread_runner.run, job.job_id)
+                mode = job.execution_mode
+                if mode == JobExecutionMode.PROCESS and self._process_executor is None:
+                    self._job_service.mark_failed(job_id, "Process worker pool is not configured")
+                    self._queue.task_done(job_id)
+                    continue
+                heapq.heappush(self._backlog[mode], (-job.priority, next(self._backlog_order), job))
 
-    def _submit_process_job(self, job_id: str) -> None:
-        job = self._repo.get(job_id)
-        if job is None:
-            return
+        # stopping: hand undispatched jobs back so they are not lost
+        for backlog in self._backlog.values():
+            while backlog:
+                self._requeue(heapq.heappop(backlog)[2])
 
-        if self._process_executor is None:
-            self._job_service.mark_failed(job_id, "Process worker pool is not configured")
-            return
+    def _dispatch_backlog(self) -> None:
+        """Start backlogged jobs for every mode that has free slots, without waiting for any."""
+        for mode, backlog in self._backlog.items():
+            while backlog and self._try_claim_slot(mode):
+                job = heapq.heappop(backlog)[2]
+                if mode == JobExecutionMode.PROCESS:
+                    self._submit_process_job(job)
+                    continue
+
+                assert self._thread_executor is not None
+                if self._thread_metrics is not None:
+                    self._thread_metrics.job_started()
+                self._thread_executor.submit(self._run_thread_job, job)
 
+    def _wait_for_pull_size(self) -> int:
+        """
+        How many jobs to take from the queue: the free slots, capped by the
+        room left in every backlog, because any pulled job may belong to
+        either mode. When that is zero, blocks until a slot is released and
+        returns 0, so the caller first moves backlogged jobs into it.
+        """
+        # PROCESS jobs without an executor are failed on arrival and never backlogged
+        modes = [mode for mode, slots in self._slots.items() if slots > 0]
+        if self._process_executor is None and JobExecutionMode.PROCESS in modes:
+            modes.remove(JobExecutionMode.PROCESS)
+        with self._slot_condition:
+            if self._stop_event.is_set():
+                return 0
+            free = sum(self._free_slots[mode] for mode in modes)
+            room = min((self._slots[mode] - len(self._backlog[mode]) for mode in modes), default=0)
+            wanted = min(free, room)
+            if wanted == 0 and not any(self._free_slots[mode] and self._backlog[mode] for mode in modes):
+                self._slot_condition.wait()
+        return max(wanted, 0)
+
+    def _try_claim_slot(self, mode: JobExecutionMode) -> bool:
+        with self._slot_condition:
+            if self._stop_event.is_set() or self._free_slots[mode] == 0:
+                return False
+            self._free_slots[mode] -= 1
+            return True
+
+    def _requeue(self, job: JobRecord) -> None:
+        self._queue.task_done(job.job_id)
+        self._queue.put(
+            job.job_id,
+            priority=job.priority,
+            job_type=job.job_type,
+            correlation_id=job.metadata.get("correlation_id"),
+        )
+
+    def _release_slot(self, mode: JobExecutionMode, job_id: str) -> None:
+        with self._slot_condition:
+            self._free_slots[mode] += 1
+            self._slot_condition.notify_all()
+        self._queue.task_done(job_id)
+
+    def _run_thread_job(self, job: JobRecord) -> None:
+        job_id = job.job_id
+        self._reaper.track(job)
         try:
-            self._job_service.mark_running(job_id)
-            handler = self._registry.get(job.job_type)
-            future = self._process_executor.submit(run_process_job, handler, job.payload)
+            self._thread_runner.run(job_id)
+        finally:
+            self._reaper.untrack(job_id)
+            if self._thread_metrics is not None:
+                self._thread_metrics.job_finished()
+            self._release_slot(JobExecutionMode.THREAD, job_id)
+
+    def _submit_process_job(self, job: JobRecord) -> None:
+        job_id = job.job_id
+        assert self._process_executor is not None
+        try:
+            if self._job_service.mark_running(job_id).status is not JobStatus.RUNNING:
+                self._release_slot(JobExecutionMode.PROCESS, job_id)
+                return
+            self._reaper.track(job, kill=self._process_executor.kill)
+            future = self._process_executor.submit(job)
+            if self._process_metrics is not None:
+                self._process_metrics.job_started()
             future.add_done_callback(
                 lambda completed, current_job_id=job_id: self._complete_process_job(current_job_id, completed)
             )
         except Exception as exc:
+            self._reaper.untrack(job_id)
             self._job_service.mark_failed(job_id, str(exc))
+            self._release_slot(JobExecutionMode.PROCESS, job_id)
 
     def _complete_process_job(self, job_id: str, future: Future[dict[str, Any]]) -> None:
+        self._reaper.untrack(job_id)
+        if self._process_metrics is not None:
+            self._process_metrics.job_finished()
         try:
-            result = future.result()
-        except Exception as exc:
-            self._job_service.mark_failed(job_id, str(exc))
-            return
+            try:
+                result = future.result()
+            except Exception as exc:
+                self._job_service.mark_failed(job_id, str(exc))
+                return
 
-        self._job_service.mark_succeeded(job_id, result)
+            self._job_service.mark_succeeded(job_id, result)
+        finally:
+            self._release_slot(JobExecutionMode.PROCESS, job_id)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from quantlab.infra.metrics import MetricsRegistry
+
+
+class WorkerPoolMetrics:
+    """Busy/idle gauges for one executor; busy is derived from jobs in flight."""
+
+    def __init__(self, registry: MetricsRegistry, pool: str, workers: int) -> None:
+        self._inflight = registry.gauge(
+            "worker_pool_inflight_jobs",
+            "Jobs handed to the executor and not yet finished.",
+            ("pool",),
+        ).labels(pool)
+        busy = registry.gauge("worker_pool_busy_workers", "Workers running a job.", ("pool",)).labels(pool)
+        idle = registry.gauge("worker_pool_idle_workers", "Workers waiting for a job.", ("pool",)).labels(pool)
+        registry.gauge("worker_pool_workers", "Configured worker count.", ("pool",)).labels(pool).set(workers)
+
+        busy.set_function(lambda: min(self._inflight.value, workers))
+        idle.set_function(lambda: max(workers - self._inflight.value, 0))
+
+    def job_started(self) -> None:
+        self._inflight.inc()
+
+    def job_finished(self) -> None:
+        self._inflight.dec()
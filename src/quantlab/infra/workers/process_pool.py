@@ -1,20 +1,18 @@
 from __future__ import annotations
 
 import threading
-from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import Future
+from collections.abc import Callable
 from typing import Any, Final
 
 from quantlab.app.services.job_service import JobService
-from quantlab.core.interfaces import JobContext, JobQueue, JobRegistry, JobRepository, WorkerPool
-
-
-class NoOpJobContext(JobContext):
-    def set_progress(self, progress: float, message: str = "") -> None:
-        return
-
-
-def run_process_job(handler: Any, payload: dict[str, Any]) -> dict[str, Any]:
-    return handler(payload, NoOpJobContext())
+from quantlab.core.jobs import JobRecord, JobStatus
+from quantlab.core.interfaces import JobQueue, JobRegistry, JobRepository, WorkerPool
+from quantlab.infra.metrics import MetricsRegistry
+from quantlab.infra.workers.metrics import WorkerPoolMetrics
+from quantlab.infra.workers.process_worker import ProcessWorkers
+from quantlab.infra.workers.reaper import JobReaper
+from quantlab.infra.workers.slots import WorkerSlots
 
 
 class ProcessPoolWorkerPool(WorkerPool):
@@ -22,6 +20,8 @@ class ProcessPoolWorkerPool(WorkerPool):
     Single-mode process worker pool.
 
     Use HybridWorkerPool when a queue may contain both thread and process jobs.
+    See `ProcessWorkers` for `warm`, `max_jobs_per_worker`, `initializer`
+    and `progress_rate`, and `JobReaper` for `reap_interval`.
     """
 
     def __init__(
@@ -32,6 +32,13 @@ class ProcessPoolWorkerPool(WorkerPool):
         job_service: JobService,
         max_workers: int = 2,
         poll_timeout: float = 0.5,
+        metrics: MetricsRegistry | None = None,
+        *,
+        warm: bool = True,
+        max_jobs_per_worker: int | None = None,
+        initializer: Callable[[], None] | None = None,
+        progress_rate: float = 10.0,
+        reap_interval: float = 0.25,
     ) -> None:
         self._queue = queue
         self._repo = repo
@@ -39,17 +46,34 @@ class ProcessPoolWorkerPool(WorkerPool):
         self._job_service = job_service
         self._max_workers: Final[int] = max_workers
         self._poll_timeout = poll_timeout
-
-        self._executor: ProcessPoolExecutor | None = None
+        self._metrics = WorkerPoolMetrics(metrics, "process", max_workers) if metrics else None
+        self._warm = warm
+        self._max_jobs_per_worker = max_jobs_per_worker
+        self._initializer = initializer
+        self._progress_rate = progress_rate
+        self._reaper = JobReaper(repo, job_service, interval=reap_interval)
+
+        self._executor: ProcessWorkers | None = None
         self._dispatcher_thread: threading.Thread | None = None
         self._stop_event = threading.Event()
+        self._slots = WorkerSlots(max_workers)
 
     def start(self) -> None:
         if self._dispatcher_thread is not None:
             return
 
         self._stop_event.clear()
-        self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        self._slots.open()
+        self._executor = ProcessWorkers(
+            self._registry,
+            self._job_service,
+            self._max_workers,
+            warm=self._warm,
+            max_jobs_per_worker=self._max_jobs_per_worker,
+            initializer=self._initializer,
+            progress_updates_per_second=self._progress_rate,
+        )
+        self._reaper.start()
         self._dispatcher_thread = threading.Thread(
             target=self._dispatch_loop,
             name="process-job-dispatcher",
@@ -59,41 +83,82 @@ class ProcessPoolWorkerPool(WorkerPool):
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._slots.close()
+        self._queue.close()
 
         if self._dispatcher_thread is not None:
             self._dispatcher_thread.join(timeout=2.0)
             self._dispatcher_thread = None
 
         if self._executor is not None:
-            self._executor.shutdown(wait=True, cancel_futures=False)
+            self._executor.shutdown()
             self._executor = None
+        self._reaper.stop()
 
     def _dispatch_loop(self) -> None:
         while not self._stop_event.is_set():
-            job_id = self._queue.get(timeout=self._poll_timeout)
-            if job_id is None:
+            free = self._slots.wait_free()
+            if free == 0:
                 continue
-
-            job = self._repo.get(job_id)
-            if job is None:
+            job_ids = self._queue.get_many(free)
+            if not job_ids:
+                # only reached when the queue was closed by another owner
+                self._stop_event.wait(self._poll_timeout)
                 continue
 
-            try:
-                self._job_service.mark_running(job_id)
-                handler = self._registry.get(job.job_type)
-                assert self._executor is not None
-                future = self._executor.submit(run_process_job, handler, job.payload)
-                future.add_done_callback(
-                    lambda completed, current_job_id=job_id: self._complete_job(current_job_id, completed)
-                )
-            except Exception as exc:
-                self._job_service.mark_failed(job_id, str(exc))
-
-    def _complete_job(self, job_id: str, future: Future[dict[str, Any]]) -> None:
+            jobs = self._repo.get_many(job_ids)
+            for position, job_id in enumerate(job_ids):
+                job = jobs.get(job_id)
+                if job is None or not job.is_active:
+                    self._queue.task_done(job_id)
+                    continue
+                if not self._slots.claim():
+                    # stopping: hand undispatched jobs back so they are not lost
+                    for remaining in job_ids[position:]:
+                        if remaining in jobs:
+                            self._queue.task_done(remaining)
+                            self._queue.put(
+                                remaining,
+                                priority=jobs[remaining].priority,
+                                job_type=jobs[remaining].job_type,
+                                correlation_id=jobs[remaining].metadata.get("correlation_id"),
+                            )
+                    return
+                self._submit(job)
+
+    def _submit(self, job: JobRecord) -> None:
+        job_id = job.job_id
         try:
-            result = future.result()
+            if self._job_service.mark_running(job_id).status is not JobStatus.RUNNING:
+                self._slots.release()
+                self._queue.task_done(job_id)
+                return
+            assert self._executor is not None
+            self._reaper.track(job, kill=self._executor.kill)
+            future = self._executor.submit(job)
+            if self._metrics is not None:
+                self._metrics.job_started()
+            future.add_done_callback(
+                lambda completed, current_job_id=job_id: self._complete_job(current_job_id, completed)
+            )
         except Exception as exc:
+            self._reaper.untrack(job_id)
             self._job_service.mark_failed(job_id, str(exc))
-            return
+            self._slots.release()
+            self._queue.task_done(job_id)
+
+    def _complete_job(self, job_id: str, future: Future[dict[str, Any]]) -> None:
+        self._reaper.untrack(job_id)
+        if self._metrics is not None:
+            self._metrics.job_finished()
+        try:
+            try:
+                result = future.result()
+            except Exception as exc:
+                self._job_service.mark_failed(job_id, str(exc))
+                return
 
-        self._job_service.mark_succeeded(job_id, result)
+            self._job_service.mark_succeeded(job_id, result)
+        finally:
+            self._slots.release()
+            self._queue.task_done(job_id)
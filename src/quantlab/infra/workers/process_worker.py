@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from multiprocessing.connection import Connection, wait
+from queue import Empty, Queue
+from typing import Any, TypeVar
+
+from quantlab.app.services.job_service import JobService
+from quantlab.core.interfaces import JobContext, JobHandler, JobRegistry
+from quantlab.core.jobs import JobCancelledError, JobRecord
+
+logger = logging.getLogger("quantlab.workers")
+
+T = TypeVar("T")
+
+# Per-process state of a warm worker; empty in the parent process.
+_HANDLERS: dict[str, JobHandler] = {}
+_CACHE: dict[str, Any] = {}
+_PROGRESS: Any = None
+_PROGRESS_INTERVAL = 0.0
+
+
+class NoOpJobContext(JobContext):
+    def set_progress(self, progress: float, message: str = "") -> None:
+        return
+
+    def flush(self) -> None:
+        return
+
+
+class ProcessJobContext(JobContext):
+    """
+    Sends progress from a worker process to the parent, which feeds a `ProgressRelay`.
+
+    At most one update per `min_interval` is pickled onto the pipe; updates
+    in between only replace the pending value, which goes out with the next
+    call past the interval or when the job returns (`flush()`).
+    """
+
+    def __init__(self, job_id: str, channel: Any, min_interval: float = 0.0) -> None:
+        self._job_id = job_id
+        self._channel = channel
+        self._min_interval = min_interval
+        self._last: tuple[float, str] | None = None
+        self._pending: tuple[float, str] | None = None
+        self._next_send = 0.0
+
+    def set_progress(self, progress: float, message: str = "") -> None:
+        update = (progress, message)
+        if update == self._last:
+            self._pending = None
+            return
+        now = time.monotonic()
+        if now < self._next_send:
+            self._pending = update
+            return
+        self._send(update)
+        self._next_send = now + self._min_interval
+
+    def flush(self) -> None:
+        if self._pending is not None:
+            self._send(self._pending)
+
+    def _send(self, update: tuple[float, str]) -> None:
+        self._last = update
+        self._pending = None
+        self._channel.send(("progress", self._job_id, *update))
+
+
+def _context(job_id: str) -> ProcessJobContext | NoOpJobContext:
+    if _PROGRESS is None:
+        return NoOpJobContext()
+    return ProcessJobContext(job_id, _PROGRESS, _PROGRESS_INTERVAL)
+
+
+def _run_with_context(job_id: str, handler: JobHandler, payload: dict[str, Any]) -> dict[str, Any]:
+    context = _context(job_id)
+    try:
+        return handler(payload, context)
+    finally:
+        context.flush()
+
+
+def process_cache() -> dict[str, Any]:
+    """Dict that lives as long as the worker process, e.g. for loaded datasets or a DuckDB connection."""
+    return _CACHE
+
+
+def cached(key: str, factory: Callable[[], T]) -> T:
+    """Return `process_cache()[key]`, building it with `factory` on the first call in this process."""
+    try:
+        return _CACHE[key]
+    except KeyError:
+        value = _CACHE[key] = factory()
+        return value
+
+
+def init_process_worker(
+    handlers: Mapping[str, JobHandler],
+    initializer: Callable[[], None] | None = None,
+    progress: Any = None,
+    progress_interval: float = 0.0,
+) -> None:
+    """
+    Executor initializer: install the handler table and progress channel, then warm up.
+
+    Handlers exposing a `preload()` callable get it invoked once per worker,
+    typically to fill `process_cache()`. Progress is sent at most once per
+    `progress_interval` seconds per job.
+    """
+    global _PROGRESS, _PROGRESS_INTERVAL
+    _PROGRESS = progress
+    _PROGRESS_INTERVAL = progress_interval
+    _HANDLERS.clear()
+    _HANDLERS.update(handlers)
+    _CACHE.clear()
+    if initializer is not None:
+        initializer()
+    for job_type, handler in handlers.items():
+        preload = getattr(handler, "preload", None)
+        if callable(preload):
+            try:
+                preload()
+            except Exception:
+                logger.exception("Preloading handler for job_type=%r failed in pid=%s", job_type, os.getpid())
+
+
+def run_registered_job(job_id: str, job_type: str, payload: dict[str, Any]) -> dict[str, Any]:
+    """Run a job by handler name inside a warm worker, so only the payload crosses the pipe."""
+    try:
+        handler = _HANDLERS[job_type]
+    except KeyError as exc:
+        raise KeyError(f"No handler preloaded in worker for job_type={job_type!r}") from exc
+    return _run_with_context(job_id, handler, payload)
+
+
+def run_process_job(job_id: str, handler: Any, payload: dict[str, Any]) -> dict[str, Any]:
+    return _run_with_context(job_id, handler, payload)
+
+
+def _picklable(handlers: Mapping[str, JobHandler]) -> dict[str, JobHandler]:
+    table = {}
+    for job_type, handler in handlers.items():
+        try:
+            pickle.dumps(handler)
+        except Exception:
+            continue  # thread-only closures and the like; never sent to a process anyway
+        table[job_type] = handler
+    return table
+
+
+class ProgressRelay:
+    """
+    Parent-side consumer of worker progress messages.
+
+    Keeps only the latest update per job and applies them at most
+    `max_updates_per_second` times a second, so a chatty handler costs a
+    bounded number of repository writes and `JobProgressed` events.
+    """
+
+    def __init__(self, channel: Any, job_service: JobService, max_updates_per_second: float = 10.0) -> None:
+        self._channel = channel
+        self._job_service = job_service
+        self._interval = 1.0 / max_updates_per_second
+        self._thread = threading.Thread(target=self._run, name="process-progress-relay", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 2.0) -> None:
+        self._channel.put(None)
+        self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        latest: dict[str, tuple[float, str]] = {}
+        next_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, next_flush - time.monotonic()) if latest else None
+            try:
+                item = self._channel.get(timeout=timeout)
+            except Empty:
+                item = ()
+            if item is None:
+                self._apply(latest)
+                return
+            if item:
+                job_id, progress, message = item
+                latest[job_id] = (progress, message)
+            now = time.monotonic()
+            if latest and now >= next_flush:
+                self._apply(latest)
+                next_flush = now + self._interval
+
+    def _apply(self, latest: dict[str, tuple[float, str]]) -> None:
+        for job_id, (progress, message) in latest.items():
+            try:
+                self._job_service.record_progress(job_id, progress, message)
+            except Exception:
+                logger.exception("Applying progress for job_id=%s failed", job_id)
+        latest.clear()
+
+
+def _worker_main(
+    connection: Connection,
+    handlers: Mapping[str, JobHandler],
+    initializer: Callable[[], None] | None,
+    max_jobs: int | None,
+    progress_interval: float = 0.0,
+) -> None:
+    """Worker process loop: run tasks sent by `ProcessWorkers` until told to stop or recycled."""
+    init_process_worker(handlers, initializer, connection, progress_interval)
+    served = 0
+    while not max_jobs or served < max_jobs:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        job_id, job_type, handler, payload = task
+        try:
+            if handler is None:
+                result = run_registered_job(job_id, job_type, payload)
+            else:
+                result = run_process_job(job_id, handler, payload)
+            reply = ("done", job_id, True, result)
+        except Exception as exc:
+            reply = ("done", job_id, False, exc)
+        try:
+            connection.send(reply)
+        except Exception as exc:
+            connection.send(("done", job_id, False, RuntimeError(f"Job outcome could not be pickled: {exc!r}")))
+        served += 1
+
+
+class _Worker:
+    __slots__ = ("process", "connection", "job_id", "served", "killed")
+
+    def __init__(self, process: multiprocessing.process.BaseProcess, connection: Connection) -> None:
+        self.process = process
+        self.connection = connection
+        self.job_id: str | None = None
+        self.served = 0
+        self.killed = False
+
+
+class ProcessWorkers:
+    """
+    Supervised worker processes for PROCESS jobs: warm handlers, live progress, hard kill.
+
+    With `warm=True` the picklable handlers registered before construction
+    are installed in each worker by `init_process_worker` and resolved by
+    job_type; other job types fall back to shipping the handler with every
+    job. Each worker talks to the parent over its own pipe, so `kill(job_id)`
+    can terminate just the process running that job and start a fresh one
+    without disturbing other jobs. Handlers get a `ProcessJobContext` that
+    sends at most `progress_updates_per_second` updates per job, which a
+    `ProgressRelay` coalesces again across jobs. `max_jobs_per_worker`
+    recycles a worker after that many jobs.
+    """
+
+    def __init__(
+        self,
+        registry: JobRegistry,
+        job_service: JobService,
+        max_workers: int,
+        *,
+        warm: bool = True,
+        max_jobs_per_worker: int | None = None,
+        initializer: Callable[[], None] | None = None,
+        progress_updates_per_second: float = 10.0,
+    ) -> None:
+        self._registry = registry
+        self._handlers = _picklable(registry.handlers()) if warm else {}
+        self._initializer = initializer
+        self._max_jobs_per_worker = max_jobs_per_worker
+        self._progress_interval = 1.0 / progress_updates_per_second
+        self._context = multiprocessing.get_context()
+
+        self._lock = threading.Lock()
+        self._workers: list[_Worker] = []
+        self._idle: deque[_Worker] = deque()
+        self._backlog: deque[tuple[JobRecord, Future[dict[str, Any]]]] = deque()
+        self._futures: dict[str, Future[dict[str, Any]]] = {}
+        self._closing = False
+
+        self._progress: Queue[Any] = Queue()
+        self._relay = ProgressRelay(self._progress, job_service, progress_updates_per_second)
+        for _ in range(max_workers):
+            self._spawn()
+        self._supervisor = threading.Thread(target=self._supervise, name="process-worker-supervisor", daemon=True)
+        self._supervisor.start()
+
+    def submit(self, job: JobRecord) -> Future[dict[str, Any]]:
+        future: Future[dict[str, Any]] = Future()
+        future.set_running_or_notify_cancel()
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("ProcessWorkers is shut down")
+            self._backlog.append((job, future))
+            self._futures[job.job_id] = future
+            self._assign()
+        return future
+
+    def kill(self, job_id: str) -> bool:
+        """Stop `job_id` now: its worker is killed and replaced, its future fails with `JobCancelledError`."""
+        with self._lock:
+            for worker in self._workers:
+                if worker.job_id == job_id:
+                    worker.killed = True
+                    worker.process.kill()
+                    return True
+            for entry in self._backlog:
+                if entry[0].job_id == job_id:
+                    self._backlog.remove(entry)
+                    future = self._futures.pop(job_id)
+                    break
+            else:
+                return False
+        future.set_exception(JobCancelledError(f"Job {job_id} was stopped before it started"))
+        return True
+
+    def shutdown(self) -> None:
+        """Wait for submitted jobs, then stop the workers and the progress relay."""
+        with self._lock:
+            self._closing = True
+            pending = list(self._futures.values())
+        for future in pending:
+            future.exception()
+        with self._lock:
+            for worker in self._workers:
+                try:
+                    worker.connection.send(None)
+                except OSError:
+                    pass
+        self._supervisor.join(timeout=5.0)
+        self._relay.close()
+
+    def _spawn(self) -> None:
+        connection, child_connection = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                child_connection,
+                self._handlers,
+                self._initializer,
+                self._max_jobs_per_worker,
+                self._progress_interval,
+            ),
+            name="quantlab-process-worker",
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        worker = _Worker(process, connection)
+        self._workers.append(worker)
+        self._idle.append(worker)
+
+    def _assign(self) -> None:
+        """Send backlog jobs to idle workers; caller holds `_lock`."""
+        while self._backlog and self._idle:
+            job, future = self._backlog.popleft()
+            worker = self._idle.popleft()
+            try:
+                handler = None if job.job_type in self._handlers else self._registry.get(job.job_type)
+                worker.connection.send((job.job_id, job.job_type, handler, job.payload))
+            except Exception as exc:
+                self._idle.appendleft(worker)
+                self._futures.pop(job.job_id, None)
+                future.set_exception(exc)
+                continue
+            worker.job_id = job.job_id
+
+    def _supervise(self) -> None:
+        while True:
+            with self._lock:
+                if self._closing and not self._workers:
+                    return
+                by_connection = {worker.connection: worker for worker in self._workers}
+                by_sentinel = {worker.process.sentinel: worker for worker in self._workers}
+            ready = wait([*by_connection, *by_sentinel])
+            for connection in ready:
+                if connection in by_connection:
+                    self._receive(by_connection[connection])
+            for sentinel in ready:
+                if sentinel in by_sentinel:
+                    self._retire(by_sentinel[sentinel])
+
+    def _receive(self, worker: _Worker) -> bool:
+        """Handle one message from `worker`; False once its pipe is closed."""
+        try:
+            message = worker.connection.recv()
+        except (EOFError, OSError):
+            return False  # the worker died; its sentinel reports it
+        except Exception as exc:
+            message = ("done", worker.job_id, False, RuntimeError(f"Job outcome could not be unpickled: {exc!r}"))
+        if message[0] == "progress":
+            self._progress.put(message[1:])
+            return True
+
+        _, job_id, ok, value = message
+        with self._lock:
+            future = self._futures.pop(job_id, None)
+            worker.job_id = None
+            worker.served += 1
+            if not (self._max_jobs_per_worker and worker.served >= self._max_jobs_per_worker):
+                self._idle.append(worker)
+                self._assign()
+        if future is not None:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        return True
+
+    def _retire(self, worker: _Worker) -> None:
+        # a recycled worker's last result may still be buffered
+        while worker.connection.poll() and self._receive(worker):
+            pass
+        worker.process.join()
+        worker.connection.close()
+        with self._lock:
+            self._workers.remove(worker)
+            if worker in self._idle:
+                self._idle.remove(worker)
+            future = self._futures.pop(worker.job_id, None) if worker.job_id is not None else None
+            if not self._closing:
+                self._spawn()
+                self._assign()
+        if future is not None:
+            if worker.killed:
+                future.set_exception(JobCancelledError(f"Job {worker.job_id} was stopped"))
+            else:
+                future.set_exception(
+                    RuntimeError(f"Process worker pid={worker.process.pid} exited with code {worker.process.exitcode}")
+                )
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from quantlab.app.services.job_service import JobService
+from quantlab.core.interfaces import JobRepository
+from quantlab.core.jobs import JobRecord, JobStatus
+
+logger = logging.getLogger("quantlab.workers")
+
+
+@dataclass(slots=True)
+class _Tracked:
+    deadline: float | None
+    kill: Callable[[str], object] | None
+
+
+class JobReaper:
+    """
+    Enforces job timeouts and stops running jobs that were cancelled.
+
+    Pools `track()` each job they start and `untrack()` it when it finishes.
+    Every `interval` seconds the reaper marks jobs past their `timeout` as
+    TIMED_OUT, then calls `kill(job_id)` for tracked jobs that are no longer
+    RUNNING in the repository (cancelled, timed out, or changed by another
+    process sharing the repository), so their worker slot comes back
+    quickly. Thread jobs have no `kill`; they stop at their next
+    `ctx.check_cancelled()`.
+    """
+
+    def __init__(self, repo: JobRepository, job_service: JobService, interval: float = 0.25) -> None:
+        self._repo = repo
+        self._job_service = job_service
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._tracked: dict[str, _Tracked] = {}
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="job-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def track(self, job: JobRecord, kill: Callable[[str], object] | None = None) -> None:
+        deadline = None if job.timeout is None else time.monotonic() + job.timeout
+        with self._lock:
+            self._tracked[job.job_id] = _Tracked(deadline=deadline, kill=kill)
+
+    def untrack(self, job_id: str) -> None:
+        with self._lock:
+            self._tracked.pop(job_id, None)
+
+    def reap(self) -> list[str]:
+        """Run one pass; returns the ids of jobs that were stopped."""
+        with self._lock:
+            tracked = dict(self._tracked)
+        if not tracked:
+            return []
+
+        now = time.monotonic()
+        for job_id, entry in tracked.items():
+            if entry.deadline is not None and now >= entry.deadline:
+                self._job_service.mark_timed_out(job_id)
+
+        jobs = self._repo.get_many(tracked)
+        reaped: list[str] = []
+        for job_id, entry in tracked.items():
+            job = jobs.get(job_id)
+            if job is not None and job.status is JobStatus.RUNNING:
+                continue
+            with self._lock:
+                if self._tracked.pop(job_id, None) is None:
+                    continue  # finished on its own meanwhile
+            reaped.append(job_id)
+            if entry.kill is not None:
+                try:
+                    entry.kill(job_id)
+                except Exception:
+                    logger.exception("Killing job_id=%s failed", job_id)
+        return reaped
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.reap()
+            except Exception:
+                logger.exception("Job reaper pass failed")
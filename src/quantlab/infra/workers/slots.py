@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+
+
+class WorkerSlots:
+    """Counts free executor slots so dispatchers only dequeue what they can run."""
+
+    def __init__(self, capacity: int) -> None:
+        self._free = capacity
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def wait_free(self) -> int:
+        """Block until at least one slot is free; returns the count, or 0 once closed."""
+        with self._condition:
+            while not self._closed and self._free == 0:
+                self._condition.wait()
+            return 0 if self._closed else self._free
+
+    def claim(self) -> bool:
+        with self._condition:
+            while not self._closed and self._free == 0:
+                self._condition.wait()
+            if self._closed:
+                return False
+            self._free -= 1
+            return True
+
+    def release(self) -> None:
+        with self._condition:
+            self._free += 1
+            self._condition.notify_all()
+
+    def open(self) -> None:
+        with self._condition:
+            self._closed = False
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
@@ -5,6 +5,9 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import Final
 
 from quantlab.core.interfaces import JobQueue, JobRunner, WorkerPool
+from quantlab.infra.metrics import MetricsRegistry
+from quantlab.infra.workers.metrics import WorkerPoolMetrics
+from quantlab.infra.workers.slots import WorkerSlots
 
 
 class ThreadPoolWorkerPool(WorkerPool):
@@ -14,21 +17,25 @@ class ThreadPoolWorkerPool(WorkerPool):
         job_runner: JobRunner,
         max_workers: int = 4,
         poll_timeout: float = 0.5,
+        metrics: MetricsRegistry | None = None,
     ) -> None:
         self._queue = queue
         self._job_runner = job_runner
         self._max_workers: Final[int] = max_workers
         self._poll_timeout = poll_timeout
+        self._metrics = WorkerPoolMetrics(metrics, "thread", max_workers) if metrics else None
 
         self._executor: ThreadPoolExecutor | None = None
         self._dispatcher_thread: threading.Thread | None = None
         self._stop_event = threading.Event()
+        self._slots = WorkerSlots(max_workers)
 
     def start(self) -> None:
         if self._executor is not None:
             return
 
         self._stop_event.clear()
+        self._slots.open()
         self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
         self._dispatcher_thread = threading.Thread(
             target=self._dispatch_loop,
@@ -39,6 +46,8 @@ class ThreadPoolWorkerPool(WorkerPool):
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._slots.close()
+        self._queue.close()
 
         if self._dispatcher_thread is not None:
             self._dispatcher_thread.join(timeout=2.0)
@@ -50,11 +59,31 @@ class ThreadPoolWorkerPool(WorkerPool):
 
     def _dispatch_loop(self) -> None:
         while not self._stop_event.is_set():
-            job_id = self._queue.get(timeout=self._poll_timeout)
-            if job_id is None:
+            free = self._slots.wait_free()
+            if free == 0:
+                continue
+            job_ids = self._queue.get_many(free)
+            if not job_ids:
+                # only reached when the queue was closed by another owner
+                self._stop_event.wait(self._poll_timeout)
                 continue
             assert self._executor is not None
-            self._executor.submit(self._run_one, job_id)
+            for position, job_id in enumerate(job_ids):
+                if not self._slots.claim():
+                    # stopping: hand undispatched jobs back so they are not lost
+                    for remaining in job_ids[position:]:
+                        self._queue.task_done(remaining)
+                        self._queue.put(remaining)
+                    return
+                if self._metrics is not None:
+                    self._metrics.job_started()
+                self._executor.submit(self._run_one, job_id)
 
     def _run_one(self, job_id: str) -> None:
-        self._job_runner.run(job_id)
+        try:
+            self._job_runner.run(job_id)
+        finally:
+            if self._metrics is not None:
+                self._metrics.job_finished()
+            self._slots.release()
+            self._queue.task_done(job_id)
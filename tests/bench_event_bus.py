@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from quantlab.core.events import DomainEvent
+from quantlab.domain.events import MarketDataArrived
+from quantlab.infra.bus import (
+    BusMiddleware,
+    ExceptionMiddleware,
+    InMemoryEventBus,
+    SubscriptionRegistry,
+)
+from quantlab.infra.bus.middleware import NextCallable
+
+
+class PassThroughMiddleware(BusMiddleware):
+    def __call__(self, event: DomainEvent, next_call: NextCallable) -> None:
+        next_call(event)
+
+
+class LegacyEventBus:
+    """Per-publish closure chain, as InMemoryEventBus worked before pipeline caching."""
+
+    def __init__(self, registry: SubscriptionRegistry, middlewares: list[BusMiddleware]) -> None:
+        self._registry = registry
+        self._middlewares = middlewares
+
+    def subscribe(self, event_type, handler) -> None:
+        self._registry.subscribe(event_type, handler)
+
+    def publish(self, event: DomainEvent) -> None:
+        handlers = self._registry.get_handlers(event.event_type)
+        handlers.extend(self._registry.get_handlers("*"))
+
+        def dispatch(evt: DomainEvent) -> None:
+            for handler in handlers:
+                handler(evt)
+
+        pipeline: Callable[[DomainEvent], None] = dispatch
+
+        for middleware in reversed(self._middlewares):
+            next_call = pipeline
+
+            def wrapper(
+                evt: DomainEvent,
+                mw: BusMiddleware = middleware,
+                nxt: Callable[[DomainEvent], None] = next_call,
+            ) -> None:
+                mw(evt, nxt)
+
+            pipeline = wrapper
+
+        pipeline(event)
+
+
+def _middlewares() -> list[BusMiddleware]:
+    return [ExceptionMiddleware(), PassThroughMiddleware(), PassThroughMiddleware()]
+
+
+def _events(n: int) -> list[MarketDataArrived]:
+    now = datetime.now(UTC)
+    return [
+        MarketDataArrived(symbol="BTCUSDT", timestamp=now, last_price=100.0 + i, volume=1.0)
+        for i in range(n)
+    ]
+
+
+def _measure(bus, events: list[MarketDataArrived]) -> float:
+    counter = [0]
+
+    def handler(event: DomainEvent) -> None:
+        counter[0] += 1
+
+    bus.subscribe(MarketDataArrived, handler)
+    bus.subscribe("*", handler)
+
+    start = time.perf_counter()
+    for event in events:
+        bus.publish(event)
+    elapsed = time.perf_counter() - start
+    assert counter[0] == 2 * len(events)
+    return len(events) / elapsed
+
+
+def main(n: int = 200_000) -> None:
+    events = _events(n)
+    before = _measure(LegacyEventBus(SubscriptionRegistry(), _middlewares()), events)
+    after = _measure(InMemoryEventBus(SubscriptionRegistry(), _middlewares()), events)
+    print(f"events={n} middlewares=3 handlers=2")
+    print(f"before (per-publish closures): {before:,.0f} events/sec")
+    print(f"after  (cached pipelines):     {after:,.0f} events/sec")
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from quantlab.core.event_log import LoggedEvent
+from quantlab.infra.event_log import Durability, JsonlEventLog
+
+
+def _events(n: int) -> list[LoggedEvent]:
+    return [
+        LoggedEvent.create(
+            sequence=index + 1,
+            event_type="market_data.arrived",
+            payload={"symbol": "BTCUSDT", "last_price": 100.0 + index, "volume": 1.5},
+            source="bench",
+        )
+        for index in range(n)
+    ]
+
+
+def _legacy_append(path: Path, event: LoggedEvent) -> None:
+    """Open/asdict/dumps/close per event, as JsonlEventLog.append worked before group commit."""
+    data = asdict(event)
+    data["occurred_at"] = event.occurred_at.isoformat()
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+
+def _rate(n: int, seconds: float) -> str:
+    return f"{n / seconds:>12,.0f} events/sec"
+
+
+def main(n: int = 200_000) -> None:
+    events = _events(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        legacy_n = min(n, 20_000)
+        start = time.perf_counter()
+        for event in events[:legacy_n]:
+            _legacy_append(root / "legacy.jsonl", event)
+        print(f"legacy open/close per event:   {_rate(legacy_n, time.perf_counter() - start)}")
+
+        for durability in (Durability.NONE, Durability.BATCH):
+            log = JsonlEventLog(root / f"append-{durability.value}.jsonl", durability=durability)
+            start = time.perf_counter()
+            for event in events:
+                log.append(event)
+            log.close()
+            print(f"append durability={durability.value:<6}      {_rate(n, time.perf_counter() - start)}")
+
+            log = JsonlEventLog(root / f"many-{durability.value}.jsonl", durability=durability)
+            start = time.perf_counter()
+            for offset in range(0, n, 10_000):
+                log.append_many(events[offset : offset + 10_000])
+            log.close()
+            print(f"append_many durability={durability.value:<6} {_rate(n, time.perf_counter() - start)}")
+
+        event_n = min(n, 2_000)
+        log = JsonlEventLog(root / "event.jsonl", durability=Durability.EVENT)
+        start = time.perf_counter()
+        for event in events[:event_n]:
+            log.append(event)
+        log.close()
+        print(f"append durability=event       {_rate(event_n, time.perf_counter() - start)}")
+
+
+if __name__ == "__main__":
+    main()
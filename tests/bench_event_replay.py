@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+
+from quantlab.core.event_log import LoggedEvent
+from quantlab.infra.event_log import BinaryEventLog, EventReplayer, JsonlEventLog, convert_jsonl_to_binary
+
+EVENT_TYPES = ("market_data.arrived", "feature.calculated", "signal.generated", "order.filled")
+
+
+def _events(n: int) -> list[LoggedEvent]:
+    return [
+        LoggedEvent.create(
+            sequence=index + 1,
+            event_type=EVENT_TYPES[index % len(EVENT_TYPES)],
+            payload={"symbol": "BTCUSDT", "last_price": 100.0 + index, "volume": 1.5, "venue": "binance"},
+            source="bench",
+            correlation_id=f"corr-{index % 16}",
+        )
+        for index in range(n)
+    ]
+
+
+def _replay(log, event_types=None) -> float:
+    seen = [0]
+
+    def handler(event: LoggedEvent) -> None:
+        seen[0] += 1
+
+    start = time.perf_counter()
+    EventReplayer(log).replay(handler, event_types=event_types)
+    return time.perf_counter() - start
+
+
+def main(n: int = 200_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        with JsonlEventLog(root / "events.jsonl", durability="none") as jsonl:
+            jsonl.append_many(_events(n))
+        convert_jsonl_to_binary(root / "events.jsonl", root / "events.qlog")
+
+        jsonl = JsonlEventLog(root / "events.jsonl", flush_interval=None)
+        binary = BinaryEventLog(root / "events.qlog", flush_interval=None)
+        sizes = {"jsonl": (root / "events.jsonl").stat().st_size, "binary": (root / "events.qlog").stat().st_size}
+        print(f"events={n} size jsonl={sizes['jsonl'] / 1e6:.1f}MB binary={sizes['binary'] / 1e6:.1f}MB")
+
+        for label, event_types in (("all events", None), ("1 of 4 types", {"order.filled"})):
+            jsonl_seconds = _replay(jsonl, event_types)
+            binary_seconds = _replay(binary, event_types)
+            print(
+                f"{label:<13} jsonl={n / jsonl_seconds:>10,.0f} ev/s "
+                f"binary={n / binary_seconds:>10,.0f} ev/s "
+                f"speedup={jsonl_seconds / binary_seconds:.2f}x"
+            )
+        jsonl.close()
+        binary.close()
+
+
+if __name__ == "__main__":
+    main()
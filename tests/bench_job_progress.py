@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+
+from quantlab.app.events import JobProgressed
+from quantlab.app.services.job_runner import DefaultJobRunner
+from quantlab.app.services.job_service import JobService
+from quantlab.core.jobs import JobSpec
+from quantlab.infra.bus.in_memory import InMemoryEventBus
+from quantlab.infra.jobs.in_memory import InMemoryJobRegistry, InMemoryJobRepository
+from quantlab.infra.queue.in_memory import InMemoryJobQueue
+
+
+def _run(calls: int, **throttle) -> tuple[float, int]:
+    bus = InMemoryEventBus()
+    published = [0]
+    bus.subscribe(JobProgressed, lambda event: published.__setitem__(0, published[0] + 1))
+    service = JobService(repo=InMemoryJobRepository(), queue=InMemoryJobQueue(), bus=bus, **throttle)
+    registry = InMemoryJobRegistry()
+
+    def per_row(payload: dict, ctx) -> dict:
+        rows = payload["rows"]
+        for row in range(rows):
+            ctx.set_progress((row + 1) / rows, "scanning rows")
+        return {"rows": rows}
+
+    registry.register("compute.factor", per_row)
+    job_id = service.submit(JobSpec(job_type="compute.factor", payload={"rows": calls})).job_id
+    start = time.perf_counter()
+    DefaultJobRunner(registry=registry, job_service=service).run(job_id)
+    return time.perf_counter() - start, published[0]
+
+
+def main(calls: int = 1_000_000) -> None:
+    for label, throttle in (
+        ("unthrottled", {}),
+        ("throttled", {"progress_min_interval": 0.1, "progress_min_delta": 0.001}),
+    ):
+        seconds, published = _run(calls, **throttle)
+        print(
+            f"{label:<12} set_progress={calls:,} elapsed={seconds:.2f}s "
+            f"({calls / seconds:>12,.0f} calls/s) JobProgressed={published:,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
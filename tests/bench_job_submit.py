@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from quantlab.app.services.job_service import JobService
+from quantlab.core.interfaces import JobRepository
+from quantlab.core.jobs import JobSpec
+from quantlab.infra.bus.in_memory import InMemoryEventBus
+from quantlab.infra.jobs.in_memory import InMemoryJobRepository
+from quantlab.infra.jobs.sqlite import SqliteJobRepository
+from quantlab.infra.queue.in_memory import InMemoryJobQueue
+
+
+def _run(repo: JobRepository, threads: int, submits_per_thread: int) -> float:
+    service = JobService(repo=repo, queue=InMemoryJobQueue(), bus=InMemoryEventBus())
+    barrier = threading.Barrier(threads)
+    spec = JobSpec(job_type="download.market_data", payload={"symbol": "BTCUSDT"}, dedupe_key="download:BTCUSDT")
+
+    def hammer() -> None:
+        barrier.wait()
+        for _ in range(submits_per_thread):
+            service.submit(spec)
+
+    workers = [threading.Thread(target=hammer) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main(threads: int = 8, submits_per_thread: int = 2_500) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for repo in (
+            InMemoryJobRepository(),
+            SqliteJobRepository(Path(directory) / "jobs.sqlite3", flush_interval=None),
+        ):
+            seconds = _run(repo, threads, submits_per_thread)
+            submits = threads * submits_per_thread
+            print(
+                f"{type(repo).__name__:<24} submits={submits:,} threads={threads} elapsed={seconds:.2f}s "
+                f"({submits / seconds:>10,.0f} contended submits/s)"
+            )
+            if isinstance(repo, SqliteJobRepository):
+                repo.close()
+
+
+if __name__ == "__main__":
+    main()
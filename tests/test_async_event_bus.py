@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import pytest
+
+from quantlab.app.bootstrap import build_bus
+from quantlab.app.events import JobProgressed
+from quantlab.config.models import RuntimeSettings
+from quantlab.core.events import DomainEvent
+from quantlab.infra.bus import AsyncEventBus, BackpressurePolicy, InMemoryEventBus
+
+
+def _progress(job_id: str, progress: float) -> JobProgressed:
+    return JobProgressed(job_id=job_id, progress=progress)
+
+
+def test_slow_subscriber_does_not_block_publisher() -> None:
+    bus = AsyncEventBus()
+    release = threading.Event()
+    fast: list[float] = []
+
+    def slow(event: DomainEvent) -> None:
+        release.wait(5.0)
+
+    bus.subscribe("*", slow)
+    bus.subscribe(JobProgressed, lambda event: fast.append(event.progress))
+    try:
+        start = time.monotonic()
+        for step in range(10):
+            bus.publish(_progress("job-1", step / 10))
+        assert time.monotonic() - start < 1.0
+
+        release.set()
+        assert bus.flush(timeout=5.0)
+        assert fast == [step / 10 for step in range(10)]
+    finally:
+        release.set()
+        bus.close()
+
+
+def test_drop_oldest_and_coalesce_latest_policies() -> None:
+    bus = AsyncEventBus(capacity=2)
+    gate = threading.Event()
+    dropped: list[float] = []
+    coalesced: list[tuple[str, float]] = []
+
+    def blocked_drop(event: DomainEvent) -> None:
+        gate.wait(5.0)
+        dropped.append(event.progress)
+
+    def blocked_coalesce(event: DomainEvent) -> None:
+        gate.wait(5.0)
+        coalesced.append((event.job_id, event.progress))
+
+    bus.subscribe(JobProgressed, blocked_drop, policy=BackpressurePolicy.DROP_OLDEST)
+    bus.subscribe(JobProgressed, blocked_coalesce, policy="coalesce_latest")
+    try:
+        bus.publish(_progress("a", 0.0))
+        time.sleep(0.1)  # let both lanes pick up the first event and park on the gate
+        for progress in (0.1, 0.2, 0.3, 0.4):
+            bus.publish(_progress("a", progress))
+        bus.publish(_progress("b", 0.5))
+
+        gate.set()
+        assert bus.flush(timeout=5.0)
+        assert dropped == [0.0, 0.4, 0.5]
+        assert coalesced == [("a", 0.0), ("a", 0.4), ("b", 0.5)]
+
+        stats = {stat.policy: stat for stat in bus.lane_stats()}
+        assert stats["drop_oldest"].dropped == 3
+        assert stats["drop_oldest"].max_depth == 2
+        assert stats["coalesce_latest"].coalesced == 3
+        assert stats["coalesce_latest"].depth == 0
+    finally:
+        gate.set()
+        bus.close()
+
+
+def test_handler_errors_are_counted_logged_and_lane_keeps_running(caplog: pytest.LogCaptureFixture) -> None:
+    bus = AsyncEventBus()
+    seen: list[float] = []
+
+    def flaky(event: DomainEvent) -> None:
+        if event.progress < 0.5:
+            raise RuntimeError("boom")
+        seen.append(event.progress)
+
+    bus.subscribe(JobProgressed, flaky)
+    try:
+        bus.publish(_progress("a", 0.1))
+        bus.publish(_progress("a", 0.9))
+        assert bus.flush(timeout=5.0)
+        [stats] = bus.lane_stats()
+        assert (stats.failed, stats.delivered) == (1, 1)
+        assert seen == [0.9]
+        [record] = [record for record in caplog.records if record.name == "quantlab.eventbus"]
+        assert record.levelno == logging.ERROR
+        assert stats.name in record.getMessage()
+        assert record.exc_info is not None and "boom" in str(record.exc_info[1])
+    finally:
+        bus.close()
+
+
+def test_build_bus_selects_implementation_from_settings() -> None:
+    assert isinstance(build_bus(), InMemoryEventBus)
+    bus = build_bus(RuntimeSettings(event_bus="async", bus_backpressure="drop_oldest"))
+    try:
+        assert isinstance(bus, AsyncEventBus)
+    finally:
+        bus.close()
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import subprocess
+import sys
+import threading
 import time
 
 from quantlab.app.bootstrap import build_async_task_runtime
-from quantlab.app.events import JobQueued
+from quantlab.app.events import JobCancelled, JobProgressed, JobQueued, JobSucceeded
+from quantlab.app.services.job_runner import DefaultJobRunner
 from quantlab.app.services.job_service import JobService
-from quantlab.config.models import QuantLabSettings, RuntimeSettings
-from quantlab.core.jobs import JobExecutionMode, JobSpec
+from quantlab.config.models import QuantLabSettings, RuntimeSettings, StorageSettings
+from quantlab.core.jobs import JobExecutionMode, JobRecord, JobSpec, JobStatus
 from quantlab.domain.events import MarketDataDownloadRequested
 from quantlab.infra.bus.in_memory import InMemoryEventBus
-from quantlab.infra.jobs.in_memory import InMemoryJobRepository
+from quantlab.infra.jobs.in_memory import InMemoryJobRegistry, InMemoryJobRepository
+from quantlab.infra.jobs.sqlite import SqliteJobRepository
 from quantlab.infra.queue.in_memory import InMemoryJobQueue
 
 
@@ -78,6 +83,99 @@ def test_job_service_deduplicates_active_jobs() -> None:
     assert second.status == "queued"
 
 
+def test_progress_is_throttled_and_final_value_lands_before_success() -> None:
+    bus = InMemoryEventBus()
+    events: list = []
+    bus.subscribe(JobProgressed, events.append)
+    bus.subscribe(JobSucceeded, events.append)
+    service = JobService(
+        repo=InMemoryJobRepository(),
+        queue=InMemoryJobQueue(),
+        bus=bus,
+        progress_min_interval=60.0,
+        progress_min_delta=0.01,
+    )
+    registry = InMemoryJobRegistry()
+
+    def per_row(payload: dict, ctx) -> dict:
+        for row in range(10_000):
+            ctx.set_progress(row / 10_000, f"row {row}")
+        ctx.set_progress(0.995, "tail")
+        return {}
+
+    registry.register("compute.factor", per_row)
+    job_id = service.submit(JobSpec(job_type="compute.factor", payload={})).job_id
+    DefaultJobRunner(registry=registry, job_service=service).run(job_id)
+
+    assert [type(event) for event in events] == [JobProgressed, JobProgressed, JobSucceeded]
+    assert (events[0].progress, events[0].message) == (0.0, "row 0")
+    assert (events[1].progress, events[1].message) == (0.995, "tail")
+
+
+def test_message_change_is_emitted_once_the_interval_passes() -> None:
+    bus = InMemoryEventBus()
+    events: list[JobProgressed] = []
+    bus.subscribe(JobProgressed, events.append)
+    service = JobService(
+        repo=InMemoryJobRepository(),
+        queue=InMemoryJobQueue(),
+        bus=bus,
+        progress_min_interval=0.05,
+        progress_min_delta=0.5,
+    )
+    job_id = service.submit(JobSpec(job_type="compute.factor", payload={})).job_id
+    ctx = service.build_context(job_id)
+
+    ctx.set_progress(0.0, "loading")
+    ctx.set_progress(0.01, "fitting")  # within the interval: held back
+    time.sleep(0.06)
+    ctx.set_progress(0.02, "fitting")  # small move, but a new message
+    time.sleep(0.06)
+    ctx.set_progress(0.03, "fitting")  # small move, same message: held back
+
+    assert [(event.progress, event.message) for event in events] == [(0.0, "loading"), (0.02, "fitting")]
+
+
+class _CancelDuringProgressRepository(InMemoryJobRepository):
+    """Cancels the job from another thread while a progress update is between its read and its write."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.service: JobService | None = None
+        self.armed = False
+
+    def get(self, job_id: str):
+        job = super().get(job_id)
+        if self.armed:
+            self.armed = False
+            canceller = threading.Thread(target=self.service.cancel, args=(job_id,))
+            canceller.start()
+            canceller.join(timeout=0.2)
+        return job
+
+
+def test_progress_cannot_resurrect_a_job_cancelled_meanwhile() -> None:
+    repo = _CancelDuringProgressRepository()
+    bus = InMemoryEventBus()
+    cancelled: list[JobCancelled] = []
+    bus.subscribe(JobCancelled, cancelled.append)
+    service = JobService(repo=repo, queue=InMemoryJobQueue(), bus=bus)
+    repo.service = service
+    job_id = service.submit(JobSpec(job_type="compute.factor", payload={})).job_id
+    service.mark_running(job_id)
+    ctx = service.build_context(job_id)
+
+    repo.armed = True
+    ctx.set_progress(0.5, "halfway")
+    deadline = time.monotonic() + 5.0
+    while not cancelled:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    assert service.get_job(job_id).status == JobStatus.CANCELLED
+    assert ctx.is_cancelled()
+
+
 def test_domain_event_can_enqueue_and_complete_thread_job() -> None:
     queued_job_ids: list[str] = []
     runtime = build_async_task_runtime(
@@ -152,8 +250,57 @@ def test_runtime_routes_process_jobs_to_process_pool() -> None:
         runtime.stop()
 
 
+def test_sqlite_job_store_requeues_incomplete_jobs_on_restart(tmp_path) -> None:
+    store = tmp_path / "jobs.sqlite3"
+    with SqliteJobRepository(store, flush_interval=None) as repo:
+        orphaned = JobRecord.create(
+            JobSpec(
+                job_type="download.market_data",
+                payload={"symbol": "ETHUSDT", "start": "2026-02-01", "end": "2026-02-28"},
+            )
+        )
+        orphaned.status = JobStatus.RUNNING
+        repo.add(orphaned)
+
+    runtime = build_async_task_runtime(
+        QuantLabSettings(
+            storage=StorageSettings(job_store_path=store),
+            runtime=RuntimeSettings(
+                max_workers=1,
+                process_workers=0,
+                queue_poll_timeout=0.05,
+                job_store="sqlite",
+            ),
+        )
+    )
+    runtime.register_job_handler("download.market_data", thread_download_job)
+
+    runtime.start()
+    try:
+        status = _wait_for_terminal_status(runtime, orphaned.job_id)
+        assert status.status == "succeeded"
+    finally:
+        runtime.stop()
+
+    with SqliteJobRepository(store, flush_interval=None) as repo:
+        assert repo.get(orphaned.job_id).status == JobStatus.SUCCEEDED
+
+
 if __name__ == "__main__":
     test_job_service_deduplicates_active_jobs()
     test_domain_event_can_enqueue_and_complete_thread_job()
     test_runtime_routes_process_jobs_to_process_pool()
     print("manual tests passed")
+
+
+def test_app_services_import_without_infra_or_pyarrow() -> None:
+    # a fresh interpreter, since this one already imported infra for the other tests
+    script = (
+        "import sys\n"
+        "import quantlab.app.runtime, quantlab.app.services.job_service\n"
+        "print(sorted(m for m in sys.modules if m == 'pyarrow' or m.startswith('quantlab.infra')))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "[]"
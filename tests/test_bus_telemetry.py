@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from quantlab.app.events import JobProgressed, JobQueued
+from quantlab.core.events import DomainEvent
+from quantlab.infra.bus import (
+    EventRecord,
+    EventTelemetry,
+    EveryNthSampler,
+    InMemoryEventBus,
+    RateLimitSampler,
+    TelemetryMiddleware,
+    shared_telemetry,
+)
+from quantlab.infra.metrics import LatencyHistogram
+
+
+def test_latency_histogram_percentiles_are_within_bucket_precision() -> None:
+    histogram = LatencyHistogram()
+    for value in range(1, 10_001):
+        histogram.record(value * 1_000)
+
+    summary = histogram.summary()
+    assert summary.count == 10_000
+    assert summary.max_ms == pytest.approx(10.0)
+    assert summary.p50_ms == pytest.approx(5.0, rel=0.07)
+    assert summary.p99_ms == pytest.approx(9.9, rel=0.07)
+
+
+def test_telemetry_middleware_aggregates_latency_without_printing(capsys) -> None:
+    sunk: list[EventRecord] = []
+    telemetry = EventTelemetry(flush_interval=60.0, sink=sunk.extend)
+    bus = InMemoryEventBus(middlewares=[TelemetryMiddleware(telemetry)])
+    bus.subscribe(JobQueued, lambda event: None)
+
+    for index in range(5):
+        bus.publish(JobQueued(job_id=f"job-{index}"))
+    bus.publish_batch([JobProgressed(job_id="job-0", progress=0.5)] * 4)
+
+    summary = telemetry.latency_summary()
+    bus.close()
+
+    assert summary["job.queued"].count == 5
+    assert summary["job.progressed"].count == 4
+    assert [record.batch_size for record in sunk] == [1, 1, 1, 1, 1, 4]
+    assert capsys.readouterr().out == ""
+
+
+def test_telemetry_records_handler_errors() -> None:
+    telemetry = EventTelemetry(flush_interval=60.0, sink=None)
+    bus = InMemoryEventBus(middlewares=[TelemetryMiddleware(telemetry)])
+
+    def explode(event: DomainEvent) -> None:
+        raise ValueError("bad tick")
+
+    bus.subscribe(JobQueued, explode)
+    with pytest.raises(ValueError):
+        bus.publish(JobQueued(job_id="job-1"))
+
+    assert telemetry.error_counts() == {"job.queued": 1}
+    bus.close()
+
+
+def test_buses_share_one_lazily_started_telemetry_thread() -> None:
+    def drainers() -> int:
+        return sum(thread.name == "event-telemetry" for thread in threading.enumerate())
+
+    before = drainers()
+    idle = EventTelemetry(flush_interval=60.0, sink=None)
+    assert drainers() == before
+    idle.close()
+
+    buses = [InMemoryEventBus(middlewares=[TelemetryMiddleware()]) for _ in range(3)]
+    for bus in buses:
+        bus.subscribe(JobQueued, lambda event: None)
+        bus.publish(JobQueued(job_id="job-1"))
+        bus.close()
+
+    assert drainers() <= before + 1
+    assert shared_telemetry().latency_summary()["job.queued"].count >= 3
+
+
+def test_samplers() -> None:
+    every_third = EveryNthSampler(3)
+    assert [every_third("job.queued") for _ in range(6)] == [True, False, False, True, False, False]
+
+    limited = RateLimitSampler(per_second=2, overrides={"job.progressed": 0})
+    assert [limited("job.queued") for _ in range(4)] == [True, True, False, False]
+    assert limited("job.progressed") is False
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pickle
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+
+from quantlab.infra.storage import DatasetCatalog, LocalFileStore, ParquetStore
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _trades(symbol: str, days: int) -> pa.Table:
+    hours = days * 24
+    return pa.table(
+        {
+            "symbol": [symbol] * hours,
+            "timestamp": [START + timedelta(hours=hour) for hour in range(hours)],
+            "price": [float(hour) for hour in range(hours)],
+        }
+    )
+
+
+def test_partitioned_writes_are_recorded_and_prune_reads(tmp_path: Path) -> None:
+    catalog = DatasetCatalog(tmp_path / "catalog.sqlite3")
+    store = ParquetStore(tmp_path / "curated", catalog=catalog)
+    trades = store.dataset("trade")
+    trades.write(pa.concat_tables([_trades("BTCUSDT", 3), _trades("ETHUSDT", 3)]))
+
+    entries = catalog.files("trade")
+    assert len(entries) == 6
+    first = entries[0]
+    assert first.partition == {"symbol": "BTCUSDT", "frequency": "tick", "date": "2024-01-01"}
+    assert (first.num_rows, first.min_timestamp, first.max_timestamp) == (24, START, START + timedelta(hours=23))
+    assert first.size_bytes == Path(first.path).stat().st_size
+    assert len({entry.schema_hash for entry in entries}) == 1
+
+    day_two = catalog.files("trade", symbols=["ETHUSDT"], start=START + timedelta(days=1), end=START + timedelta(days=2))
+    assert [entry.partition["date"] for entry in day_two] == ["2024-01-02"]
+
+    table = trades.read(start=START + timedelta(days=1), end=START + timedelta(days=2))
+    assert table.num_rows == 48
+    assert set(table.column("symbol").to_pylist()) == {"BTCUSDT", "ETHUSDT"}
+
+    # after the first read, files written past the catalog wait for the next index_directory
+    ParquetStore(tmp_path / "curated").dataset("trade").write(_trades("SOLUSDT", 1))
+    assert trades.read().num_rows == 6 * 24
+    catalog.index_directory(trades.path, "trade")
+    assert trades.read().num_rows == 7 * 24
+
+
+def test_first_catalog_read_indexes_data_already_on_disk(tmp_path: Path) -> None:
+    ParquetStore(tmp_path).dataset("trade").write(pa.concat_tables([_trades("BTCUSDT", 1), _trades("ETHUSDT", 1)]))
+    (tmp_path / "trade" / "export.parquet").write_bytes(b"not part of the partition layout")
+
+    catalog = DatasetCatalog(":memory:")
+    trades = ParquetStore(tmp_path, catalog=catalog).dataset("trade")
+
+    assert trades.read().num_rows == ParquetStore(tmp_path).dataset("trade").read().num_rows == 48
+    assert trades.read(symbols=["ETHUSDT"]).num_rows == 24
+    assert len(catalog.files("trade")) == 2
+
+
+def test_overwrite_replaces_partition_entries(tmp_path: Path) -> None:
+    catalog = DatasetCatalog(tmp_path / "catalog.sqlite3")
+    trades = ParquetStore(tmp_path, catalog=catalog).dataset("trade")
+    trades.write(_trades("BTCUSDT", 1))
+    trades.write(_trades("BTCUSDT", 1))
+    assert [entry.num_rows for entry in catalog.files("trade")] == [24, 24]
+
+    trades.write(_trades("BTCUSDT", 1).slice(0, 12), mode="overwrite_partitions")
+
+    assert [entry.num_rows for entry in catalog.files("trade")] == [12]
+    assert trades.read().num_rows == 12
+
+
+def test_store_writes_and_backfill(tmp_path: Path) -> None:
+    catalog = DatasetCatalog(tmp_path / "catalog.sqlite3")
+    store = ParquetStore(tmp_path / "raw", catalog=catalog)
+    store.write_table("trades/BTCUSDT/2024-01.parquet", _trades("BTCUSDT", 1))
+    store.write_batches("trades/ETHUSDT/2024-01.parquet", _trades("ETHUSDT", 2).to_batches(max_chunksize=10))
+    LocalFileStore(tmp_path / "raw", catalog=catalog).write_bytes("archives/trades.zip", b"zip")
+
+    assert catalog.datasets() == ["archives", "trades"]
+    assert [entry.num_rows for entry in catalog.files("trades")] == [24, 48]
+    archive = catalog.files("archives")[0]
+    assert (archive.size_bytes, archive.num_rows, archive.min_timestamp) == (3, None, None)
+
+    ParquetStore(tmp_path / "raw").write_table("trades/SOLUSDT/2024-01.parquet", _trades("SOLUSDT", 1))
+    Path(catalog.files("trades")[0].path).unlink()
+    restored = pickle.loads(pickle.dumps(catalog))
+    assert restored.index_directory(tmp_path / "raw" / "trades", "trades") == 1
+    assert [Path(entry.path).parent.name for entry in restored.files("trades")] == ["ETHUSDT", "SOLUSDT"]
+    assert restored.index_directory(tmp_path / "raw" / "trades", "trades") == 0
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import multiprocessing
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+
+from quantlab.app.bootstrap import build_curated_store, build_query_engine
+from quantlab.config.models import QuantLabSettings, RuntimeSettings, StorageSettings
+from quantlab.infra.storage import DuckDBQueryEngine, ParquetStore
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _trades(symbol: str, minutes: int, price: float) -> pa.Table:
+    return pa.table(
+        {
+            "symbol": [symbol] * minutes,
+            "timestamp": [START + timedelta(minutes=minute) for minute in range(minutes)],
+            "price": [price + minute for minute in range(minutes)],
+            "quantity": [1.0] * minutes,
+        }
+    )
+
+
+def _warehouse(root: Path) -> Path:
+    store = ParquetStore(root)
+    store.dataset("trade").write(pa.concat_tables([_trades("BTCUSDT", 10, 100.0), _trades("ETHUSDT", 10, 10.0)]))
+    return root
+
+
+def test_views_query_and_resample_partitioned_trades(tmp_path: Path) -> None:
+    with DuckDBQueryEngine(_warehouse(tmp_path / "warehouse"), tmp_path / "quantlab.duckdb") as engine:
+        assert engine.views == ["trade"]
+
+        totals = engine.query(
+            "SELECT symbol, count(*) AS trades, sum(quantity) AS volume FROM trade "
+            "WHERE date = ? GROUP BY symbol ORDER BY symbol",
+            [START.date()],
+        )
+        assert totals.to_pylist() == [
+            {"symbol": "BTCUSDT", "trades": 10, "volume": 10.0},
+            {"symbol": "ETHUSDT", "trades": 10, "volume": 10.0},
+        ]
+
+        bars = engine.resample(
+            "trade", timedelta(minutes=5), symbols=["BTCUSDT"], start=START, volume="quantity"
+        )
+        assert bars.select(["symbol", "open", "high", "low", "close", "volume"]).to_pylist() == [
+            {"symbol": "BTCUSDT", "open": 100.0, "high": 104.0, "low": 100.0, "close": 104.0, "volume": 5.0},
+            {"symbol": "BTCUSDT", "open": 105.0, "high": 109.0, "low": 105.0, "close": 109.0, "volume": 5.0},
+        ]
+
+        batches = list(engine.stream("SELECT * FROM trade", batch_size=4))
+        assert sum(batch.num_rows for batch in batches) == 20
+
+
+def test_asof_join_attaches_latest_quote_per_symbol(tmp_path: Path) -> None:
+    quotes = pa.table(
+        {
+            "symbol": ["BTCUSDT", "BTCUSDT", "ETHUSDT"],
+            "timestamp": [START, START + timedelta(minutes=3), START + timedelta(minutes=5)],
+            "bid": [99.0, 102.0, 14.0],
+        }
+    )
+    with DuckDBQueryEngine(_warehouse(tmp_path)) as engine:
+        joined = engine.asof_join("trade", quotes).sort_by([("symbol", "ascending"), ("timestamp", "ascending")])
+
+    assert "bid" in joined.column_names and "date" in joined.column_names
+    assert joined.column("bid").to_pylist() == [99.0] * 3 + [102.0] * 7 + [None] * 5 + [14.0] * 5
+
+
+def test_threads_share_views_and_engine_pickles_as_configuration(tmp_path: Path) -> None:
+    engine = DuckDBQueryEngine(_warehouse(tmp_path), threads=2)
+    engine.register("limits", pa.table({"symbol": ["BTCUSDT"], "max_price": [105.0]}))
+
+    def count(symbol: str) -> int:
+        return engine.query("SELECT count(*) AS n FROM trade WHERE symbol = ?", [symbol]).column("n")[0].as_py()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(count, ["BTCUSDT", "ETHUSDT"] * 4)) == [10] * 8
+
+    copy = pickle.loads(pickle.dumps(engine))
+    assert copy.query("SELECT max(price) AS p FROM trade").column("p")[0].as_py() == 109.0
+    assert copy.query("SELECT current_setting('threads') AS t").column("t")[0].as_py() == 2
+    engine.close()
+    copy.close()
+
+
+def test_curated_store_and_query_engine_share_one_directory(tmp_path: Path) -> None:
+    settings = QuantLabSettings(
+        storage=StorageSettings(curated_data_dir=tmp_path / "curated", duckdb_path=tmp_path / "q.duckdb"),
+        runtime=RuntimeSettings(duckdb_threads=1),
+    )
+    store = build_curated_store(settings)
+    store.dataset("trade").write(_trades("BTCUSDT", 10, 100.0))
+    # a stray file outside the hive partitions must not break the view
+    store.write_batches("trade/export.parquet", _trades("ETHUSDT", 5, 10.0).to_batches())
+
+    with build_query_engine(settings) as engine:
+        assert engine.views == ["trade"]
+        assert engine.query("SELECT count(*) AS n FROM trade").column("n")[0].as_py() == 10
+    assert (tmp_path / "q.duckdb").exists()
+
+
+def _count_trades(engine: DuckDBQueryEngine, results) -> None:
+    results.put(engine.query("SELECT count(*) AS n FROM trade").column("n")[0].as_py())
+
+
+def test_forked_workers_inheriting_an_unused_engine_do_not_lock_the_database(tmp_path: Path) -> None:
+    engine = DuckDBQueryEngine(_warehouse(tmp_path / "curated"), tmp_path / "q.duckdb")
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    children = [context.Process(target=_count_trades, args=(engine, results)) for _ in range(2)]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join(timeout=30)
+
+    assert [child.exitcode for child in children] == [0, 0]
+    assert sorted(results.get(timeout=1) for _ in children) == [20, 20]
+    with engine:
+        assert engine.query("SELECT count(*) AS n FROM trade").column("n")[0].as_py() == 20
+    assert (tmp_path / "q.duckdb").exists()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from quantlab.core.events import DomainEvent
+from quantlab.domain.events import FeatureCalculated, MarketDataArrived, SignalGenerated
+from quantlab.domain.research.handlers.feature_handler import FeatureCalculationHandler
+from quantlab.domain.research.handlers.signal_handler import SignalGenerationHandler
+from quantlab.infra.bus import BusMiddleware, InMemoryEventBus, SubscriptionRegistry
+from quantlab.infra.bus.middleware import NextCallable
+
+
+class RecordingMiddleware(BusMiddleware):
+    def __init__(self, name: str, calls: list[str]) -> None:
+        self._name = name
+        self._calls = calls
+
+    def __call__(self, event: DomainEvent, next_call: NextCallable) -> None:
+        self._calls.append(self._name)
+        next_call(event)
+
+
+def _market_data(price: float = 100.0) -> MarketDataArrived:
+    return MarketDataArrived(
+        symbol="BTCUSDT",
+        timestamp=datetime(2026, 1, 1, tzinfo=UTC),
+        last_price=price,
+        volume=2.0,
+    )
+
+
+def test_publish_runs_middlewares_in_order_then_typed_and_wildcard_handlers() -> None:
+    calls: list[str] = []
+    bus = InMemoryEventBus(
+        middlewares=[RecordingMiddleware("outer", calls), RecordingMiddleware("inner", calls)]
+    )
+    bus.subscribe(MarketDataArrived, lambda event: calls.append("typed"))
+    bus.subscribe("*", lambda event: calls.append("wildcard"))
+
+    bus.publish(_market_data())
+
+    assert calls == ["outer", "inner", "typed", "wildcard"]
+
+
+def test_pipeline_is_reused_until_subscriptions_change() -> None:
+    registry = SubscriptionRegistry()
+    bus = InMemoryEventBus(registry=registry)
+    seen: list[str] = []
+    bus.subscribe(MarketDataArrived, lambda event: seen.append("first"))
+
+    bus.publish(_market_data())
+    compiled = bus._pipelines[MarketDataArrived.event_name()]
+    bus.publish(_market_data())
+    assert bus._pipelines[MarketDataArrived.event_name()] is compiled
+
+    registry.subscribe(MarketDataArrived, lambda event: seen.append("second"))
+    bus.publish(_market_data())
+
+    assert seen == ["first", "first", "first", "second"]
+
+
+def test_adding_middleware_invalidates_pipelines() -> None:
+    calls: list[str] = []
+    bus = InMemoryEventBus()
+    bus.subscribe(FeatureCalculated, lambda event: calls.append("handler"))
+    event = FeatureCalculated(
+        symbol="BTCUSDT",
+        timestamp=datetime(2026, 1, 1, tzinfo=UTC),
+        feature_name="price_x_volume",
+        feature_value=1.0,
+    )
+
+    bus.publish(event)
+    bus.add_middleware(RecordingMiddleware("mw", calls))
+    bus.publish(event)
+
+    assert calls == ["handler", "mw", "handler"]
+
+
+def test_handlers_may_publish_reentrantly() -> None:
+    bus = InMemoryEventBus()
+    features: list[float] = []
+
+    def to_feature(event: DomainEvent) -> None:
+        assert isinstance(event, MarketDataArrived)
+        bus.publish(
+            FeatureCalculated(
+                symbol=event.symbol,
+                timestamp=event.timestamp,
+                feature_name="price_x_volume",
+                feature_value=event.last_price * event.volume,
+            )
+        )
+
+    bus.subscribe(MarketDataArrived, to_feature)
+    bus.subscribe(FeatureCalculated, lambda event: features.append(event.feature_value))
+
+    bus.publish(_market_data(10.0))
+
+    assert features == [20.0]
+
+
+class BatchRecordingMiddleware(RecordingMiddleware):
+    def handle_batch(self, events, next_call) -> None:
+        self._calls.append(f"{self._name}:{len(events)}")
+        next_call(events)
+
+
+class BatchCollector:
+    def __init__(self) -> None:
+        self.batches: list[list[DomainEvent]] = []
+
+    def __call__(self, event: DomainEvent) -> None:
+        self.batches.append([event])
+
+    def handle_batch(self, events) -> None:
+        self.batches.append(list(events))
+
+
+def test_publish_batch_groups_by_type_and_runs_middleware_once_per_group() -> None:
+    calls: list[str] = []
+    bus = InMemoryEventBus(middlewares=[BatchRecordingMiddleware("mw", calls)])
+    collector = BatchCollector()
+    per_event: list[DomainEvent] = []
+    bus.subscribe(MarketDataArrived, collector)
+    bus.subscribe("*", per_event.append)
+
+    feature = FeatureCalculated(
+        symbol="BTCUSDT",
+        timestamp=datetime(2026, 1, 1, tzinfo=UTC),
+        feature_name="price_x_volume",
+        feature_value=1.0,
+    )
+    bars = [_market_data(1.0), _market_data(2.0), _market_data(3.0)]
+    bus.publish_batch([bars[0], feature, bars[1], bars[2]])
+
+    assert calls == ["mw:3", "mw:1"]
+    assert collector.batches == [bars]
+    assert per_event == [*bars, feature]
+
+
+def test_default_middleware_batch_hook_keeps_per_event_filtering() -> None:
+    class DropCheapBars(BusMiddleware):
+        def __call__(self, event: DomainEvent, next_call: NextCallable) -> None:
+            if event.last_price >= 2.0:
+                next_call(event)
+
+    bus = InMemoryEventBus(middlewares=[DropCheapBars()])
+    collector = BatchCollector()
+    bus.subscribe(MarketDataArrived, collector)
+
+    bus.publish_batch([_market_data(1.0), _market_data(2.0), _market_data(3.0)])
+
+    assert [[event.last_price for event in batch] for batch in collector.batches] == [[2.0, 3.0]]
+
+
+def test_feature_and_signal_handlers_batch_path_matches_single_path() -> None:
+    def run(batch: bool) -> list[tuple[str, float]]:
+        bus = InMemoryEventBus()
+        signals: list[tuple[str, float]] = []
+        bus.subscribe(MarketDataArrived, FeatureCalculationHandler(bus))
+        bus.subscribe(FeatureCalculated, SignalGenerationHandler(bus, threshold=300.0))
+        bus.subscribe(SignalGenerated, lambda event: signals.append((event.side, event.strength)))
+        bars = [_market_data(price) for price in (50.0, 150.0, 400.0)]
+        if batch:
+            bus.publish_batch(bars)
+        else:
+            for bar in bars:
+                bus.publish(bar)
+        return signals
+
+    assert run(batch=True) == run(batch=False)
+    assert run(batch=True) == [("FLAT", 1 / 3), ("BUY", 1.0), ("BUY", 2.0)]
@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from quantlab.core.event_log import EventFilter, LoggedEvent
+from quantlab.infra.event_log import (
+    BinaryEventLog,
+    Durability,
+    EventReplayer,
+    JsonlEventLog,
+    ReplayError,
+    RetentionPolicy,
+    SegmentedEventLog,
+    convert_jsonl_to_binary,
+)
+from quantlab.infra.event_log.jsonl_store import decode_json
+
+
+@dataclass(frozen=True)
+class _Fill:
+    price: float
+    filled_at: datetime
+
+
+def _event(sequence: int, event_type: str = "market_data.arrived", **payload) -> LoggedEvent:
+    return LoggedEvent.create(
+        sequence=sequence,
+        event_type=event_type,
+        payload=payload or {"symbol": "BTCUSDT", "last_price": 100.0 + sequence},
+        source="test",
+        correlation_id=f"corr-{sequence % 2}",
+    )
+
+
+def _lines(path: Path) -> list[str]:
+    return [line for line in path.read_text(encoding="utf-8").splitlines() if line]
+
+
+def test_jsonl_round_trip_preserves_events(tmp_path: Path) -> None:
+    events = [_event(1), _event(2, fill=_Fill(1.5, datetime(2026, 1, 1, tzinfo=UTC)), note='quote " é')]
+    with JsonlEventLog(tmp_path / "events.jsonl") as log:
+        log.append_many(events)
+        restored = list(log.read_all())
+
+    assert restored[0] == events[0]
+    assert restored[1].payload == {
+        "fill": {"price": 1.5, "filled_at": "2026-01-01T00:00:00+00:00"},
+        "note": 'quote " é',
+    }
+    assert restored[1].occurred_at == events[1].occurred_at
+
+
+def test_appends_are_batched_until_threshold_or_flush(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    log = JsonlEventLog(path, max_batch_events=3, flush_interval=None)
+
+    log.append(_event(1))
+    log.append(_event(2))
+    assert _lines(path) == []
+
+    log.append(_event(3))
+    assert len(_lines(path)) == 3
+
+    log.append(_event(4))
+    log.flush()
+    assert len(_lines(path)) == 4
+
+    log.append(_event(5))
+    log.close()
+    assert len(_lines(path)) == 5
+
+
+def test_event_durability_writes_through(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    log = JsonlEventLog(path, durability=Durability.EVENT)
+    log.append(_event(1))
+    assert len(_lines(path)) == 1
+    log.close()
+
+
+def test_background_flush_on_interval(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    log = JsonlEventLog(path, durability="none", flush_interval=0.02)
+    log.append(_event(1))
+    deadline = time.monotonic() + 2.0
+    while not _lines(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(_lines(path)) == 1
+    log.close()
+
+
+def test_next_sequence_is_tracked_in_memory_and_recovered_from_tail(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    with JsonlEventLog(path) as log:
+        assert log.next_sequence() == 1
+        log.append_many(_event(sequence) for sequence in range(1, 11))
+        assert log.next_sequence() == 11
+
+    with path.open("ab") as f:
+        f.write(b'{"sequence": 11, "event_id": "torn')  # crash mid-write
+
+    with JsonlEventLog(path) as log:
+        assert log.next_sequence() == 11
+        log.append(_event(11))
+        assert [event.sequence for event in log.read_all()] == list(range(1, 12))
+
+
+def test_read_only_open_leaves_a_torn_tail_in_place(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    with JsonlEventLog(path, flush_interval=None, index_interval=2) as log:
+        log.append_many(_event(sequence) for sequence in range(1, 6))
+    torn = b'{"sequence": 6, "event_id": "torn'
+    with path.open("ab") as f:
+        f.write(torn)
+    size = path.stat().st_size
+    index = path.with_name(path.name + ".idx").read_bytes()
+
+    with JsonlEventLog(path, read_only=True) as log:
+        assert log.next_sequence() == 6
+        assert [event.sequence for event in log.read_all()] == [1, 2, 3, 4, 5]
+        with pytest.raises(ValueError, match="read-only"):
+            log.append(_event(6))
+
+    assert path.stat().st_size == size
+    assert path.read_bytes().endswith(torn)
+    assert path.with_name(path.name + ".idx").read_bytes() == index
+
+
+def test_undecodable_final_line_is_treated_as_torn(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    with JsonlEventLog(path) as log:
+        log.append_many(_event(sequence) for sequence in range(1, 4))
+    with path.open("ab") as f:
+        f.write(b'{"sequence": 4, "event\x00garbled\n')
+
+    with JsonlEventLog(path, read_only=True) as log:
+        assert [event.sequence for event in log.read_all()] == [1, 2, 3]
+
+    with JsonlEventLog(path) as log:
+        assert log.next_sequence() == 4
+        log.append(_event(4))
+        assert [event.sequence for event in log.read_all()] == [1, 2, 3, 4]
+    assert len(_lines(path)) == 4
+
+
+def test_decode_json_rejects_trailing_data() -> None:
+    assert decode_json(b' {"sequence": 1}\n') == {"sequence": 1}
+    with pytest.raises(json.JSONDecodeError, match="Extra data"):
+        decode_json(b'{"sequence": 1} {"sequence": 2}\n')
+    with pytest.raises(json.JSONDecodeError):
+        decode_json(b"\n")
+
+
+def test_read_from_seeks_via_sparse_index(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    with JsonlEventLog(path, index_interval=10, max_batch_events=7) as log:
+        log.append_many(_event(sequence) for sequence in range(1, 101))
+
+    index_lines = (tmp_path / "events.jsonl.idx").read_text().split()
+    assert index_lines[0:2] == ["1", "0"]
+    assert len(index_lines) == 20
+
+    with JsonlEventLog(path, index_interval=10) as log:
+        assert [event.sequence for event in log.read_from(95)] == [95, 96, 97, 98, 99, 100]
+        replayed: list[int] = []
+        EventReplayer(log).replay(lambda event: replayed.append(event.sequence), from_sequence=99)
+        assert replayed == [99, 100]
+
+
+def test_stale_index_entries_are_dropped_and_index_can_be_rebuilt(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    with JsonlEventLog(path, index_interval=5) as log:
+        log.append_many(_event(sequence) for sequence in range(1, 21))
+    (tmp_path / "events.jsonl.idx").write_text("1 0\n6 999999\n")
+
+    with JsonlEventLog(path, index_interval=5) as log:
+        assert (tmp_path / "events.jsonl.idx").read_text() == "1 0\n"
+        log.rebuild_index()
+        assert len((tmp_path / "events.jsonl.idx").read_text().splitlines()) == 4
+        assert [event.sequence for event in log.read_from(19)] == [19, 20]
+
+
+def test_segmented_log_rolls_by_size_and_reads_across_segments(tmp_path: Path) -> None:
+    with SegmentedEventLog(tmp_path / "log", max_segment_bytes=2_000, flush_interval=None) as log:
+        for sequence in range(1, 51):
+            log.append(_event(sequence))
+        segments = log.segments()
+
+    assert len(segments) > 3
+    assert segments[0].first_sequence == 1
+    assert all(a.last_sequence + 1 == b.first_sequence for a, b in zip(segments, segments[1:]))
+
+    with SegmentedEventLog(tmp_path / "log", max_segment_bytes=2_000, flush_interval=None) as log:
+        assert log.next_sequence() == 51
+        assert [event.sequence for event in log.read_all()] == list(range(1, 51))
+        assert [event.sequence for event in log.read_from(48)] == [48, 49, 50]
+
+
+def test_segmented_log_reads_closed_segments_read_only_and_rejects_appends_after_close(tmp_path: Path) -> None:
+    log = SegmentedEventLog(tmp_path / "log", max_segment_bytes=10**9, flush_interval=None)
+    log.append_many(_event(sequence) for sequence in range(1, 4))
+    log.roll()
+    log.append(_event(4))
+    closed = tmp_path / "log" / log.segments()[0].path
+    with closed.open("ab") as f:
+        f.write(b'{"sequence": 9, "event_id": "torn')
+    size = closed.stat().st_size
+
+    assert [event.sequence for event in log.read_all()] == [1, 2, 3, 4]
+    assert closed.stat().st_size == size
+
+    log.close()
+    with pytest.raises(ValueError, match="closed"):
+        log.append(_event(5))
+    segments = log.segments()
+    assert len(segments) == 2
+    assert segments[-1].is_active
+    assert [event.sequence for event in log.read_all()] == [1, 2, 3, 4]
+
+
+def test_segmented_log_retention_and_parquet_compaction(tmp_path: Path) -> None:
+    log = SegmentedEventLog(
+        tmp_path / "log",
+        max_segment_bytes=10**9,
+        retention=RetentionPolicy(max_segments=3),
+        flush_interval=None,
+    )
+    for sequence in range(1, 21):
+        log.append(_event(sequence))
+        if sequence % 5 == 0:
+            log.roll()
+    log.append(_event(21))
+
+    segments = log.segments()
+    assert [segment.first_sequence for segment in segments] == [11, 16, 21]
+    assert not (tmp_path / "log" / "segment-00000000000000000001.jsonl").exists()
+
+    compacted = log.compact(keep_recent=1)
+    assert [segment.format for segment in log.segments()] == ["parquet", "jsonl", "jsonl"]
+    assert compacted[0].path.endswith(".parquet")
+
+    restored = list(log.read_all())
+    assert [event.sequence for event in restored] == list(range(11, 22))
+    assert restored[0].payload == {"symbol": "BTCUSDT", "last_price": 111.0}
+    assert restored[0].correlation_id == "corr-1"
+    log.close()
+
+
+def test_binary_log_round_trip_filtering_and_recovery(tmp_path: Path) -> None:
+    path = tmp_path / "events.qlog"
+    events = [
+        _event(sequence, "market_data.arrived" if sequence % 3 else "signal.generated", n=sequence)
+        for sequence in range(1, 31)
+    ]
+    with BinaryEventLog(path) as log:
+        log.append_many(events[:20])
+
+    with path.open("ab") as f:
+        f.write(b"\x40\x00\x00\x00\x00torn")  # crash mid-record
+
+    with BinaryEventLog(path) as log:
+        assert log.next_sequence() == 21
+        log.append_many(events[20:])
+        restored = list(log.read_all())
+        signals = list(log.read_from(10, event_types={"signal.generated"}))
+
+    assert restored == events
+    assert [event.sequence for event in signals] == [12, 15, 18, 21, 24, 27, 30]
+    assert all(event.event_type == "signal.generated" for event in signals)
+
+
+def test_convert_jsonl_to_binary(tmp_path: Path) -> None:
+    with JsonlEventLog(tmp_path / "events.jsonl") as jsonl:
+        jsonl.append_many(_event(sequence) for sequence in range(1, 26))
+        expected = list(jsonl.read_all())
+
+    assert convert_jsonl_to_binary(tmp_path / "events.jsonl", tmp_path / "events.qlog", batch_size=10) == 25
+    with BinaryEventLog(tmp_path / "events.qlog") as binary:
+        assert list(binary.read_all()) == expected
+
+
+def _timed_events() -> list[LoggedEvent]:
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    return [
+        replace(
+            _event(sequence, "market_data.arrived" if sequence % 3 else "signal.generated", symbol=f"S{sequence % 4}"),
+            occurred_at=base + timedelta(minutes=sequence),
+        )
+        for sequence in range(1, 41)
+    ]
+
+
+def test_event_filter_is_pushed_down_by_every_log(tmp_path: Path) -> None:
+    events = _timed_events()
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    event_filter = EventFilter.build(
+        event_types={"signal.generated"},
+        min_sequence=5,
+        max_sequence=35,
+        start=base + timedelta(minutes=8),
+        end=base + timedelta(minutes=33),
+        correlation_ids={"corr-0"},
+    )
+    expected = [event for event in events if event_filter.matches(event)]
+    assert [event.sequence for event in expected] == [12, 18, 24, 30]
+
+    segmented = SegmentedEventLog(tmp_path / "segments", max_segment_bytes=10**9, flush_interval=None)
+    for event in events:
+        segmented.append(event)
+        if event.sequence % 10 == 0:
+            segmented.roll()
+    segmented.compact(keep_recent=1)
+    logs = [
+        JsonlEventLog(tmp_path / "events.jsonl", flush_interval=None),
+        BinaryEventLog(tmp_path / "events.qlog", flush_interval=None),
+        segmented,
+    ]
+    for log in logs:
+        if log is not segmented:
+            log.append_many(events)
+        assert list(log.read(event_filter)) == expected
+        assert [event.sequence for event in log.read(EventFilter(max_sequence=3))] == [1, 2, 3]
+        log.close()
+
+
+def test_correlation_filter_reads_logs_written_in_the_legacy_layout(tmp_path: Path) -> None:
+    events = [_event(sequence) for sequence in range(1, 7)]
+    path = tmp_path / "events.jsonl"
+    with path.open("w", encoding="utf-8") as f:
+        for event in events:
+            # the layout written before the compact encoder: default `", "` / `": "` separators
+            data = {**asdict(event), "occurred_at": event.occurred_at.isoformat()}
+            f.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+    with JsonlEventLog(path, flush_interval=None) as log:
+        restored = list(log.read(EventFilter.build(correlation_ids={"corr-1"})))
+
+    assert [event.sequence for event in restored] == [1, 3, 5]
+
+
+class _SymbolCollector:
+    def __init__(self, partition: int) -> None:
+        self.partition = partition
+        self.seen: list[tuple[str, int]] = []
+
+    def __call__(self, event: LoggedEvent) -> None:
+        self.seen.append((event.payload["symbol"], event.sequence))
+
+    def result(self) -> list[tuple[str, int]]:
+        return self.seen
+
+
+def test_partitioned_replay_keeps_per_key_order(tmp_path: Path) -> None:
+    with JsonlEventLog(tmp_path / "events.jsonl") as log:
+        log.append_many(_timed_events())
+        replayer = EventReplayer(log)
+        event_filter = EventFilter.build(event_types={"market_data.arrived"})
+        inline = replayer.replay_partitioned(_SymbolCollector, partitions=3, event_filter=event_filter)
+        parallel = replayer.replay_partitioned(
+            _SymbolCollector, partitions=3, workers=2, event_filter=event_filter, chunk_size=4
+        )
+
+    assert parallel == inline
+    seen = [item for items in inline.values() for item in items]
+    assert sorted(sequence for _, sequence in seen) == [s for s in range(1, 41) if s % 3]
+    for items in inline.values():
+        for symbol in {symbol for symbol, _ in items}:
+            sequences = [sequence for item_symbol, sequence in items if item_symbol == symbol]
+            assert sequences == sorted(sequences)
+    symbols_by_partition = [{symbol for symbol, _ in items} for items in inline.values()]
+    assert sum(len(symbols) for symbols in symbols_by_partition) == 4
+
+
+def _failing_handler(partition: int):
+    def handle(event: LoggedEvent) -> None:
+        raise RuntimeError(f"boom in partition {partition}")
+
+    return handle
+
+
+def test_partitioned_replay_reports_worker_failures(tmp_path: Path) -> None:
+    with JsonlEventLog(tmp_path / "events.jsonl") as log:
+        log.append_many(_timed_events())
+        with pytest.raises(ReplayError, match="boom in partition"):
+            EventReplayer(log).replay_partitioned(_failing_handler, partitions=2, workers=2)
+
+
+def _dying_handler(partition: int):
+    def handle(event: LoggedEvent) -> None:
+        os._exit(3)
+
+    return handle
+
+
+def test_partitioned_replay_raises_when_a_worker_dies(tmp_path: Path) -> None:
+    with JsonlEventLog(tmp_path / "events.jsonl") as log:
+        log.append_many(_timed_events())
+        started = time.monotonic()
+        with pytest.raises(ReplayError, match="exited with code 3"):
+            EventReplayer(log).replay_partitioned(
+                _dying_handler, partitions=2, workers=2, chunk_size=1, max_inflight_chunks=1
+            )
+    assert time.monotonic() - started < 10.0
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from quantlab.infra.metrics import MetricsRegistry
+from quantlab.infra.storage import IntradayCache, cache_key
+
+
+def _frame(rows: int, value: float = 1.0) -> pa.Table:
+    return pa.table({"symbol": ["BTCUSDT"] * rows, "momentum": [value] * rows})
+
+
+def test_cache_key_covers_dataset_columns_filter_and_version() -> None:
+    key = cache_key("trade", columns=["price"], filter=ds.field("symbol") == "BTCUSDT", version=1)
+    assert key == cache_key("trade", columns=["price"], filter=ds.field("symbol") == "BTCUSDT", version=1)
+    assert len({
+        key,
+        cache_key("trade", columns=["price", "quantity"], filter=ds.field("symbol") == "BTCUSDT", version=1),
+        cache_key("trade", columns=["price"], filter=ds.field("symbol") == "ETHUSDT", version=1),
+        cache_key("trade", columns=["price"], filter=ds.field("symbol") == "BTCUSDT", version=2),
+    }) == 4
+
+
+def test_get_or_compute_computes_once_and_counts_hits(tmp_path: Path) -> None:
+    metrics = MetricsRegistry()
+    cache = IntradayCache(tmp_path, metrics=metrics)
+    calls = []
+
+    def compute() -> pa.Table:
+        calls.append(1)
+        time.sleep(0.05)
+        return _frame(1_000)
+
+    results: list[pa.Table] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("factor", compute))) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result.equals(_frame(1_000)) for result in results)
+    assert cache.get("factor").equals(_frame(1_000))
+    stats = cache.stats()
+    assert (stats.entries, stats.misses, stats.hits) == (1, 4, 1)
+    snapshot = metrics.snapshot()
+    assert snapshot["intraday_cache_hits_total"] == 1
+    assert snapshot["intraday_cache_misses_total"] == 4
+    assert snapshot["intraday_cache_bytes"] == stats.size_bytes == (tmp_path / "factor.arrow").stat().st_size
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path: Path) -> None:
+    probe = IntradayCache(tmp_path / "probe")
+    probe.put("probe", _frame(10_000))
+    entry_size = probe.stats().size_bytes
+
+    metrics = MetricsRegistry()
+    cache = IntradayCache(tmp_path / "cache", max_bytes=int(entry_size * 3.5), metrics=metrics)
+    for index, key in enumerate("abc"):
+        cache.put(key, _frame(10_000, index))
+        os.utime(tmp_path / "cache" / f"{key}.arrow", (1_000 + index, time.time()))
+    assert cache.get("a") is not None  # now the most recently used
+
+    cache.put("d", _frame(10_000))
+
+    # 4 entries > 3.5 allowed: evict least recently used down to 80% of the budget
+    assert sorted(path.stem for path in (tmp_path / "cache").glob("*.arrow")) == ["a", "d"]
+    assert cache.stats().evictions == 2
+    assert metrics.snapshot()['intraday_cache_evictions_total{reason="size"}'] == 2
+
+
+def test_ttl_expiry_and_entries_shared_with_other_processes(tmp_path: Path) -> None:
+    cache = IntradayCache(tmp_path, ttl=60.0)
+    cache.put("fresh", _frame(10))
+    cache.put("stale", _frame(10))
+    an_hour_ago = time.time() - 3_600
+    os.utime(tmp_path / "stale.arrow", (an_hour_ago, an_hour_ago))
+
+    other = pickle.loads(pickle.dumps(cache))  # what a process worker receives
+    assert other.stats().entries == 2
+    assert other.get("stale") is None
+    assert other.get("fresh").num_rows == 10
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["fresh.arrow"]
+    assert cache.get("stale") is None
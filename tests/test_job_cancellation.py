@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from quantlab.app.events import JobCancelled, JobTimedOut
+from quantlab.app.services.job_service import JobService
+from quantlab.core.jobs import JobExecutionMode, JobSpec, JobStatus
+from quantlab.infra.bus.in_memory import InMemoryEventBus
+from quantlab.infra.jobs.in_memory import InMemoryJobRegistry, InMemoryJobRepository
+from quantlab.infra.queue.in_memory import InMemoryJobQueue
+from quantlab.infra.workers.hybrid_pool import HybridWorkerPool
+
+
+def runaway_backtest(payload: dict, ctx) -> dict:
+    time.sleep(60)  # never checks for cancellation
+    return {}
+
+
+def report_pid(payload: dict, ctx) -> dict:
+    return {"pid": os.getpid()}
+
+
+def _pool(thread_workers: int = 1, process_workers: int = 0):
+    bus = InMemoryEventBus()
+    events: list = []
+    bus.subscribe(JobCancelled, events.append)
+    bus.subscribe(JobTimedOut, events.append)
+    repo = InMemoryJobRepository()
+    queue = InMemoryJobQueue()
+    service = JobService(repo=repo, queue=queue, bus=bus)
+    registry = InMemoryJobRegistry()
+    pool = HybridWorkerPool(
+        queue=queue,
+        repo=repo,
+        registry=registry,
+        job_service=service,
+        thread_workers=thread_workers,
+        process_workers=process_workers,
+        poll_timeout=0.05,
+        reap_interval=0.05,
+    )
+    return service, registry, pool, events
+
+
+def _wait_for_status(service: JobService, job_id: str, status: JobStatus, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while service.get_job(job_id).status != status:
+        assert time.monotonic() < deadline, service.get_job(job_id)
+        time.sleep(0.01)
+
+
+def test_cancel_stops_cooperative_thread_job_and_skips_queued_job() -> None:
+    service, registry, pool, events = _pool(thread_workers=1)
+    started = threading.Event()
+    ran: list[str] = []
+
+    def scan(payload: dict, ctx) -> dict:
+        ran.append(payload["name"])
+        started.set()
+        while True:
+            ctx.check_cancelled()
+            time.sleep(0.001)
+
+    registry.register("compute.factor", scan)
+    running = service.submit(JobSpec(job_type="compute.factor", payload={"name": "running"})).job_id
+    queued = service.submit(JobSpec(job_type="compute.factor", payload={"name": "queued"})).job_id
+    follow_up = service.submit(JobSpec(job_type="compute.factor", payload={"name": "follow-up"})).job_id
+    pool.start()
+    try:
+        assert started.wait(5.0)
+        service.cancel(queued)
+        service.cancel(running, "user request")
+        _wait_for_status(service, follow_up, JobStatus.RUNNING)
+        service.cancel(follow_up)
+    finally:
+        pool.stop()
+
+    assert ran == ["running", "follow-up"]
+    assert service.get_job(running).status == JobStatus.CANCELLED
+    assert service.get_job(running).error == "user request"
+    assert [event.job_id for event in events] == [queued, running, follow_up]
+    assert service.cancel(running).status == JobStatus.CANCELLED  # finished jobs are left alone
+
+
+def test_thread_job_times_out_at_next_check() -> None:
+    service, registry, pool, events = _pool(thread_workers=1)
+
+    def scan(payload: dict, ctx) -> dict:
+        while True:
+            ctx.check_cancelled()
+            time.sleep(0.001)
+
+    registry.register("compute.factor", scan)
+    job_id = service.submit(JobSpec(job_type="compute.factor", payload={}, timeout=0.2)).job_id
+    pool.start()
+    try:
+        _wait_for_status(service, job_id, JobStatus.TIMED_OUT, timeout=2.0)
+    finally:
+        pool.stop()
+
+    assert service.get_job(job_id).error == "Timed out after 0.2s"
+    assert [type(event) for event in events] == [JobTimedOut]
+
+
+def test_runaway_process_job_is_killed_and_worker_replaced() -> None:
+    service, registry, pool, events = _pool(thread_workers=1, process_workers=1)
+    registry.register("run.backtest", runaway_backtest)
+    registry.register("compute.factor", report_pid)
+
+    def submit(job_type: str, **options) -> str:
+        spec = JobSpec(job_type=job_type, payload={}, execution_mode=JobExecutionMode.PROCESS, **options)
+        return service.submit(spec).job_id
+
+    pool.start()
+    try:
+        before = submit("compute.factor")
+        _wait_for_status(service, before, JobStatus.SUCCEEDED)
+        runaway = submit("run.backtest", timeout=0.3)
+        after = submit("compute.factor")
+        started = time.monotonic()
+        _wait_for_status(service, runaway, JobStatus.TIMED_OUT)
+        _wait_for_status(service, after, JobStatus.SUCCEEDED)
+        recovered = time.monotonic() - started
+        cancelled = submit("run.backtest")
+        _wait_for_status(service, cancelled, JobStatus.RUNNING)
+        service.cancel(cancelled)
+        last = submit("compute.factor")
+        _wait_for_status(service, last, JobStatus.SUCCEEDED)
+    finally:
+        pool.stop()
+
+    assert recovered < 5.0
+    pids = [service.get_job(job_id).result["pid"] for job_id in (before, after, last)]
+    assert len(set(pids)) == 3
+    assert service.get_job(runaway).error == "Timed out after 0.3s"
+    assert service.get_job(cancelled).status == JobStatus.CANCELLED
+    assert [type(event) for event in events] == [JobTimedOut, JobCancelled]
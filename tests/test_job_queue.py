@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from quantlab.app.services.job_service import JobService
+from quantlab.core.jobs import JobExecutionMode, JobSpec, JobStatus
+from quantlab.infra.bus.in_memory import InMemoryEventBus
+from quantlab.infra.jobs.in_memory import InMemoryJobRegistry, InMemoryJobRepository
+from quantlab.infra.queue.fair_share import FairShareJobQueue
+from quantlab.infra.queue.in_memory import InMemoryJobQueue
+from quantlab.infra.workers.hybrid_pool import HybridWorkerPool
+
+
+def _drain(queue: FairShareJobQueue) -> list[str]:
+    job_ids = []
+    while (job_id := queue.get(timeout=0)) is not None:
+        job_ids.append(job_id)
+        queue.task_done(job_id)
+    return job_ids
+
+
+def test_higher_priority_runs_first_then_fifo() -> None:
+    queue = FairShareJobQueue()
+    queue.put("bulk-1", job_type="compute.factor")
+    queue.put("bulk-2", job_type="compute.factor")
+    queue.put("urgent", priority=10, job_type="compute.factor")
+
+    assert _drain(queue) == ["urgent", "bulk-1", "bulk-2"]
+
+
+def test_weighted_fair_share_interleaves_job_types() -> None:
+    queue = FairShareJobQueue(weights={"download.market_data": 2.0})
+    for index in range(6):
+        queue.put(f"factor-{index}", job_type="compute.factor")
+    for index in range(4):
+        queue.put(f"download-{index}", job_type="download.market_data")
+
+    order = _drain(queue)
+    first_six = order[:6]
+    assert sum(job_id.startswith("download") for job_id in first_six) == 4
+    assert order[-1].startswith("factor")
+
+
+def test_share_by_correlation_id() -> None:
+    queue = FairShareJobQueue(share_by="correlation_id")
+    for index in range(3):
+        queue.put(f"sweep-{index}", job_type="compute.factor", correlation_id="sweep")
+    queue.put("user", job_type="compute.factor", correlation_id="user")
+
+    assert _drain(queue)[:2] == ["sweep-0", "user"]
+
+
+def test_concurrency_limit_holds_jobs_until_task_done() -> None:
+    queue = FairShareJobQueue(concurrency_limits={"compute.factor": 1})
+    queue.put("factor-1", job_type="compute.factor")
+    queue.put("factor-2", job_type="compute.factor")
+    queue.put("download-1", job_type="download.market_data")
+
+    first = queue.get(timeout=0)
+    second = queue.get(timeout=0)
+    assert {first, second} == {"factor-1", "download-1"}
+    assert queue.get(timeout=0.01) is None
+    assert queue.stats().running == {"compute.factor": 1, "download.market_data": 1}
+
+    queue.task_done("factor-1")
+    assert queue.get(timeout=0) == "factor-2"
+
+
+def test_hybrid_pool_keeps_interactive_latency_bounded_during_bulk_run() -> None:
+    repo = InMemoryJobRepository()
+    queue = FairShareJobQueue()
+    bus = InMemoryEventBus()
+    service = JobService(repo=repo, queue=queue, bus=bus)
+    registry = InMemoryJobRegistry()
+    finished: list[str] = []
+    lock = threading.Lock()
+
+    def job(payload: dict, ctx) -> dict:
+        time.sleep(0.005)
+        with lock:
+            finished.append(payload["name"])
+        return {}
+
+    registry.register("compute.factor", job)
+    registry.register("download.market_data", job)
+    pool = HybridWorkerPool(
+        queue=queue,
+        repo=repo,
+        registry=registry,
+        job_service=service,
+        thread_workers=2,
+        process_workers=0,
+        poll_timeout=0.05,
+    )
+
+    for index in range(100):
+        service.submit(JobSpec(job_type="compute.factor", payload={"name": f"factor-{index}"}))
+    pool.start()
+    try:
+        time.sleep(0.02)
+        interactive = service.submit(
+            JobSpec(job_type="download.market_data", payload={"name": "download"}, priority=10)
+        )
+        deadline = time.monotonic() + 5.0
+        while service.get_job(interactive.job_id).status != JobStatus.SUCCEEDED:
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+        with lock:
+            position = finished.index("download")
+    finally:
+        pool.stop()
+
+    # only jobs already running or dispatched when it arrived may finish first
+    assert position < 20
+
+
+def slow_backtest(payload: dict, ctx) -> dict:
+    time.sleep(payload["seconds"])
+    return {}
+
+
+def test_saturated_process_pool_backs_up_in_the_queue_without_holding_back_thread_jobs() -> None:
+    repo = InMemoryJobRepository()
+    queue = FairShareJobQueue()
+    service = JobService(repo=repo, queue=queue, bus=InMemoryEventBus())
+    registry = InMemoryJobRegistry()
+    registry.register("backtest.run", slow_backtest)
+    registry.register("download.market_data", lambda payload, ctx: {})
+    pool = HybridWorkerPool(
+        queue=queue,
+        repo=repo,
+        registry=registry,
+        job_service=service,
+        thread_workers=2,
+        process_workers=1,
+        poll_timeout=0.05,
+    )
+
+    pool.start()
+    try:
+        backtests = [
+            service.submit(
+                JobSpec(
+                    job_type="backtest.run",
+                    payload={"n": index, "seconds": 0.5},
+                    execution_mode=JobExecutionMode.PROCESS,
+                )
+            ).job_id
+            for index in range(20)
+        ]
+        deadline = time.monotonic() + 10.0
+        while service.get_job(backtests[0]).status != JobStatus.RUNNING:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        time.sleep(0.1)
+
+        # one backtest runs and at most one more waits in the dispatcher's backlog
+        assert queue.stats().queued["backtest.run"] >= 18
+        assert queue.stats().running["backtest.run"] <= 2
+
+        submitted = time.monotonic()
+        interactive = service.submit(
+            JobSpec(job_type="download.market_data", payload={}, priority=10)
+        ).job_id
+        while service.get_job(interactive).status != JobStatus.SUCCEEDED:
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+        latency = time.monotonic() - submitted
+
+        # the download waits for one process slot to turn over, not for the sweep
+        assert latency < 0.9
+        assert sum(service.get_job(job_id).status == JobStatus.QUEUED for job_id in backtests) >= 16
+    finally:
+        pool.stop()
+
+    # backlogged process jobs go back to the queue on stop
+    assert queue.stats().queued["backtest.run"] >= 16
+
+
+def test_get_many_and_close_wake_blocked_getters() -> None:
+    for queue in (InMemoryJobQueue(), FairShareJobQueue()):
+        for index in range(5):
+            queue.put(f"job-{index}", job_type="compute.factor")
+        assert queue.get_many(3) == ["job-0", "job-1", "job-2"]
+        assert queue.get_many(10, timeout=0) == ["job-3", "job-4"]
+
+        results: list[list[str]] = []
+        getter = threading.Thread(target=lambda q=queue: results.append(q.get_many(4)))
+        getter.start()
+        time.sleep(0.05)
+        queue.close()
+        getter.join(timeout=1.0)
+        assert not getter.is_alive()
+        assert results == [[]]
+        queue.put("late", job_type="compute.factor")
+        assert queue.get(timeout=None) == "late"
+        assert queue.get(timeout=None) is None
+
+
+class _CountingQueue(FairShareJobQueue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    def get_many(self, max_items: int, timeout: float | None = None) -> list[str]:
+        self.batches.append(max_items)
+        return super().get_many(max_items, timeout)
+
+
+def test_dispatcher_pulls_only_free_slots_and_sleeps_when_idle() -> None:
+    repo = InMemoryJobRepository()
+    queue = _CountingQueue()
+    service = JobService(repo=repo, queue=queue, bus=InMemoryEventBus())
+    registry = InMemoryJobRegistry()
+    release = threading.Event()
+    registry.register("compute.factor", lambda payload, ctx: release.wait(5.0) and {})
+    pool = HybridWorkerPool(
+        queue=queue,
+        repo=repo,
+        registry=registry,
+        job_service=service,
+        thread_workers=2,
+        process_workers=0,
+        poll_timeout=0.01,
+    )
+
+    pool.start()
+    try:
+        time.sleep(0.1)
+        assert queue.batches == [2]  # idle: one blocking call, no polling
+
+        for index in range(10):
+            service.submit(JobSpec(job_type="compute.factor", payload={"n": index}))
+        time.sleep(0.1)
+        assert queue.stats().queued == {"compute.factor": 8}
+        assert len(repo.find(status=JobStatus.RUNNING)) == 2
+    finally:
+        release.set()
+        pool.stop()
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import threading
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+
+from quantlab.app.services.job_runner import DefaultJobRunner
+from quantlab.app.services.job_service import JobService
+from quantlab.core.interfaces import JobRepository
+from quantlab.core.jobs import JobRecord, JobSpec, JobStatus
+from quantlab.infra.bus.in_memory import InMemoryEventBus
+from quantlab.infra.jobs.in_memory import InMemoryJobRegistry, InMemoryJobRepository
+from quantlab.infra.jobs.sqlite import SqliteJobRepository
+from quantlab.infra.queue.in_memory import InMemoryJobQueue
+from quantlab.infra.storage.shared_buffers import share_table
+
+
+def _job(job_type: str = "download.market_data", dedupe_key: str | None = None, **payload) -> JobRecord:
+    return JobRecord.create(JobSpec(job_type=job_type, payload=payload or {"symbol": "BTCUSDT"}, dedupe_key=dedupe_key))
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo(request, tmp_path: Path):
+    if request.param == "memory":
+        yield InMemoryJobRepository()
+        return
+    repository = SqliteJobRepository(tmp_path / "jobs.sqlite3", flush_interval=None)
+    yield repository
+    repository.close()
+
+
+def test_snapshots_are_independent_and_share_read_only_payload() -> None:
+    repo = InMemoryJobRepository()
+    job = _job(values=list(range(1000)))
+    repo.add(job)
+    job.status = JobStatus.RUNNING
+
+    first = repo.get(job.job_id)
+    assert first is not None and first.status == JobStatus.PENDING
+    first.progress = 0.5
+    assert repo.get(job.job_id).progress == 0.0
+    assert first.payload is repo.get(job.job_id).payload
+    with pytest.raises(TypeError):
+        first.payload["values"].append(1000)
+
+    result = {"rows": [1, 2]}
+    job.result = result
+    repo.update(job)
+    result["rows"].append(3)
+    with pytest.raises(TypeError):
+        repo.get(job.job_id).result["rows"] = []
+    assert repo.get(job.job_id).result == {"rows": [1, 2]}
+
+
+def test_handlers_cannot_mutate_the_stored_payload() -> None:
+    repo = InMemoryJobRepository()
+    service = JobService(repo=repo, queue=InMemoryJobQueue(), bus=InMemoryEventBus())
+    registry = InMemoryJobRegistry()
+    registry.register("compute.factor", lambda payload, ctx: {"values": payload["values"].append(3)})
+    job_id = service.submit(JobSpec(job_type="compute.factor", payload={"values": [1, 2]})).job_id
+
+    DefaultJobRunner(registry=registry, job_service=service).run(job_id)
+
+    assert repo.get(job_id).status == JobStatus.FAILED
+    assert repo.get(job_id).payload == {"values": [1, 2]}
+
+
+def test_dedupe_index_follows_status_transitions(repo: JobRepository) -> None:
+    job = _job(dedupe_key="download:BTCUSDT")
+    repo.add(job)
+    assert repo.find_active_by_dedupe_key("download:BTCUSDT").job_id == job.job_id
+
+    job.status = JobStatus.RUNNING
+    repo.update(job)
+    assert repo.find_active_by_dedupe_key("download:BTCUSDT").job_id == job.job_id
+
+    job.status = JobStatus.SUCCEEDED
+    repo.update(job)
+    assert repo.find_active_by_dedupe_key("download:BTCUSDT") is None
+
+    retry = _job(dedupe_key="download:BTCUSDT")
+    repo.add(retry)
+    assert repo.find_active_by_dedupe_key("download:BTCUSDT").job_id == retry.job_id
+
+
+def test_dedupe_key_stays_active_while_any_holder_is(repo: JobRepository) -> None:
+    first = _job(dedupe_key="download:BTCUSDT")
+    second = _job(dedupe_key="download:BTCUSDT")
+    repo.add(first)
+    repo.add(second)
+
+    first.status = JobStatus.SUCCEEDED
+    repo.update(first)
+
+    assert repo.find_active_by_dedupe_key("download:BTCUSDT").job_id == second.job_id
+
+
+def test_find_is_optional_for_repository_implementations() -> None:
+    class _GetOnlyRepository(JobRepository):
+        def add(self, job: JobRecord) -> None: ...
+
+        def get(self, job_id: str) -> JobRecord | None: ...
+
+        def update(self, job: JobRecord) -> None: ...
+
+        def find_active_by_dedupe_key(self, dedupe_key: str) -> JobRecord | None: ...
+
+        def add_if_absent(self, dedupe_key: str, job: JobRecord) -> JobRecord | None: ...
+
+    with pytest.raises(NotImplementedError, match="_GetOnlyRepository does not support find"):
+        _GetOnlyRepository().find(status=JobStatus.QUEUED)
+
+
+def test_find_uses_status_and_job_type_indexes(repo: JobRepository) -> None:
+    downloads = [_job() for _ in range(3)]
+    backtest = _job("backtest.run")
+    for job in [*downloads, backtest]:
+        repo.add(job)
+    downloads[1].status = JobStatus.FAILED
+    repo.update(downloads[1])
+
+    assert [job.job_id for job in repo.find(job_type="download.market_data")] == [job.job_id for job in downloads]
+    assert [job.job_id for job in repo.find(status=JobStatus.FAILED)] == [downloads[1].job_id]
+    pending_downloads = repo.find(status={JobStatus.PENDING, JobStatus.QUEUED}, job_type="download.market_data")
+    assert [job.job_id for job in pending_downloads] == [downloads[0].job_id, downloads[2].job_id]
+    assert len(repo.find()) == 4
+
+
+def test_sqlite_repository_survives_restart_and_coalesces_progress(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    repo = SqliteJobRepository(path, flush_interval=None)
+    job = _job(values=[1.5, 2.5])
+    job.status = JobStatus.RUNNING
+    repo.add(job)
+    for step in range(1, 101):
+        job.progress = step / 100
+        repo.update(job)
+    assert repo.get(job.job_id).progress == 1.0
+
+    reopened = SqliteJobRepository(path, flush_interval=None)
+    assert reopened.get(job.job_id).progress == 0.0  # progress-only writes are still buffered
+    reopened.close()
+
+    job.status = JobStatus.SUCCEEDED
+    job.result = {"score": 4.0}
+    repo.update(job)
+    repo.close()
+
+    with SqliteJobRepository(path, flush_interval=None) as reopened:
+        restored = reopened.get(job.job_id)
+    assert restored.status == JobStatus.SUCCEEDED
+    assert restored.progress == 1.0
+    assert restored.payload == {"values": [1.5, 2.5]}
+    assert restored.result == {"score": 4.0}
+    assert restored.created_at == job.created_at
+
+
+def test_add_if_absent_lets_exactly_one_submit_win_per_key(repo: JobRepository) -> None:
+    service = JobService(repo=repo, queue=InMemoryJobQueue(), bus=InMemoryEventBus())
+    threads, submits_per_thread = 8, 250
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def hammer() -> None:
+        barrier.wait()
+        for _ in range(submits_per_thread):
+            results.append(
+                service.submit(
+                    JobSpec(job_type="download.market_data", payload={"symbol": "BTCUSDT"}, dedupe_key="download:BTCUSDT")
+                )
+            )
+
+    workers = [threading.Thread(target=hammer) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    created = [result for result in results if result.created]
+    assert len(results) == threads * submits_per_thread
+    assert len(created) == 1
+    assert {result.job_id for result in results} == {created[0].job_id}
+    assert len(repo.find(job_type="download.market_data")) == 1
+
+
+def test_arrow_handles_survive_json_storage(tmp_path: Path) -> None:
+    handle = share_table(pa.table({"equity": [1.0, 1.1, 1.2]}))
+    job = _job(prices=handle)
+    job.status = JobStatus.SUCCEEDED
+    job.result = {"equity_curve": handle, "final": 1.2}
+    with SqliteJobRepository(tmp_path / "jobs.sqlite3", flush_interval=None) as repo:
+        repo.add(job)
+    with SqliteJobRepository(tmp_path / "jobs.sqlite3", flush_interval=None) as repo:
+        restored = repo.get(job.job_id)
+
+    assert restored.payload["prices"] == handle
+    assert restored.result["equity_curve"].open().column("equity").to_pylist() == [1.0, 1.1, 1.2]
+    handle.release()
+
+
+def test_sqlite_rejects_values_json_cannot_round_trip(tmp_path: Path) -> None:
+    with SqliteJobRepository(tmp_path / "jobs.sqlite3", flush_interval=None) as repo:
+        with pytest.raises(TypeError, match="Decimal"):
+            repo.add(_job(notional=Decimal("1.5")))
+
+        job = _job()
+        job.status = JobStatus.RUNNING
+        repo.add(job)
+        job.progress = 0.5
+        job.result = {"as_of": datetime(2026, 1, 1, tzinfo=UTC)}
+        with pytest.raises(TypeError, match="datetime"):
+            repo.update(job)  # progress-only writes are buffered, but still checked up front
+
+        job.result = None
+        repo.update(job)
+        repo.flush()
+        assert repo.get(job.job_id).progress == 0.5
+        assert [stored.job_id for stored in repo.find()] == [job.job_id]
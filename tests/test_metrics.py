@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from quantlab.app.bootstrap import build_async_task_runtime
+from quantlab.app.events import JobQueued
+from quantlab.config.models import QuantLabSettings, RuntimeSettings
+from quantlab.core.jobs import JobSpec
+from quantlab.infra.bus import InMemoryEventBus
+from quantlab.infra.metrics import MetricsRegistry, render_prometheus
+
+
+def _download(payload: dict, ctx) -> dict:
+    return {"symbol": payload["symbol"]}
+
+
+def _broken(payload: dict, ctx) -> dict:
+    raise RuntimeError("provider down")
+
+
+def test_registry_counters_gauges_and_prometheus_rendering() -> None:
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.", ("route",)).labels('/a"b').inc(3)
+    registry.gauge("workers").labels().set_function(lambda: 4)
+    latency = registry.histogram("latency_seconds", "Latency.")
+    for millis in range(1, 101):
+        latency.labels().observe_seconds(millis / 1000)
+
+    text = render_prometheus(registry)
+
+    assert '# TYPE requests_total counter' in text
+    assert 'requests_total{route="/a\\"b"} 3' in text
+    assert "workers 4" in text
+    assert "# TYPE latency_seconds summary" in text
+    assert "latency_seconds_count 100" in text
+    assert registry.snapshot()["latency_seconds"].p50_ms == pytest.approx(50.0, rel=0.07)
+
+
+def test_bus_counts_events_and_times_handlers() -> None:
+    registry = MetricsRegistry()
+    bus = InMemoryEventBus(metrics=registry)
+
+    def on_queued(event) -> None:
+        return None
+
+    bus.subscribe(JobQueued, on_queued)
+    for index in range(3):
+        bus.publish(JobQueued(job_id=str(index)))
+    bus.publish_batch([JobQueued(job_id="x"), JobQueued(job_id="y")])
+
+    snapshot = registry.snapshot()
+    assert snapshot['eventbus_events_published_total{event_type="job.queued"}'] == 5
+    handler_key = (
+        'eventbus_handler_seconds{event_type="job.queued",'
+        'handler="test_bus_counts_events_and_times_handlers.<locals>.on_queued"}'
+    )
+    assert snapshot[handler_key].count == 4
+
+
+def test_bus_samples_handler_timing_and_weights_each_sample() -> None:
+    registry = MetricsRegistry()
+    bus = InMemoryEventBus(metrics=registry, timing_sample_every=4)
+    calls: list[str] = []
+
+    def on_queued(event) -> None:
+        calls.append(event.job_id)
+
+    bus.subscribe(JobQueued, on_queued)
+    for index in range(9):
+        bus.publish(JobQueued(job_id=str(index)))
+
+    assert len(calls) == 9
+    handler_key = (
+        'eventbus_handler_seconds{event_type="job.queued",'
+        'handler="test_bus_samples_handler_timing_and_weights_each_sample.<locals>.on_queued"}'
+    )
+    assert registry.snapshot()[handler_key].count == 12  # calls 0, 4 and 8 timed, each standing for four
+
+
+def test_counter_increments_from_many_threads_are_not_lost() -> None:
+    counter = MetricsRegistry().counter("hits_total", "Hits.").labels()
+
+    def hit() -> None:
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=hit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value == 80_000
+
+
+def test_runtime_exposes_job_and_worker_metrics() -> None:
+    runtime = build_async_task_runtime(
+        QuantLabSettings(runtime=RuntimeSettings(max_workers=2, process_workers=0, queue_poll_timeout=0.05))
+    )
+    runtime.register_job_handler("download.market_data", _download)
+    runtime.register_job_handler("broken", _broken)
+
+    runtime.start()
+    try:
+        ok = runtime.submit_job(JobSpec(job_type="download.market_data", payload={"symbol": "BTCUSDT"}))
+        bad = runtime.submit_job(JobSpec(job_type="broken", payload={}))
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            statuses = [runtime.get_job_status(ok.job_id).status, runtime.get_job_status(bad.job_id).status]
+            if all(status in {"succeeded", "failed"} for status in statuses):
+                break
+            time.sleep(0.02)
+    finally:
+        runtime.stop()
+
+    metrics = runtime.metrics()
+    assert metrics['jobs_submitted_total{job_type="download.market_data"}'] == 1
+    assert metrics['jobs_succeeded_total{job_type="download.market_data"}'] == 1
+    assert metrics['jobs_failed_total{job_type="broken"}'] == 1
+    assert metrics['job_queue_wait_seconds{job_type="download.market_data"}'].count == 1
+    assert metrics['job_run_seconds{job_type="broken"}'].count == 1
+    assert metrics['worker_pool_idle_workers{pool="thread"}'] == 2
+    assert metrics['eventbus_events_published_total{event_type="job.succeeded"}'] == 1
+    assert "worker_pool_busy_workers" in runtime.render_metrics()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from quantlab.core.interfaces import JobContext
+from quantlab.infra.storage import ParquetStore, ParquetWriteOptions, report_progress
+
+SCHEMA = pa.schema([("trade_id", pa.int64()), ("symbol", pa.string()), ("price", pa.float64())])
+
+
+def _trades(batches: int, rows: int = 1_000):
+    for index in range(batches):
+        start = index * rows
+        yield pa.record_batch(
+            [pa.array(range(start, start + rows)), pa.array(["BTCUSDT"] * rows), pa.array([100.0] * rows)],
+            schema=SCHEMA,
+        )
+
+
+class _RecordingContext(JobContext):
+    def __init__(self) -> None:
+        self.updates: list[tuple[float, str]] = []
+
+    def set_progress(self, progress: float, message: str = "") -> None:
+        self.updates.append((progress, message))
+
+
+def test_streams_batches_into_row_groups_and_reports_progress(tmp_path: Path) -> None:
+    store = ParquetStore(tmp_path)
+    ctx = _RecordingContext()
+    options = ParquetWriteOptions(row_group_size=64_000, use_dictionary=["symbol"])
+
+    stats = store.write_batches(
+        "trades/BTCUSDT/2024-01.parquet",
+        _trades(250),
+        options=options,
+        on_progress=report_progress(ctx, expected_rows=250_000),
+    )
+
+    path = tmp_path / "trades/BTCUSDT/2024-01.parquet"
+    metadata = pq.ParquetFile(path).metadata
+    assert (stats.rows, stats.row_groups) == (250_000, 4)
+    assert stats.bytes_written == path.stat().st_size
+    assert [metadata.row_group(index).num_rows for index in range(4)] == [64_000, 64_000, 64_000, 58_000]
+    symbol, price = metadata.row_group(0).column(1), metadata.row_group(0).column(2)
+    assert symbol.compression == "ZSTD"
+    assert any("DICTIONARY" in encoding for encoding in symbol.encodings)
+    assert not any("DICTIONARY" in encoding for encoding in price.encodings)
+    assert [progress for progress, _ in ctx.updates] == [0.256, 0.512, 0.768, 1.0]
+    assert ctx.updates[-1][1].startswith("wrote 250,000 rows, ")
+    assert pq.read_table(path).column("trade_id").to_pylist() == list(range(250_000))
+
+
+def test_failed_ingest_leaves_previous_file_untouched(tmp_path: Path) -> None:
+    store = ParquetStore(tmp_path)
+    store.write_batches("trades.parquet", _trades(2))
+
+    def broken():
+        yield from _trades(3)
+        raise ConnectionError("download interrupted")
+
+    with pytest.raises(ConnectionError):
+        store.write_batches("trades.parquet", broken(), SCHEMA)
+
+    assert pq.read_table(tmp_path / "trades.parquet").num_rows == 2_000
+    assert [path.name for path in tmp_path.iterdir()] == ["trades.parquet"]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from quantlab.domain.data.enums import DataFrequency, DatasetKind
+from quantlab.infra.storage import ParquetStore
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _bars(symbol: str, minutes: int, offset: float = 0.0) -> pa.Table:
+    timestamps = [START + timedelta(minutes=minute) for minute in range(minutes)]
+    return pa.table(
+        {
+            "timestamp": pa.array(timestamps, pa.timestamp("ns", "UTC")),
+            "symbol": [symbol] * minutes,
+            "close": [offset + minute for minute in range(minutes)],
+            "volume": [1.0] * minutes,
+        }
+    )
+
+
+def test_bars_are_laid_out_by_kind_symbol_frequency_and_date(tmp_path: Path) -> None:
+    bars = ParquetStore(tmp_path).dataset(DatasetKind.BAR)
+    written = bars.write(_bars("BTC/USDT", 3 * 1440), DataFrequency.ONE_MINUTE)
+
+    assert len(written) == 3
+    relative = sorted(path.parent.relative_to(tmp_path).as_posix() for path in written)
+    assert relative[0] == "bar/symbol=BTC%2FUSDT/frequency=1m/date=2024-01-01"
+    assert bars.symbols() == ["BTC/USDT"]
+
+
+def test_read_projects_columns_and_prunes_by_symbol_and_time(tmp_path: Path) -> None:
+    bars = ParquetStore(tmp_path).dataset("bar", row_group_size=60)
+    for index, symbol in enumerate(("BTCUSDT", "ETHUSDT", "SOLUSDT")):
+        bars.write(_bars(symbol, 3 * 1440, offset=index * 10_000), "1m")
+    bars.write(_bars("BTCUSDT", 1440), "1d")
+
+    table = bars.read(
+        symbols=["BTCUSDT", "SOLUSDT"],
+        frequency="1m",
+        start=START + timedelta(days=1, hours=2),
+        end=START + timedelta(days=1, hours=3),
+        columns=["timestamp", "symbol", "close"],
+    )
+
+    assert isinstance(table, pa.Table)
+    assert table.column_names == ["timestamp", "symbol", "close"]
+    assert table.num_rows == 2 * 60
+    assert set(table.column("symbol").to_pylist()) == {"BTCUSDT", "SOLUSDT"}
+    assert min(table.column("close").to_pylist()) == 1440 + 120
+
+    scanner = bars.scanner(symbols=["BTCUSDT"], frequency="1m", start=START + timedelta(days=2))
+    assert sum(batch.num_rows for batch in scanner.to_batches()) == 1440
+    assert bars.read(symbols=["DOGEUSDT"], columns=["close"]).num_rows == 0
+
+    fragment = next(iter(ds.dataset(bars.path / "symbol=BTCUSDT" / "frequency=1m", format="parquet").get_fragments()))
+    assert fragment.metadata.num_row_groups == 24  # small row groups keep statistics pruning selective
+
+
+def test_overwrite_partitions_replaces_only_touched_days(tmp_path: Path) -> None:
+    trades = ParquetStore(tmp_path).dataset(DatasetKind.TRADE)
+    trades.write(_bars("BTCUSDT", 2 * 1440))
+    trades.write(_bars("BTCUSDT", 2 * 1440))
+    assert trades.read().num_rows == 4 * 1440
+
+    trades.write(_bars("BTCUSDT", 1440, offset=0.5), mode="overwrite_partitions")
+
+    table = trades.read(columns=["close", "date", "frequency"])
+    assert table.num_rows == 1440 + 2 * 1440
+    assert set(table.column("frequency").to_pylist()) == {"tick"}
+    first_day = table.filter(pc.equal(table.column("date"), pa.scalar(START.date())))
+    assert set(first_day.column("close").to_pylist()) == {0.5 + minute for minute in range(1440)}
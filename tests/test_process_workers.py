@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from quantlab.app.services.job_service import JobService, JobStatusView
+from quantlab.app.events import JobProgressed
+from quantlab.core.jobs import JobExecutionMode, JobSpec, JobStatus
+from quantlab.infra.bus.in_memory import InMemoryEventBus
+from quantlab.infra.jobs.in_memory import InMemoryJobRegistry, InMemoryJobRepository
+from quantlab.infra.queue.in_memory import InMemoryJobQueue
+from quantlab.infra.storage.shared_buffers import ArrowHandle, share_table
+from quantlab.infra.workers.hybrid_pool import HybridWorkerPool
+from quantlab.infra.workers.process_worker import ProcessJobContext, cached, process_cache
+
+
+class FactorJob:
+    """Loads its 'dataset' once per worker and counts jobs served from the cache."""
+
+    def preload(self) -> None:
+        process_cache()["dataset"] = list(range(1_000))
+        process_cache()["preloads"] = process_cache().get("preloads", 0) + 1
+
+    def __call__(self, payload: dict, ctx) -> dict:
+        dataset = process_cache()["dataset"]
+        served = cached("served", lambda: [0])
+        served[0] += 1
+        return {
+            "pid": os.getpid(),
+            "value": sum(dataset[: payload["n"]]),
+            "served": served[0],
+            "preloads": process_cache()["preloads"],
+        }
+
+
+class ChattyJob:
+    """Reports progress far more often than anyone wants to observe it."""
+
+    def __call__(self, payload: dict, ctx) -> dict:
+        deadline = time.monotonic() + payload["seconds"]
+        steps = 0
+        while time.monotonic() < deadline:
+            steps += 1
+            ctx.set_progress(min(steps / 1_000_000, 0.99), f"step {steps}")
+        return {"steps": steps}
+
+
+def cumulative_returns(payload: dict, ctx) -> dict:
+    prices = payload["prices"].open()
+    close = prices.column("close")
+    equity = pc.divide(close, close[0])
+    return {
+        "equity_curve": share_table(pa.table({"equity": equity}), payload["artifact_dir"]),
+        "final": equity[-1].as_py(),
+    }
+
+
+def _run_jobs(count: int, handler=None, bus=None, payload=None, **pool_options) -> list[JobStatusView]:
+    repo = InMemoryJobRepository()
+    queue = InMemoryJobQueue()
+    service = JobService(repo=repo, queue=queue, bus=bus or InMemoryEventBus())
+    registry = InMemoryJobRegistry()
+    registry.register("compute.factor", handler or FactorJob())
+    registry.register("download.market_data", lambda payload, ctx: {})  # unpicklable, thread-only
+    pool = HybridWorkerPool(
+        queue=queue,
+        repo=repo,
+        registry=registry,
+        job_service=service,
+        thread_workers=1,
+        process_workers=1,
+        **pool_options,
+    )
+    job_ids = [
+        service.submit(
+            JobSpec(
+                job_type="compute.factor",
+                payload={"n": n, "seconds": 0.5, **(payload or {})},
+                execution_mode=JobExecutionMode.PROCESS,
+            )
+        ).job_id
+        for n in range(1, count + 1)
+    ]
+    pool.start()
+    try:
+        deadline = time.monotonic() + 30.0
+        while not all(repo.get(job_id).is_terminal for job_id in job_ids):
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+    finally:
+        pool.stop()
+    views = [service.get_status(job_id) for job_id in job_ids]
+    assert all(view.status == JobStatus.SUCCEEDED for view in views), [view.error for view in views]
+    return views
+
+
+def test_warm_worker_preloads_once_and_keeps_cache_across_jobs() -> None:
+    results = [view.result for view in _run_jobs(5)]
+
+    assert len({result["pid"] for result in results}) == 1
+    assert [result["served"] for result in results] == [1, 2, 3, 4, 5]
+    assert {result["preloads"] for result in results} == {1}
+    assert results[-1]["value"] == sum(range(5))
+
+
+def test_workers_are_recycled_after_max_jobs() -> None:
+    results = [view.result for view in _run_jobs(4, max_jobs_per_process_worker=2)]
+
+    assert [result["served"] for result in results] == [1, 2, 1, 2]
+    assert len({result["pid"] for result in results}) == 2
+
+
+def test_process_job_progress_is_relayed_and_rate_limited() -> None:
+    bus = InMemoryEventBus()
+    progressed: list[JobProgressed] = []
+    bus.subscribe(JobProgressed, progressed.append)
+
+    [view] = _run_jobs(1, handler=ChattyJob(), bus=bus, process_progress_rate=20.0)
+    result = view.result
+
+    assert result["steps"] > 1_000
+    assert 2 <= len(progressed) <= 15  # ~0.5s at 20/s, not one per step
+    assert all(event.message.startswith("step ") for event in progressed)
+    assert [event.progress for event in progressed] == sorted(event.progress for event in progressed)
+
+
+class _Pipe:
+    def __init__(self) -> None:
+        self.sent: list[tuple] = []
+
+    def send(self, message: tuple) -> None:
+        self.sent.append(message)
+
+
+def test_process_context_throttles_before_pickling_and_flushes_the_latest_update() -> None:
+    pipe = _Pipe()
+    ctx = ProcessJobContext("job-1", pipe, min_interval=60.0)
+
+    for step in range(1, 1_001):
+        ctx.set_progress(step / 1_000, f"step {step}")
+    assert pipe.sent == [("progress", "job-1", 0.001, "step 1")]
+
+    ctx.flush()
+    ctx.flush()
+    assert pipe.sent[1:] == [("progress", "job-1", 1.0, "step 1000")]
+
+
+def test_process_jobs_exchange_arrow_handles_instead_of_data(tmp_path) -> None:
+    prices = pa.table({"close": [100.0 + step for step in range(100_000)]})
+    handle = share_table(prices)
+    try:
+        [view] = _run_jobs(
+            1,
+            handler=cumulative_returns,
+            payload={"prices": handle, "artifact_dir": str(tmp_path)},
+        )
+    finally:
+        handle.release()
+
+    assert set(view.result_handles) == {"equity_curve"}
+    curve = view.result_handles["equity_curve"]
+    assert isinstance(curve, ArrowHandle) and not curve.shared_memory
+    assert curve.num_rows == 100_000
+    equity = view.open_result("equity_curve").column("equity")
+    assert equity[-1].as_py() == view.open_result("final") == 100_099.0 / 100.0
+    curve.release()
+    assert not list(tmp_path.iterdir())
+
+
+
+_SHARED_RESULT_SCRIPT = """
+import time
+
+import pyarrow as pa
+
+from quantlab.app.services.job_service import JobService, JobStatusView
+from quantlab.core.jobs import JobExecutionMode, JobSpec
+from quantlab.infra.bus.in_memory import InMemoryEventBus
+from quantlab.infra.jobs.in_memory import InMemoryJobRegistry, InMemoryJobRepository
+from quantlab.infra.queue.in_memory import InMemoryJobQueue
+from quantlab.infra.storage.shared_buffers import share_table
+from quantlab.infra.workers.hybrid_pool import HybridWorkerPool
+
+
+def backtest(payload, ctx):
+    return {"equity_curve": share_table(pa.table({"equity": [1.0, 1.01, 1.03]}))}
+
+
+if __name__ == "__main__":
+    repo, queue = InMemoryJobRepository(), InMemoryJobQueue()
+    service = JobService(repo=repo, queue=queue, bus=InMemoryEventBus())
+    registry = InMemoryJobRegistry()
+    registry.register("backtest.run", backtest)
+    pool = HybridWorkerPool(queue, repo, registry, service, thread_workers=1, process_workers=1)
+    job = service.submit(JobSpec(job_type="backtest.run", payload={}, execution_mode=JobExecutionMode.PROCESS))
+    pool.start()
+    while not repo.get(job.job_id).is_terminal:
+        time.sleep(0.01)
+    pool.stop()
+    time.sleep(0.2)
+    view = service.get_status(job.job_id)
+    print(view.open_result("equity_curve").column("equity")[-1].as_py())
+    view.result_handles["equity_curve"].release()
+"""
+
+
+def test_shared_memory_results_outlive_the_worker_that_wrote_them(tmp_path) -> None:
+    # a fresh interpreter, so the workers do not inherit a resource tracker started by other tests
+    script = tmp_path / "shared_result.py"
+    script.write_text(_SHARED_RESULT_SCRIPT)
+    completed = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=60)
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "1.03"
+    assert "leaked shared_memory" not in completed.stderr